@@ -0,0 +1,280 @@
+"""
+Client throughput and latency
+=============================
+
+Measures the requests per second, per-request latency, and peak memory
+of representative Minim workloads, such as paginating through a whole
+library, batch lookups, and transferring a playlist, against the local
+stand-in API server in :mod:`server`.
+
+Usage::
+
+    python benchmarks/bench_clients.py [-n REPEATS] [--latency SECONDS]
+                                       [--throttle FRACTION] [--size ITEMS]
+                                       [--padding BYTES] [--save FILE]
+                                       [--baseline FILE] [WORKLOAD ...]
+
+Each workload is run `REPEATS` times and the median figures are
+reported. Latencies are measured by a request hook on the client
+sessions, so they include retries and client-side overhead but not the
+time spent parsing the JSON, which is included in the requests per
+second. Peak memory is measured separately with :mod:`tracemalloc`.
+Client-side rate limiters are disabled so that client overhead, not
+pacing, is measured.
+
+Results can be saved to a JSON file with :code:`--save` and compared
+against such a baseline with :code:`--baseline`.
+"""
+
+import argparse
+import datetime
+import json
+from pathlib import Path
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable
+
+sys.path.insert(0, f"{Path(__file__).resolve().parents[1]}/src")
+from minim import (  # noqa: E402
+    discogs,
+    itunes,
+    qobuz,
+    spotify,
+    tidal,
+    transport,
+)
+from server import StandInServer  # noqa: E402
+
+
+class _Latencies(transport.RequestHook):
+    """
+    Request hook that records the latency of every request.
+    """
+
+    def __init__(self) -> None:
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def after(self, event: transport.RequestEvent) -> None:
+        with self._lock:
+            self.latencies.append(event.elapsed)
+
+
+def get_clients(
+    server: StandInServer, hook: transport.RequestHook
+) -> dict[str, Any]:
+    """
+    Create API clients that send requests to the stand-in server.
+
+    Parameters
+    ----------
+    server : `StandInServer`
+        Stand-in API server.
+
+    hook : `minim.transport.RequestHook`
+        Request hook attached to the session of every client.
+
+    Returns
+    -------
+    clients : `dict`
+        API clients, keyed by service name.
+    """
+    expiry = datetime.datetime.now() + datetime.timedelta(days=1)
+    clients = {
+        "discogs": discogs.API(),
+        "itunes": itunes.SearchAPI(),
+        "qobuz": qobuz.PrivateAPI(
+            app_id="app_id",
+            app_secret="app_secret",
+            flow="password",
+            auth_token="auth_token",
+            overwrite=True,
+            save=False,
+            lazy=True,
+        ),
+        "spotify": spotify.WebAPI(
+            client_id="client_id",
+            client_secret="client_secret",
+            flow="authorization_code",
+            redirect_uri="http://localhost:8888/callback",
+            scopes="user-read-private playlist-read-private "
+            "playlist-modify-private playlist-modify-public",
+            access_token="access_token",
+            expiry=expiry,
+            overwrite=True,
+            save=False,
+            lazy=True,
+        ),
+        "tidal": tidal.PrivateAPI(
+            client_id="client_id",
+            client_secret="client_secret",
+            flow="device_code",
+            access_token="access_token" * 4,
+            expiry=expiry,
+            overwrite=True,
+            save=False,
+            lazy=True,
+        ),
+    }
+    clients["tidal"].LOGIN_URL = server.get_url("tidal")
+    for service, client in clients.items():
+        client.API_URL = server.get_url(service)
+        client.session.rate_limiter = None
+        client.session.request_hooks.append(hook)
+    return clients
+
+
+def _transfer(clients: dict[str, Any]) -> None:
+    uris = [
+        f"spotify:track:{item['track']['id']}"
+        for item in clients["spotify"].iter_playlist_items(
+            "source", max_workers=8
+        )
+    ]
+    clients["spotify"].add_playlist_items("target", uris)
+
+
+WORKLOADS = {
+    "spotify-library": lambda clients: list(
+        clients["spotify"].iter_playlist_items("library")
+    ),
+    "spotify-library-parallel": lambda clients: list(
+        clients["spotify"].iter_playlist_items("library", max_workers=8)
+    ),
+    "spotify-batch": lambda clients: clients["spotify"].get_tracks(
+        [str(i) for i in range(1_000)], max_workers=8
+    ),
+    "spotify-transfer": _transfer,
+    "tidal-favorites": lambda clients: list(
+        clients["tidal"].iter_favorite_tracks(max_workers=8)
+    ),
+    "qobuz-favorites": lambda clients: list(
+        clients["qobuz"].iter_favorites("tracks", max_workers=8)
+    ),
+    "qobuz-batch": lambda clients: clients["qobuz"].get_tracks(
+        list(range(1_000)), max_workers=8
+    ),
+    "discogs-collection": lambda clients: list(
+        clients["discogs"].iter_collection_folder_releases(
+            0, username="user", max_workers=8
+        )
+    ),
+    "itunes-lookup": lambda clients: clients["itunes"].map(
+        clients["itunes"].lookup,
+        [list(range(i, i + 20)) for i in range(0, 1_000, 20)],
+    ),
+}
+
+
+def run(
+    workload: Callable[[dict[str, Any]], Any],
+    server: StandInServer,
+    repeats: int = 5,
+) -> dict[str, float]:
+    """
+    Benchmark a workload.
+
+    Parameters
+    ----------
+    workload : `callable`
+        Workload, which takes the API clients created by
+        :func:`get_clients`.
+
+    server : `StandInServer`
+        Stand-in API server.
+
+    repeats : `int`, default: :code:`5`
+        Number of times to run the workload.
+
+    Returns
+    -------
+    results : `dict`
+        Median requests per second, median 50th and 99th percentile
+        latencies in milliseconds, and peak memory in MiB.
+    """
+    hook = _Latencies()
+    clients = get_clients(server, hook)
+    workload(clients)
+
+    rps, p50, p99 = [], [], []
+    for _ in range(repeats):
+        hook.latencies.clear()
+        requests = server.requests
+        start = time.perf_counter()
+        workload(clients)
+        elapsed = time.perf_counter() - start
+        rps.append((server.requests - requests) / elapsed)
+        quantiles = (
+            statistics.quantiles(hook.latencies, n=100)
+            if len(hook.latencies) > 1
+            else hook.latencies * 99
+        )
+        p50.append(1_000 * quantiles[49])
+        p99.append(1_000 * quantiles[98])
+
+    tracemalloc.start()
+    workload(clients)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "rps": statistics.median(rps),
+        "p50": statistics.median(p50),
+        "p99": statistics.median(p99),
+        "memory": peak / 2**20,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure the throughput and latency of Minim clients."
+    )
+    parser.add_argument("workloads", nargs="*", default=list(WORKLOADS))
+    parser.add_argument("-n", "--repeats", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--throttle", type=float, default=0.0)
+    parser.add_argument("--size", type=int, default=5_000)
+    parser.add_argument("--padding", type=int, default=0)
+    parser.add_argument("--save", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    header = (
+        f"{'workload':<28}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}"
+        f"{'peak (MiB)':>12}"
+    )
+    if baseline:
+        header += f"{'req/s vs. baseline':>20}"
+    print(header)
+    with StandInServer(
+        latency=args.latency,
+        throttle=args.throttle,
+        size=args.size,
+        padding=args.padding,
+    ) as server:
+        for name in args.workloads:
+            results[name] = result = run(WORKLOADS[name], server, args.repeats)
+            row = (
+                f"{name:<28}{result['rps']:>10.0f}{result['p50']:>10.2f}"
+                f"{result['p99']:>10.2f}{result['memory']:>12.1f}"
+            )
+            if name in baseline:
+                row += f"{result['rps'] / baseline[name]['rps'] - 1:>+20.1%}"
+            print(row)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
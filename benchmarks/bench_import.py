@@ -0,0 +1,80 @@
+"""
+Cold import time
+================
+
+Measures the wall-clock time it takes a fresh interpreter to import
+Minim (or one of its submodules), which is dominated by module loading
+rather than by the work done once the package is in use.
+
+Usage::
+
+    python benchmarks/bench_import.py [-n REPEATS] [MODULE ...]
+
+Each module is imported in a new subprocess so that nothing is served
+from :code:`sys.modules`. The baseline time to start an empty
+interpreter is subtracted from the reported figures.
+"""
+
+import argparse
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def time_import(module: str = None, repeats: int = 20) -> list[float]:
+    """
+    Time how long it takes to import a module in a fresh interpreter.
+
+    Parameters
+    ----------
+    module : `str`, optional
+        Fully qualified module name. If not specified, an empty
+        interpreter is timed instead.
+
+    repeats : `int`, default: :code:`20`
+        Number of subprocesses to start.
+
+    Returns
+    -------
+    times : `list`
+        Wall-clock times in seconds.
+    """
+
+    code = f"import {module}" if module else "pass"
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            env=os.environ | {"PYTHONPATH": str(SRC)},
+        )
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure the cold import time of Minim."
+    )
+    parser.add_argument("modules", nargs="*", default=["minim"])
+    parser.add_argument("-n", "--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    baseline = statistics.median(time_import(repeats=args.repeats))
+    print(f"{'module':<24}{'median (ms)':>14}{'min (ms)':>12}")
+    for module in args.modules:
+        times = [t - baseline for t in time_import(module, args.repeats)]
+        print(
+            f"{module:<24}{1_000 * statistics.median(times):>14.1f}"
+            f"{1_000 * min(times):>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""
+Stand-in API server
+===================
+
+A local HTTP server that mimics the subset of the Spotify Web API,
+private TIDAL API, private Qobuz API, Discogs API, and iTunes Search API
+endpoints exercised by the client benchmarks, so that the clients can
+be measured without network access or credentials.
+
+Usage::
+
+    python benchmarks/server.py [--port PORT] [--latency SECONDS]
+                                [--throttle FRACTION] [--size ITEMS]
+                                [--padding BYTES]
+
+Each service is served under its own path prefix (see
+:attr:`StandInServer.PREFIXES`), so a client is pointed at the server
+by overriding its :code:`API_URL` (and, for TIDAL, :code:`LOGIN_URL`)
+attribute. Collections are paginated the way each service paginates
+them, every response carries rate-limit headers, and latency, 429
+responses, and payload size can be injected.
+"""
+
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import itertools
+import json
+import re
+import threading
+import time
+from typing import Any, Callable
+import urllib.parse
+
+
+def _track(i: int, padding: str = "") -> dict[str, Any]:
+    """
+    Create a track resembling the ones returned by the services.
+
+    Parameters
+    ----------
+    i : `int`
+        Track index, from which all identifiers are derived.
+
+    padding : `str`, optional
+        Filler appended to the track to inflate the payload.
+
+    Returns
+    -------
+    track : `dict`
+        Track.
+    """
+    track = {
+        "id": f"{i:022d}",
+        "name": f"Track {i}",
+        "isrc": f"USXXX{i:07d}",
+        "duration_ms": 180_000 + i % 60_000,
+        "disc_number": 1,
+        "track_number": i % 12 + 1,
+        "artists": [{"id": f"{i % 997:022d}", "name": f"Artist {i % 997}"}],
+        "album": {
+            "id": f"{i // 12:022d}",
+            "name": f"Album {i // 12}",
+            "images": [{"url": f"https://i.test/{i // 12}.jpg"}],
+        },
+    }
+    if padding:
+        track["padding"] = padding
+    return track
+
+
+class _Handler(BaseHTTPRequestHandler):
+    disable_nagle_algorithm = True
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self) -> None:
+        server = self.server
+        url = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        with server.lock:
+            n = next(server.counter)
+            server.requests += 1
+
+        if server.latency:
+            time.sleep(server.latency)
+        headers = {
+            "X-RateLimit-Limit": "1000",
+            "X-RateLimit-Remaining": str(999 - n % 1000),
+            "X-Discogs-Ratelimit": "60",
+            "X-Discogs-Ratelimit-Remaining": str(59 - n % 60),
+        }
+        if server.throttle and n % round(1 / server.throttle) == 0:
+            status = 429
+            payload = {"error": {"status": status, "message": "Throttled"}}
+            headers["Retry-After"] = "0"
+        else:
+            for method, pattern, route in server.routes:
+                if method == self.command and (
+                    match := pattern.fullmatch(url.path)
+                ):
+                    status, payload = route(
+                        *match.groups(), params=params, body=body
+                    )
+                    break
+            else:
+                status = 404
+                payload = {"error": {"status": status, "message": "Not found"}}
+
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_DELETE = do_GET = do_POST = do_PUT = _respond
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the APIs used by the Minim clients.
+
+    Parameters
+    ----------
+    port : `int`, keyword-only, default: :code:`0`
+        Port to listen on. If :code:`0`, a free port is chosen.
+
+    latency : `float`, keyword-only, default: :code:`0.0`
+        Latency in seconds injected into every response.
+
+    throttle : `float`, keyword-only, default: :code:`0.0`
+        Fraction of requests answered with :code:`429 Too Many
+        Requests` and a :code:`Retry-After: 0` header.
+
+    size : `int`, keyword-only, default: :code:`10_000`
+        Number of items in every collection, such as a playlist or a
+        user's favorites.
+
+    padding : `int`, keyword-only, default: :code:`0`
+        Number of filler bytes added to every track, to simulate large
+        payloads.
+
+    Attributes
+    ----------
+    PREFIXES : `dict`
+        Path prefix under which each service is served.
+
+    requests : `int`
+        Number of requests received.
+
+    Examples
+    --------
+    >>> with StandInServer(latency=0.01) as server:
+    ...     client = itunes.SearchAPI()
+    ...     client.API_URL = server.get_url("itunes")
+    ...     client.lookup(list(range(100)))
+    """
+
+    PREFIXES = {
+        "discogs": "/discogs",
+        "itunes": "/itunes",
+        "qobuz": "/qobuz/api.json/0.2",
+        "spotify": "/spotify/v1",
+        "tidal": "/tidal",
+    }
+
+    def __init__(
+        self,
+        *,
+        port: int = 0,
+        latency: float = 0.0,
+        throttle: float = 0.0,
+        size: int = 10_000,
+        padding: int = 0,
+    ) -> None:
+        """
+        Create a stand-in API server.
+        """
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.daemon_threads = True
+        self.latency = latency
+        self.throttle = throttle
+        self.size = size
+        self.padding = "x" * padding
+        self.requests = 0
+        self.counter = itertools.count(1)
+        self.lock = threading.Lock()
+        self.routes = []
+        for service, prefix in self.PREFIXES.items():
+            for method, path, route in getattr(self, f"_{service}_routes")():
+                self.routes.append(
+                    (method, re.compile(f"{prefix}{path}"), route)
+                )
+
+    def __enter__(self) -> "StandInServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def _get_tracks(self, offset: int, limit: int) -> list[dict[str, Any]]:
+        """
+        Get a page of tracks from a collection.
+
+        Parameters
+        ----------
+        offset : `int`
+            Index of the first track.
+
+        limit : `int`
+            Maximum number of tracks.
+
+        Returns
+        -------
+        tracks : `list`
+            Tracks.
+        """
+        return [
+            _track(i, self.padding)
+            for i in range(offset, min(offset + limit, self.size))
+        ]
+
+    def _discogs_routes(self) -> list[tuple[str, str, Callable]]:
+        def collection(username, folder_id, *, params, body):
+            page = int(params.get("page", 1))
+            per_page = int(params.get("per_page", 50))
+            pages = -(-self.size // per_page)
+            releases = [
+                {"id": int(track["album"]["id"]), "basic_information": track}
+                for track in self._get_tracks((page - 1) * per_page, per_page)
+            ]
+            return 200, {
+                "pagination": {
+                    "page": page,
+                    "pages": pages,
+                    "per_page": per_page,
+                    "items": self.size,
+                },
+                "releases": releases,
+            }
+
+        def release(release_id, *, params, body):
+            return 200, {
+                "id": int(release_id),
+                "title": f"Album {release_id}",
+                "tracklist": self._get_tracks(int(release_id) * 12, 12),
+            }
+
+        return [
+            (
+                "GET",
+                r"/users/([^/]+)/collection/folders/(\d+)/releases",
+                collection,
+            ),
+            ("GET", r"/releases/(\d+)", release),
+        ]
+
+    def _itunes_routes(self) -> list[tuple[str, str, Callable]]:
+        def lookup(*, params, body):
+            results = [
+                {"trackId": int(id), "trackName": f"Track {id}"}
+                | _track(int(id), self.padding)
+                for id in params.get("id", "").split(",")
+                if id
+            ]
+            return 200, {"resultCount": len(results), "results": results}
+
+        def search(*, params, body):
+            results = self._get_tracks(0, int(params.get("limit", 50)))
+            return 200, {"resultCount": len(results), "results": results}
+
+        return [("GET", r"/lookup", lookup), ("GET", r"/search", search)]
+
+    def _qobuz_routes(self) -> list[tuple[str, str, Callable]]:
+        def favorites(*, params, body):
+            offset = int(params.get("offset", 0))
+            limit = int(params.get("limit", 50))
+            return 200, {
+                params.get("type", "tracks"): {
+                    "offset": offset,
+                    "limit": limit,
+                    "total": self.size,
+                    "items": self._get_tracks(offset, limit),
+                }
+            }
+
+        def profile(*, params, body):
+            return 200, {"id": 1, "subscription": None}
+
+        def tracks(*, params, body):
+            return 200, {
+                "tracks": {
+                    "items": [
+                        _track(int(id), self.padding)
+                        for id in json.loads(body)["tracks_id"]
+                    ]
+                }
+            }
+
+        return [
+            ("GET", r"/favorite/getUserFavorites", favorites),
+            ("GET", r"/user/get", profile),
+            ("POST", r"/track/getList", tracks),
+        ]
+
+    def _spotify_routes(self) -> list[tuple[str, str, Callable]]:
+        def items(playlist_id, *, params, body):
+            offset = int(params.get("offset", 0))
+            limit = int(params.get("limit", 20))
+            return 200, {
+                "items": [
+                    {"added_at": "2024-01-01T00:00:00Z", "track": track}
+                    for track in self._get_tracks(offset, limit)
+                ],
+                "limit": limit,
+                "next": ("next" if offset + limit < self.size else None),
+                "offset": offset,
+                "previous": None,
+                "total": self.size,
+            }
+
+        def add_items(playlist_id, *, params, body):
+            return 201, {"snapshot_id": f"{len(json.loads(body)['uris'])}"}
+
+        def playlist(playlist_id, *, params, body):
+            return 200, {"id": playlist_id, "public": False}
+
+        def profile(*, params, body):
+            return 200, {"id": "user", "display_name": "User"}
+
+        def tracks(*, params, body):
+            return 200, {
+                "tracks": [
+                    _track(int(id), self.padding)
+                    for id in params["ids"].split(",")
+                ]
+            }
+
+        return [
+            ("GET", r"/me", profile),
+            ("GET", r"/playlists/([^/]+)", playlist),
+            ("GET", r"/playlists/([^/]+)/items", items),
+            ("POST", r"/playlists/([^/]+)/items", add_items),
+            ("GET", r"/tracks", tracks),
+        ]
+
+    def _tidal_routes(self) -> list[tuple[str, str, Callable]]:
+        def favorites(user_id, *, params, body):
+            offset = int(params.get("offset", 0))
+            limit = int(params.get("limit", 50))
+            return 200, {
+                "limit": limit,
+                "offset": offset,
+                "totalNumberOfItems": self.size,
+                "items": [
+                    {"created": "2024-01-01T00:00:00.000+0000", "item": track}
+                    for track in self._get_tracks(offset, limit)
+                ],
+            }
+
+        def profile(*, params, body):
+            return 200, {"userId": 1, "countryCode": "US"}
+
+        return [
+            ("GET", r"/v1/users/(\d+)/favorites/tracks", favorites),
+            ("GET", r"/oauth2/me", profile),
+        ]
+
+    def get_url(self, service: str) -> str:
+        """
+        Get the base URL that a client for a service should use.
+
+        Parameters
+        ----------
+        service : `str`
+            Service name.
+
+            **Valid values**: :code:`"discogs"`, :code:`"itunes"`,
+            :code:`"qobuz"`, :code:`"spotify"`, and :code:`"tidal"`.
+
+        Returns
+        -------
+        url : `str`
+            Base URL.
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{self.PREFIXES[service]}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run a local stand-in for the APIs used by Minim."
+    )
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--throttle", type=float, default=0.0)
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--padding", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StandInServer(
+        port=args.port,
+        latency=args.latency,
+        throttle=args.throttle,
+        size=args.size,
+        padding=args.padding,
+    )
+    for service in server.PREFIXES:
+        print(f"{service:<8} {server.get_url(service)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
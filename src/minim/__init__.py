@@ -1,19 +1,26 @@
-import configparser
+import functools
+from importlib import import_module
 from importlib.util import find_spec
 import pathlib
 import shutil
 import subprocess
 import tempfile
+import threading
+from typing import Any
 import warnings
 
 __all__ = [
     "audio",
+    "credentials",
     "discogs",
     "itunes",
+    "models",
     "qobuz",
     "spotify",
     "tidal",
+    "transport",
     "utility",
+    "FFMPEG_CODECS",
     "FOUND_FFMPEG",
     "FOUND_FLASK",
     "FOUND_PLAYWRIGHT",
@@ -24,16 +31,57 @@ __all__ = [
     "ILLEGAL_CHARACTERS",
 ]
 
-FOUND_FFMPEG = shutil.which("ffmpeg") is not None
-FOUND_FLASK = find_spec("flask") is not None
-FOUND_PLAYWRIGHT = find_spec("playwright") is not None
-
 VERSION = "1.1.0"
 REPOSITORY_URL = "https://github.com/bbye98/minim"
 
-if FOUND_FFMPEG:
+DIR_HOME = pathlib.Path.home()
+DIR_TEMP = pathlib.Path(tempfile.gettempdir())
+ILLEGAL_CHARACTERS = {ord(c): "_" for c in '<>:"/\\|?*'}
+
+_SUBMODULES = {
+    "audio",
+    "credentials",
+    "discogs",
+    "itunes",
+    "models",
+    "qobuz",
+    "spotify",
+    "tidal",
+    "transport",
+    "utility",
+}
+_lock = threading.Lock()
+
+
+@functools.cache
+def _find_ffmpeg() -> tuple[bool, dict[str, str]]:
+    """
+    Locate FFmpeg and determine the best available AAC and Vorbis
+    encoders. The result is cached, so the :code:`ffmpeg -version`
+    subprocess is run at most once per interpreter.
+
+    Returns
+    -------
+    found : `bool`
+        Whether FFmpeg was found.
+
+    codecs : `dict`
+        FFmpeg encoder names for the :code:`"aac"` and :code:`"vorbis"`
+        codecs. The built-in encoders are used if FFmpeg was not found.
+    """
+
+    if shutil.which("ffmpeg") is None:
+        wmsg = (
+            "FFmpeg was not found, so certain key features in Minim "
+            "are unavailable. To install FFmpeg, visit "
+            "https://ffmpeg.org/download.html or use "
+            "'conda install ffmpeg' if Conda is available."
+        )
+        warnings.warn(wmsg)
+        return False, {"aac": "aac", "vorbis": "vorbis -strict experimental"}
+
     _ = subprocess.run(["ffmpeg", "-version"], capture_output=True)
-    FFMPEG_CODECS = {
+    return True, {
         "aac": "libfdk_aac" if b"--enable-libfdk-aac" in _.stdout else "aac",
         "vorbis": (
             "libvorbis"
@@ -41,25 +89,32 @@ if FOUND_FFMPEG:
             else "vorbis -strict experimental"
         ),
     }
-    __all__.append("FFMPEG_CODECS")
-else:
-    wmsg = (
-        "FFmpeg was not found, so certain key features in Minim "
-        "are unavailable. To install FFmpeg, visit "
-        "https://ffmpeg.org/download.html or use "
-        "'conda install ffmpeg' if Conda is available."
-    )
-    warnings.warn(wmsg)
 
-DIR_HOME = pathlib.Path.home()
-DIR_TEMP = pathlib.Path(tempfile.gettempdir())
-ILLEGAL_CHARACTERS = {ord(c): "_" for c in '<>:"/\\|?*'}
 
-_config = configparser.ConfigParser()
-_config.read(DIR_HOME / "minim.cfg")
-if not _config.has_section("minim"):
-    _config["minim"] = {"version": VERSION}
-    with open(DIR_HOME / "minim.cfg", "w") as f:
-        _config.write(f)
+def __getattr__(name: str) -> Any:
+    # Submodules, optional dependency flags, and the FFmpeg probe are
+    # resolved on first access and then cached as module globals so
+    # that `import minim` stays cheap.
+    if name in _SUBMODULES:
+        return import_module(f".{name}", __name__)
+
+    with _lock:
+        if name in globals():
+            return globals()[name]
+        if name == "FOUND_FFMPEG":
+            value = _find_ffmpeg()[0]
+        elif name == "FFMPEG_CODECS":
+            value = _find_ffmpeg()[1]
+        elif name == "FOUND_FLASK":
+            value = find_spec("flask") is not None
+        elif name == "FOUND_PLAYWRIGHT":
+            value = find_spec("playwright") is not None
+        else:
+            emsg = f"module {__name__!r} has no attribute {name!r}"
+            raise AttributeError(emsg)
+        globals()[name] = value
+    return value
+
 
-from . import audio, discogs, itunes, qobuz, spotify, tidal, utility  # noqa: E402
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -21,11 +21,9 @@ import warnings
 
 from mutagen import id3, flac, mp3, mp4, oggflac, oggopus, oggvorbis, wave
 
-from . import utility, FOUND_FFMPEG
+from . import utility
 from .qobuz import _parse_performers
 
-if FOUND_FFMPEG:
-    from . import FFMPEG_CODECS
 if FOUND_PILLOW := find_spec("PIL") is not None:
     from PIL import Image
 
@@ -698,6 +696,8 @@ class Audio:
         preserve : `bool`, keyword-only, default: :code:`True`
             Determines whether the original audio file is kept.
         """
+        from . import FFMPEG_CODECS, FOUND_FFMPEG
+
         if not FOUND_FFMPEG:
             emsg = (
                 "Audio conversion is unavailable because FFmpeg was not found."
@@ -771,12 +771,10 @@ class Audio:
             filename = filename.with_stem(f"{filename.stem}_")
 
         if options is None:
-            if codec == "lpcm":
-                options = acls._CODECS[codec]["ffmpeg"].format(
-                    self.bit_depth if hasattr(self, "bit_depth") else 16
-                )
-            else:
-                options = acls._CODECS[codec]["ffmpeg"]
+            options = acls._CODECS[codec]["ffmpeg"].format(
+                self.bit_depth if hasattr(self, "bit_depth") else 16,
+                **FFMPEG_CODECS,
+            )
 
         subprocess.run(
             f'ffmpeg -y -i "{self._file}" {options} -loglevel error '
@@ -1506,9 +1504,7 @@ class MP4Audio(Audio):
     """
 
     _CODECS = {
-        "aac": {
-            "ffmpeg": f"-b:a 256k -c:a {FFMPEG_CODECS['aac'] if FOUND_FFMPEG else 'aac'} -c:v copy"
-        },
+        "aac": {"ffmpeg": "-b:a 256k -c:a {aac} -c:v copy"},
         "alac": {"ffmpeg": "-c:a alac -c:v copy"},
     }
     _EXTENSIONS = ["m4a", "aac", "mp4"]
@@ -1725,7 +1721,7 @@ class OggAudio(Audio, _VorbisComment):
             "mutagen": oggopus.OggOpus,
         },
         "vorbis": {
-            "ffmpeg": f"-c:a {FFMPEG_CODECS['vorbis'] if FOUND_FFMPEG else 'vorbis -strict experimental'} -vn",
+            "ffmpeg": "-c:a {vorbis} -vn",
             "mutagen": oggvorbis.OggVorbis,
         },
     }
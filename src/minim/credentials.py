@@ -0,0 +1,449 @@
+"""
+Credentials
+===========
+.. moduleauthor:: Benjamin Ye <GitHub: bbye98>
+
+This module contains the stores used by the Minim API clients to
+persist access tokens and other credentials between sessions.
+
+Each API client keeps its credentials in its own section of the store,
+and every update touches only that section, so multiple threads and
+processes can refresh credentials for different (or the same) clients
+concurrently without losing each other's changes.
+"""
+
+from abc import ABC, abstractmethod
+import configparser
+import contextlib
+import os
+from pathlib import Path
+import sqlite3
+import tempfile
+import threading
+from typing import Any, Union
+
+try:
+    import fcntl
+except ModuleNotFoundError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from . import DIR_HOME, VERSION
+from .transport import _ProcessLocal, _SQLiteStore
+
+__all__ = ["FileStore", "SQLiteStore", "get_store", "set_store"]
+
+_store = None
+_store_lock = threading.Lock()
+
+
+class _CredentialStore(_ProcessLocal, ABC):
+    """
+    Base class for credential stores.
+
+    .. attention::
+
+       This class should *not* be instantiated manually. Subclasses must
+       implement the :meth:`_read` and :meth:`_write` methods.
+    """
+
+    @staticmethod
+    def _normalize(values: dict[str, Any]) -> dict[str, str]:
+        """
+        Convert credential values to strings.
+
+        Parameters
+        ----------
+        values : `dict`
+            Credentials.
+
+        Returns
+        -------
+        values : `dict`
+            Credentials with :code:`None` replaced by empty strings and
+            all other values converted to strings.
+        """
+        return {
+            key: "" if value is None else str(value)
+            for key, value in values.items()
+        }
+
+    @abstractmethod
+    def _read(self, section: str) -> dict[str, str]:
+        """
+        Read the credentials stored in a section.
+
+        Parameters
+        ----------
+        section : `str`
+            Section name.
+
+        Returns
+        -------
+        credentials : `dict`
+            Stored credentials. Empty if the section does not exist.
+        """
+
+    @abstractmethod
+    def _write(
+        self, section: str, values: dict[str, str], replace: bool
+    ) -> None:
+        """
+        Write credentials to a section atomically with respect to other
+        threads and processes using the same store.
+
+        Parameters
+        ----------
+        section : `str`
+            Section name. Created if it does not exist.
+
+        values : `dict`
+            Normalized credentials.
+
+        replace : `bool`
+            Determines whether existing credentials in the section that
+            are not in `values` are removed.
+        """
+
+    def get(self, section: str) -> dict[str, str]:
+        """
+        Get the credentials stored in a section.
+
+        Parameters
+        ----------
+        section : `str`
+            Section name, usually the fully qualified name of the API
+            client class.
+
+        Returns
+        -------
+        credentials : `dict`
+            Stored credentials. Empty if the section does not exist.
+        """
+        return self._read(section)
+
+    def set(self, section: str, values: dict[str, Any]) -> None:
+        """
+        Replace the credentials stored in a section.
+
+        Parameters
+        ----------
+        section : `str`
+            Section name.
+
+        values : `dict`
+            New credentials. Any existing credentials in the section
+            that are not in `values` are removed.
+        """
+        self._write(section, self._normalize(values), True)
+
+    def update(self, section: str, values: dict[str, Any]) -> None:
+        """
+        Update some of the credentials stored in a section, leaving the
+        others unchanged.
+
+        Parameters
+        ----------
+        section : `str`
+            Section name.
+
+        values : `dict`
+            Credentials to add or change.
+        """
+        self._write(section, self._normalize(values), False)
+
+
+class FileStore(_CredentialStore):
+    """
+    Credential store backed by the Minim configuration file.
+
+    The file is re-read only when it has been modified, and each update
+    is performed under an exclusive file lock: the file is re-read,
+    only the affected section is changed, and the result is written to
+    a temporary file that atomically replaces the original. Updates
+    that do not change any values do not touch the file.
+
+    Parameters
+    ----------
+    path : `str` or `pathlib.Path`, optional
+        Path to the configuration file.
+
+        **Default**: :code:`DIR_HOME / "minim.cfg"`.
+    """
+
+    _PROCESS_STATE = {
+        "_lock": threading.Lock,
+        "_config": configparser.ConfigParser,
+        "_stat": None,
+    }
+
+    def __init__(self, path: Union[str, Path] = None) -> None:
+        """
+        Create a file-backed credential store.
+        """
+        self.path = Path(path or DIR_HOME / "minim.cfg")
+
+        self._lock = threading.Lock()
+        self._config = configparser.ConfigParser()
+        self._stat = None
+
+    @contextlib.contextmanager
+    def _lock_file(self):
+        """
+        Hold an exclusive lock on the configuration file, shared with
+        all other processes using the same file.
+        """
+        with open(self.path.with_name(f"{self.path.name}.lock"), "a+b") as f:
+            if fcntl is None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is None:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _reload(self) -> None:
+        """
+        Re-read the configuration file if it has changed since it was
+        last read.
+        """
+        try:
+            stat = os.stat(self.path)
+            stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stat = None
+        if stat != self._stat:
+            self._config = configparser.ConfigParser()
+            self._config.read(self.path)
+            self._stat = stat
+
+    def _write(
+        self, section: str, values: dict[str, str], replace: bool
+    ) -> None:
+        """
+        Write credentials to a section of the configuration file.
+
+        Parameters
+        ----------
+        section : `str`
+            Section name.
+
+        values : `dict`
+            Credentials.
+
+        replace : `bool`
+            Determines whether existing credentials in the section that
+            are not in `values` are removed.
+        """
+        with self._lock, self._lock_file():
+            self._reload()
+            current = (
+                dict(self._config[section])
+                if self._config.has_section(section)
+                else {}
+            )
+            if not replace:
+                values = current | values
+            if values == current:
+                return
+
+            self._config.remove_section(section)
+            self._config[section] = values
+            if not self._config.has_section("minim"):
+                self._config["minim"] = {"version": VERSION}
+
+            fd, tmp = tempfile.mkstemp(
+                dir=self.path.parent, prefix=f".{self.path.name}."
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    self._config.write(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            stat = os.stat(self.path)
+            self._stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _read(self, section: str) -> dict[str, str]:
+        """
+        Read credentials from a section of the configuration file.
+
+        Parameters
+        ----------
+        section : `str`
+            Section name.
+
+        Returns
+        -------
+        credentials : `dict`
+            Stored credentials.
+        """
+        with self._lock:
+            self._reload()
+            if self._config.has_section(section):
+                return dict(self._config[section])
+            return {}
+
+
+class SQLiteStore(_CredentialStore, _SQLiteStore):
+    """
+    Credential store backed by a SQLite database in write-ahead logging
+    (WAL) mode.
+
+    Well suited to many worker processes sharing credentials, since
+    reads never block writes and each update only touches the rows of
+    one section.
+
+    Parameters
+    ----------
+    path : `str` or `pathlib.Path`, optional
+        Path to the SQLite database.
+
+        **Default**: :code:`DIR_HOME / "minim.sqlite"`.
+    """
+
+    _PROCESS_STATE = _SQLiteStore._PROCESS_STATE | {"_lock": threading.Lock}
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS credentials (section TEXT NOT NULL, "
+        "key TEXT NOT NULL, value TEXT NOT NULL, "
+        "PRIMARY KEY (section, key))",
+    )
+
+    def __init__(self, path: Union[str, Path] = None) -> None:
+        """
+        Create a SQLite-backed credential store.
+        """
+        self.path = Path(path or DIR_HOME / "minim.sqlite")
+
+        self._lock = threading.Lock()
+
+    def _select(
+        self, connection: sqlite3.Connection, section: str
+    ) -> dict[str, str]:
+        """
+        Get the credentials stored in a section.
+
+        Parameters
+        ----------
+        connection : `sqlite3.Connection`
+            Database connection.
+
+        section : `str`
+            Section name.
+
+        Returns
+        -------
+        credentials : `dict`
+            Stored credentials.
+        """
+        return dict(
+            connection.execute(
+                "SELECT key, value FROM credentials WHERE section = ?",
+                (section,),
+            ).fetchall()
+        )
+
+    def _write(
+        self, section: str, values: dict[str, str], replace: bool
+    ) -> None:
+        """
+        Write credentials to a section of the database.
+
+        Parameters
+        ----------
+        section : `str`
+            Section name.
+
+        values : `dict`
+            Credentials.
+
+        replace : `bool`
+            Determines whether existing credentials in the section that
+            are not in `values` are removed.
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                current = self._select(connection, section)
+                if (values if replace else current | values) != current:
+                    if replace:
+                        connection.execute(
+                            "DELETE FROM credentials WHERE section = ?",
+                            (section,),
+                        )
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO credentials VALUES (?, ?, ?)",
+                        ((section, *item) for item in values.items()),
+                    )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _read(self, section: str) -> dict[str, str]:
+        """
+        Read credentials from a section of the database.
+
+        Parameters
+        ----------
+        section : `str`
+            Section name.
+
+        Returns
+        -------
+        credentials : `dict`
+            Stored credentials.
+        """
+        with self._lock:
+            return self._select(self._connect(), section)
+
+
+def get_store() -> _CredentialStore:
+    """
+    Get the credential store used by the Minim API clients.
+
+    Returns
+    -------
+    store : `FileStore` or `SQLiteStore`
+        Credential store. Defaults to a :class:`FileStore` for the
+        Minim configuration file.
+    """
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = FileStore()
+    return _store
+
+
+def set_store(store: _CredentialStore) -> None:
+    """
+    Set the credential store used by the Minim API clients.
+
+    Parameters
+    ----------
+    store : `FileStore` or `SQLiteStore`
+        Credential store. Clients created afterwards read their stored
+        credentials from, and save new credentials to, this store.
+
+    Examples
+    --------
+    Share credentials between many worker processes using SQLite:
+
+    >>> from minim import credentials
+    >>> credentials.set_store(credentials.SQLiteStore())
+    """
+    global _store
+
+    _store = store
@@ -6,16 +6,20 @@ Discogs
 This module contains a complete implementation of the Discogs API.
 """
 
+import functools
 from http.server import HTTPServer, BaseHTTPRequestHandler
 import json
 import logging
+import math
 from multiprocessing import Process
 import os
 from pathlib import Path
 import re
 import secrets
+import sys
+import threading
 import time
-from typing import Any, Union
+from typing import Any, Callable, Generator, Union
 import urllib
 import warnings
 import webbrowser
@@ -23,21 +27,14 @@ import webbrowser
 import requests
 
 from . import (
-    FOUND_FLASK,
-    FOUND_PLAYWRIGHT,
     VERSION,
     REPOSITORY_URL,
-    DIR_HOME,
     DIR_TEMP,
-    _config,
+    credentials,
+    transport,
 )
 
-if FOUND_FLASK:
-    from flask import Flask, request
-if FOUND_PLAYWRIGHT:
-    from playwright.sync_api import sync_playwright
-
-__all__ = ["API"]
+__all__ = ["API", "AsyncAPI"]
 
 
 class _DiscogsRedirectHandler(BaseHTTPRequestHandler):
@@ -61,7 +58,7 @@ class _DiscogsRedirectHandler(BaseHTTPRequestHandler):
         )
 
 
-class API:
+class API(transport._LazyAuthentication, transport._BatchExecutor):
     """
     Discogs API client.
 
@@ -194,6 +191,21 @@ class API:
         associated properties are stored to the Minim configuration
         file.
 
+    lazy : `bool`, keyword-only, default: :code:`False`
+        Determines whether authentication, which may require network
+        requests, is deferred until the first request that needs it so
+        that creating the client is purely local.
+
+    rate_limiter : `minim.transport.RateLimiter`, keyword-only, optional
+        Additional client-side rate limiter, such as a named limiter
+        shared with other processes. If not specified, requests are
+        only paced using the rate limit budget reported by the Discogs
+        API (see :attr:`rate_limit`).
+
+    pool_size, keep_alive, timeout : keyword-only, optional
+        Options for the underlying HTTP session. See
+        :class:`minim.transport.Session`.
+
     Attributes
     ----------
     API_URL : `str`
@@ -208,12 +220,33 @@ class API:
     REQUEST_TOKEN_URL : `str`
         URL for the OAuth 1.0a request token endpoint.
 
-    session : `requests.Session`
+    rate_limit : `dict`
+        Current rate limit budget reported by the Discogs API in the
+        most recent response, or :code:`None` if no request has been
+        made yet. Subsequent requests are spread evenly over the rest of
+        the 60-second rate limiting window so that the budget is never
+        exceeded.
+
+        .. container::
+
+           **Keys**:
+
+           * :code:`"limit"`: Total number of requests allowed per
+             window.
+           * :code:`"used"`: Number of requests made in the current
+             window.
+           * :code:`"remaining"`: Number of requests remaining in the
+             current window.
+
+    session : `minim.transport.Session`
         Session used to send requests to the Discogs API.
     """
 
     _FLOWS = {"discogs", "oauth"}
     _NAME = f"{__module__}.{__qualname__}"
+    _PROCESS_STATE = transport._LazyAuthentication._PROCESS_STATE | {
+        "_rate_limit_lock": threading.Lock
+    }
     API_URL = "https://api.discogs.com"
     ACCESS_TOKEN_URL = f"{API_URL}/oauth/access_token"
     AUTH_URL = "https://www.discogs.com/oauth/authorize"
@@ -233,27 +266,38 @@ class API:
         access_token_secret: str = None,
         overwrite: bool = False,
         save: bool = True,
+        lazy: bool = False,
+        rate_limiter: transport.RateLimiter = None,
+        pool_size: int = 32,
+        keep_alive: bool = True,
+        timeout: Union[float, tuple[float, float]] = (3.05, 30.0),
     ) -> None:
         """
         Create a Discogs API client.
         """
-        self.session = requests.Session()
+        self.session = transport.Session(
+            rate_limiter=rate_limiter,
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            timeout=timeout,
+        )
         self.session.headers["User-Agent"] = (
             f"Minim/{VERSION} +{REPOSITORY_URL}"
         )
+        self.rate_limit = None
+        self._rate_limit_lock = threading.Lock()
+        self._rate_limit_slot = self._rate_limit_window = 0.0
 
         if (
             access_token is None
-            and _config.has_section(self._NAME)
             and not overwrite
+            and (config := credentials.get_store().get(self._NAME))
         ):
-            flow = _config.get(self._NAME, "flow")
-            access_token = _config.get(self._NAME, "access_token")
-            access_token_secret = _config.get(
-                self._NAME, "access_token_secret"
-            )
-            consumer_key = _config.get(self._NAME, "consumer_key")
-            consumer_secret = _config.get(self._NAME, "consumer_secret")
+            flow = config["flow"]
+            access_token = config["access_token"]
+            access_token_secret = config["access_token_secret"]
+            consumer_key = config["consumer_key"]
+            consumer_secret = config["consumer_secret"]
         elif flow is None and access_token is not None:
             flow = "discogs" if access_token_secret is None else "oauth"
 
@@ -267,7 +311,12 @@ class API:
             redirect_uri=redirect_uri,
             save=save,
         )
-        self.set_access_token(access_token, access_token_secret)
+        self._defer_authentication(
+            functools.partial(
+                self.set_access_token, access_token, access_token_secret
+            ),
+            lazy,
+        )
 
     def _check_authentication(self, endpoint: str, token: bool = True) -> None:
         """
@@ -340,6 +389,8 @@ class API:
         resp : `requests.Response`
             Response to the request.
         """
+        self._authenticate()
+
         if "headers" not in kwargs:
             kwargs["headers"] = {}
         if self._flow == "oauth" and "Authorization" not in kwargs["headers"]:
@@ -357,7 +408,9 @@ class API:
                 f'{k}="{v}"' for k, v in oauth.items()
             )
 
+        self._throttle()
         r = self.session.request(method, url, **kwargs)
+        self._update_rate_limit(r)
         if r.status_code not in range(200, 299):
             j = r.json()
             emsg = f"{r.status_code}: {j['message']}"
@@ -366,6 +419,87 @@ class API:
             raise RuntimeError(emsg)
         return r
 
+    def _throttle(self) -> None:
+        """
+        Wait until the next request can be sent without exceeding the
+        rate limit budget, spreading the remaining requests evenly over
+        the rest of the current 60-second window. Once the budget is
+        used up, requests are spread evenly over the budget of the
+        following windows instead.
+        """
+        with self._rate_limit_lock:
+            if self.rate_limit is None:
+                return
+            now = time.monotonic()
+            limit = self.rate_limit["limit"]
+            interval = 60 / limit
+            if now >= self._rate_limit_window:
+                # Roll over in steps of 60 seconds to stay aligned with
+                # the window observed from the server.
+                self._rate_limit_window += 60 * (
+                    1 + (now - self._rate_limit_window) // 60
+                )
+                # Requests already queued in the new window count
+                # against its budget.
+                queued = min(
+                    limit,
+                    math.ceil(
+                        max(0.0, self._rate_limit_slot - now) / interval
+                    ),
+                )
+                self.rate_limit["used"] = queued
+                self.rate_limit["remaining"] = limit - queued
+            remaining = self.rate_limit["remaining"]
+            if (
+                remaining > 0
+                and transport._priority.get() < transport.PRIORITIES["normal"]
+            ):
+                # Interactive requests use the remaining budget right
+                # away instead of queueing behind the spread-out slots.
+                slot = now
+            elif remaining > 0:
+                slot = max(now, self._rate_limit_slot)
+                self._rate_limit_slot = slot + (
+                    self._rate_limit_window - slot
+                ) / (remaining + 1)
+            else:
+                slot = max(self._rate_limit_slot, self._rate_limit_window)
+                self._rate_limit_slot = slot + interval
+            self.rate_limit["remaining"] = max(0, remaining - 1)
+        if (delay := slot - now) > 0:
+            time.sleep(delay)
+
+    def _update_rate_limit(self, r: requests.Response) -> None:
+        """
+        Update the rate limit budget using the
+        :code:`X-Discogs-Ratelimit-*` headers of a response.
+
+        Parameters
+        ----------
+        r : `requests.Response`
+            Response from the Discogs API.
+        """
+        try:
+            rate_limit = {
+                "limit": int(r.headers["X-Discogs-Ratelimit"]),
+                "used": int(r.headers["X-Discogs-Ratelimit-Used"]),
+                "remaining": int(r.headers["X-Discogs-Ratelimit-Remaining"]),
+            }
+        except (KeyError, ValueError):
+            return
+        if getattr(r, "from_cache", False):
+            return
+        with self._rate_limit_lock:
+            if self.rate_limit is None or (
+                rate_limit["used"] < self.rate_limit["used"]
+            ):
+                # The new window started no later than when the request
+                # was sent.
+                self._rate_limit_window = (
+                    time.monotonic() - r.elapsed.total_seconds() + 60
+                )
+            self.rate_limit = rate_limit
+
     def set_access_token(
         self, access_token: str = None, access_token_secret: str = None
     ) -> None:
@@ -404,6 +538,8 @@ class API:
                 if self._web_framework == "playwright":
                     har_file = DIR_TEMP / "minim_discogs.har"
 
+                    from playwright.sync_api import sync_playwright
+
                     with sync_playwright() as playwright:
                         browser = playwright.firefox.launch(headless=False)
                         context = browser.new_context(record_har_path=har_file)
@@ -446,6 +582,8 @@ class API:
                         oauth |= httpd.response
 
                     elif self._web_framework == "flask":
+                        from flask import Flask, request
+
                         app = Flask(__name__)
                         json_file = DIR_TEMP / "minim_discogs.json"
 
@@ -500,15 +638,14 @@ class API:
                 ).values()
 
                 if self._save:
-                    _config[self._NAME] = {
+                    config = {
                         "flow": self._flow,
                         "access_token": access_token,
                         "access_token_secret": access_token_secret,
                         "consumer_key": self._consumer_key,
                         "consumer_secret": self._consumer_secret,
                     }
-                    with open(DIR_HOME / "minim.cfg", "w") as f:
-                        _config.write(f)
+                    credentials.get_store().set(self._NAME, config)
 
             self._oauth |= {
                 "oauth_token": access_token,
@@ -660,7 +797,10 @@ class API:
                 web_framework
                 if web_framework is None
                 or web_framework == "http.server"
-                or globals()[f"FOUND_{web_framework.upper()}"]
+                or getattr(
+                    sys.modules[__package__],
+                    f"FOUND_{web_framework.upper()}",
+                )
                 else None
             )
             if self._web_framework is None and web_framework:
@@ -672,6 +812,83 @@ class API:
                 )
                 warnings.warn(wmsg)
 
+    def paginate(
+        self,
+        method: Union[str, Callable],
+        *args,
+        per_page: int = 100,
+        max_workers: int = None,
+        **kwargs,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield all items from a paginated Discogs API endpoint,
+        requesting one page at a time.
+
+        .. note::
+
+           This method is provided for convenience and is not a Discogs
+           API endpoint.
+
+        Parameters
+        ----------
+        method : `str` or `Callable`
+            Client method (or its name) for a Discogs API endpoint that
+            accepts `page` and `per_page` and returns a page of items,
+            like :meth:`get_inventory` or
+            :meth:`get_collection_folder_releases`.
+
+        *args
+            Positional arguments to pass to `method`.
+
+        per_page : `int`, keyword-only, default: :code:`100`
+            Maximum number of items to request per page.
+
+            **Maximum**: :code:`100`.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of pages to request concurrently once the
+            total number of items is known from the first page. The
+            items are still yielded in order, and every request still
+            passes through the client's rate limiter. If not specified,
+            pages are requested one at a time.
+
+        **kwargs
+            Keyword arguments to pass to `method`. If `page` is
+            specified, pagination starts from that page.
+
+        Yields
+        ------
+        item : `dict`
+            Discogs content metadata for an item, such as a listing or a
+            release.
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        kwargs["page"] = int(kwargs.get("page") or 1)
+
+        def get_items(number: int) -> tuple[int, list[dict[str, Any]]]:
+            page = method(
+                *args, per_page=per_page, **kwargs | {"page": number}
+            )
+            return page["pagination"]["pages"], next(
+                v
+                for k, v in page.items()
+                if k != "pagination" and isinstance(v, list)
+            )
+
+        while True:
+            pages, items = get_items(kwargs["page"])
+            yield from items
+            if not items or kwargs["page"] >= pages:
+                return
+            kwargs["page"] += 1
+            if max_workers and max_workers > 1:
+                for _, items in transport._imap(
+                    get_items, range(kwargs["page"], pages + 1), max_workers
+                ):
+                    yield from items
+                return
+
     ### DATABASE ##############################################################
 
     def get_release(
@@ -1913,6 +2130,66 @@ class API:
             },
         )
 
+    def iter_inventory(
+        self,
+        username: str = None,
+        *,
+        status: str = None,
+        sort: str = None,
+        sort_order: str = None,
+        max_workers: int = None,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield all listings in a seller's inventory.
+
+        .. admonition:: User authentication
+           :class: dropdown warning
+
+           If you are authenticated as the inventory owner, additional
+           fields are returned for each listing.
+
+        .. note::
+
+           This method is provided for convenience and is not a Discogs
+           API endpoint.
+
+        Parameters
+        ----------
+        username : `str`, optional
+            The username of the seller whose inventory to get. If not
+            specified, the username of the authenticated user is used.
+
+        status : `str`, keyword-only, optional
+            Only show listings with this status. See
+            :meth:`get_inventory` for valid values.
+
+        sort : `str`, keyword-only, optional
+            Sort items by this field. See :meth:`get_inventory` for
+            valid values.
+
+        sort_order : `str`, keyword-only, optional
+            Sort items in a particular order.
+
+            **Valid values**: :code:`"asc"` and :code:`"desc"`.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of pages to request concurrently. If not
+            specified, pages are requested one at a time.
+
+        Yields
+        ------
+        listing : `dict`
+            Marketplace listing.
+        """
+        yield from self.paginate(
+            self.get_inventory,
+            username,
+            status=status,
+            sort=sort,
+            sort_order=sort_order,
+            max_workers=max_workers,
+        )
+
     def get_listing(
         self, listing_id: Union[int, str], *, curr_abbr: str = None
     ) -> dict[str, Any]:
@@ -4614,6 +4891,66 @@ class API:
             },
         )
 
+    def iter_collection_folder_releases(
+        self,
+        folder_id: int,
+        *,
+        username: str = None,
+        sort: str = None,
+        sort_order: str = None,
+        max_workers: int = None,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield all items in a folder in a user's collection.
+
+        .. admonition:: User authentication
+           :class: dropdown warning
+
+           Authentication is required to view items in folders other
+           than the :code:`0` ("All") folder or in private collections.
+
+        .. note::
+
+           This method is provided for convenience and is not a Discogs
+           API endpoint.
+
+        Parameters
+        ----------
+        folder_id : `int`
+            The ID of the folder to request.
+
+        username : `str`, keyword-only, optional
+            The username of the collection you are trying to fetch. If
+            not specified, the username of the authenticated user is
+            used.
+
+        sort : `str`, keyword-only, optional
+            Sort items by this field. See
+            :meth:`get_collection_folder_releases` for valid values.
+
+        sort_order : `str`, keyword-only, optional
+            Sort items in a particular order.
+
+            **Valid values**: :code:`"asc"` and :code:`"desc"`.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of pages to request concurrently. If not
+            specified, pages are requested one at a time.
+
+        Yields
+        ------
+        release : `dict`
+            Basic information about a release in the folder.
+        """
+        yield from self.paginate(
+            self.get_collection_folder_releases,
+            folder_id,
+            username=username,
+            sort=sort,
+            sort_order=sort_order,
+            max_workers=max_workers,
+        )
+
     def add_collection_folder_release(
         self, folder_id: int, release_id: int, *, username: str = None
     ) -> dict[str, Union[int, str]]:
@@ -5499,3 +5836,25 @@ class API:
                   }
         """
         return self._get_json(f"{self.API_URL}/lists/{list_id}")
+
+
+class AsyncAPI(transport.AsyncClient):
+    """
+    Asynchronous Discogs API client.
+
+    Coroutine counterpart of :class:`API`. See
+    :class:`minim.transport.AsyncClient` for the constructor
+    parameters and how calls are dispatched.
+
+    Requests are still paced by the :code:`X-Discogs-Ratelimit-*`
+    budget, so a high `max_concurrency` mostly overlaps the latency of
+    requests rather than raising the request rate.
+
+    .. note::
+
+       The OAuth 1.0a flow, if used, may open a web browser or prompt
+       for a verifier in the constructor. To avoid blocking a running
+       event loop, use :code:`await AsyncAPI.create(...)` instead.
+    """
+
+    _CLIENT = API
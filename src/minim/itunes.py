@@ -11,10 +11,12 @@ from json.decoder import JSONDecodeError
 import requests
 from typing import Any, Union
 
-__all__ = ["SearchAPI"]
+from . import transport
 
+__all__ = ["AsyncSearchAPI", "SearchAPI"]
 
-class SearchAPI:
+
+class SearchAPI(transport._BatchExecutor):
     """
     iTunes Search API client.
 
@@ -31,19 +33,50 @@ class SearchAPI:
        documentation <https://developer.apple.com/library/archive/
        documentation/AudioVideo/Conceptual/iTuneSearchAPI/index.html>`_.
 
+    Parameters
+    ----------
+    rate_limiter : `minim.transport.RateLimiter`, keyword-only, optional
+        Client-side rate limiter. If not specified, up to 20 requests
+        can be sent back-to-back, after which requests are paced to
+        approximately 20 requests per minute, the rate limit of the
+        iTunes Search API. Since the rate limit applies to the IP
+        address, the default limiter is shared by all iTunes Search API
+        clients on this machine.
+
+    pool_size, keep_alive, timeout : keyword-only, optional
+        Options for the underlying HTTP session. See
+        :class:`minim.transport.Session`.
+
     Attributes
     ----------
     API_URL : `str`
         Base URL for the iTunes Search API.
+
+    session : `minim.transport.Session`
+        Session used to send requests to the iTunes Search API.
     """
 
+    _NAME = f"{__module__}.{__qualname__}"
     API_URL = "https://itunes.apple.com"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        rate_limiter: transport.RateLimiter = None,
+        pool_size: int = 32,
+        keep_alive: bool = True,
+        timeout: Union[float, tuple[float, float]] = (3.05, 30.0),
+    ) -> None:
         """
         Create a iTunes Search API client.
         """
-        self.session = requests.Session()
+        self.session = transport.Session(
+            rate_limiter=rate_limiter
+            or transport.RateLimiter(20 / 60, 20, name=self._NAME),
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            timeout=timeout,
+        )
 
     def _get_json(self, url: str, **kwargs) -> dict:
         """
@@ -573,3 +606,20 @@ class SearchAPI:
                 "sort": sort,
             },
         )
+
+
+class AsyncSearchAPI(transport.AsyncClient):
+    """
+    Asynchronous iTunes Search API client.
+
+    Coroutine counterpart of :class:`SearchAPI`. See
+    :class:`minim.transport.AsyncClient` for the constructor
+    parameters and how calls are dispatched.
+
+    The iTunes Search API does not require authentication, so the
+    constructor sends no requests and can be called from a running
+    event loop. Since requests are paced by the client's rate limiter,
+    a small `max_concurrency` is usually sufficient.
+    """
+
+    _CLIENT = SearchAPI
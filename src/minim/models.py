@@ -0,0 +1,1034 @@
+"""
+Models
+======
+.. moduleauthor:: Benjamin Ye <GitHub: bbye98>
+
+This module contains compact, service-independent models for tracks,
+albums, and artists.
+
+The API clients return the JSON responses of the services as nested
+dictionaries. When many items need to be held in memory, such as all
+items of a large playlist or a user's entire collection, they can be
+converted into these models instead. Only the commonly used fields are
+kept, and the models use :code:`__slots__`, so each object takes a
+fraction of the memory of the corresponding dictionary. Artists and
+albums can also be shared between the tracks that reference them by
+passing the same `cache` to the adapters.
+
+Each model has one adapter (:code:`from_discogs`, :code:`from_itunes`,
+:code:`from_qobuz`, :code:`from_spotify`, and :code:`from_tidal`) per
+service, so code that works with several services can rely on a single
+shape. Fields that a service does not provide are :code:`None`, and all
+IDs are strings.
+"""
+
+import re
+from typing import Any
+
+__all__ = ["Album", "Artist", "Track"]
+
+_ISO_DURATION = re.compile(
+    r"P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?"
+    r"(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?"
+)
+
+
+def _get_cached(
+    cache: dict[tuple, Any],
+    cls: type,
+    service: str,
+    id: Any,
+    data: dict,
+    **kwargs,
+) -> Any:
+    """
+    Get a shared model from a cache, creating it using the adapter for
+    a service if necessary.
+
+    Parameters
+    ----------
+    cache : `dict`
+        Cache of models keyed by type, service, and ID. If
+        :code:`None`, a new model is always created.
+
+    cls : `type`
+        Model class.
+
+    service : `str`
+        Service name.
+
+    id : `Any`
+        ID of the item, or :code:`None` if it has no ID.
+
+    data : `dict`
+        Information about the item.
+
+    **kwargs
+        Keyword arguments passed to the adapter, such as the resources
+        included in a TIDAL API response.
+
+    Returns
+    -------
+    model : `Album` or `Artist`
+        Model.
+    """
+    adapter = getattr(cls, f"from_{service}")
+    if cache is None or id is None:
+        return adapter(data, **kwargs)
+    key = (cls, service, str(id))
+    if key not in cache:
+        cache[key] = adapter(data, cache=cache, **kwargs)
+    return cache[key]
+
+
+def _get_related(
+    resource: dict[str, Any],
+    relationship: str,
+    included: list[dict[str, Any]] = None,
+) -> list[dict[str, Any]]:
+    """
+    Get the resources related to a TIDAL API resource.
+
+    Parameters
+    ----------
+    resource : `dict`
+        TIDAL API resource.
+
+    relationship : `str`
+        Relationship name, like :code:`"artists"`.
+
+    included : `list`, optional
+        Resources included in the TIDAL API response.
+
+    Returns
+    -------
+    resources : `list`
+        Related resources found in `included`, or resource identifier
+        objects containing only the type and ID of those that were not.
+    """
+    identifiers = (resource.get("relationships") or {}).get(
+        relationship, {}
+    ).get("data") or []
+    included = {(r["type"], r["id"]): r for r in included or ()}
+    return [included.get((i["type"], i["id"]), i) for i in identifiers]
+
+
+def _parse_duration(duration: Any) -> float:
+    """
+    Parse a duration into seconds.
+
+    Parameters
+    ----------
+    duration : `int`, `float`, or `str`
+        Duration as a number of seconds, an ISO 8601 duration like
+        :code:`"PT3M20S"`, or a timestamp like :code:`"3:20"`.
+
+    Returns
+    -------
+    duration : `float`
+        Duration in seconds, or :code:`None` if `duration` is empty or
+        cannot be parsed.
+    """
+    if duration is None or duration == "":
+        return None
+    if isinstance(duration, (int, float)):
+        return float(duration)
+    if match := _ISO_DURATION.fullmatch(duration):
+        return (
+            86_400 * float(match["days"] or 0)
+            + 3_600 * float(match["hours"] or 0)
+            + 60 * float(match["minutes"] or 0)
+            + float(match["seconds"] or 0)
+        )
+    try:
+        seconds = 0.0
+        for part in duration.split(":"):
+            seconds = 60 * seconds + float(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+def _parse_position(position: str) -> tuple[int, int]:
+    """
+    Parse a Discogs tracklist position into disc and track numbers.
+
+    Parameters
+    ----------
+    position : `str`
+        Position, like :code:`"3"`, :code:`"2-5"`, :code:`"CD2-5"`, or
+        :code:`"A1"`.
+
+    Returns
+    -------
+    disc_number : `int`
+        Disc number, or :code:`None` if the position does not specify
+        one.
+
+    track_number : `int`
+        Track number, or :code:`None` if the position does not contain
+        one.
+    """
+    numbers = [int(n) for n in re.findall(r"\d+", position or "")]
+    if len(numbers) >= 2:
+        return numbers[-2], numbers[-1]
+    return None, numbers[0] if numbers else None
+
+
+def _str(id: Any) -> str:
+    """
+    Convert an ID to a string.
+
+    Parameters
+    ----------
+    id : `Any`
+        ID.
+
+    Returns
+    -------
+    id : `str`
+        ID as a string, or :code:`None` if `id` is :code:`None`.
+    """
+    return None if id is None else str(id)
+
+
+class _Model:
+    """
+    Base class for models.
+
+    .. attention::
+
+       This class should *not* be instantiated manually. Subclasses must
+       define `__slots__`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **kwargs) -> None:
+        """
+        Create a model. Fields that are not specified are set to
+        :code:`None`.
+        """
+        for name in self.__slots__:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            emsg = (
+                f"{type(self).__name__} has no field(s) "
+                f"{', '.join(map(repr, kwargs))}."
+            )
+            raise TypeError(emsg)
+
+    def __repr__(self) -> str:
+        name = getattr(self, "title", None) or getattr(self, "name", None)
+        return (
+            f"{type(self).__name__}(service={self.service!r}, "
+            f"id={self.id!r}, {name!r})"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the model into a dictionary.
+
+        Returns
+        -------
+        model : `dict`
+            Fields of the model, with nested models also converted into
+            dictionaries.
+        """
+        d = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, _Model):
+                value = value.to_dict()
+            elif isinstance(value, tuple):
+                value = [
+                    v.to_dict() if isinstance(v, _Model) else v for v in value
+                ]
+            d[name] = value
+        return d
+
+
+class Artist(_Model):
+    """
+    Artist.
+
+    Attributes
+    ----------
+    service : `str`
+        Service the information was obtained from.
+
+    id : `str`
+        Artist ID in the service.
+
+    name : `str`
+        Artist name.
+    """
+
+    __slots__ = ("service", "id", "name")
+
+    @classmethod
+    def from_discogs(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Artist":
+        """
+        Create an artist from Discogs API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            Discogs artist or release artist.
+
+        cache : `dict`, keyword-only, optional
+            Unused. Accepted for consistency with the other adapters.
+
+        Returns
+        -------
+        artist : `Artist`
+            Artist.
+        """
+        return cls(
+            service="discogs",
+            id=_str(data.get("id")),
+            name=data.get("name"),
+        )
+
+    @classmethod
+    def from_itunes(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Artist":
+        """
+        Create an artist from iTunes Search API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            iTunes artist, album, or track.
+
+        cache : `dict`, keyword-only, optional
+            Unused. Accepted for consistency with the other adapters.
+
+        Returns
+        -------
+        artist : `Artist`
+            Artist.
+        """
+        return cls(
+            service="itunes",
+            id=_str(data.get("artistId")),
+            name=data.get("artistName"),
+        )
+
+    @classmethod
+    def from_qobuz(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Artist":
+        """
+        Create an artist from Qobuz API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            Qobuz artist or track performer.
+
+        cache : `dict`, keyword-only, optional
+            Unused. Accepted for consistency with the other adapters.
+
+        Returns
+        -------
+        artist : `Artist`
+            Artist.
+        """
+        name = data.get("name")
+        if isinstance(name, dict):
+            name = name.get("display")
+        return cls(service="qobuz", id=_str(data.get("id")), name=name)
+
+    @classmethod
+    def from_spotify(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Artist":
+        """
+        Create an artist from Spotify Web API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            Spotify artist or simplified artist.
+
+        cache : `dict`, keyword-only, optional
+            Unused. Accepted for consistency with the other adapters.
+
+        Returns
+        -------
+        artist : `Artist`
+            Artist.
+        """
+        return cls(service="spotify", id=data.get("id"), name=data.get("name"))
+
+    @classmethod
+    def from_tidal(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Artist":
+        """
+        Create an artist from TIDAL API or private TIDAL API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            TIDAL artist resource or private TIDAL API artist.
+
+        cache : `dict`, keyword-only, optional
+            Unused. Accepted for consistency with the other adapters.
+
+        Returns
+        -------
+        artist : `Artist`
+            Artist.
+        """
+        attributes = data.get("attributes", data)
+        return cls(
+            service="tidal",
+            id=_str(data.get("id")),
+            name=attributes.get("name"),
+        )
+
+
+class Album(_Model):
+    """
+    Album.
+
+    Attributes
+    ----------
+    service : `str`
+        Service the information was obtained from.
+
+    id : `str`
+        Album ID in the service.
+
+    title : `str`
+        Album title.
+
+    artists : `tuple`
+        Album artists as :class:`Artist` objects.
+
+    upc : `str`
+        Universal Product Code (UPC) or other barcode.
+
+    release_date : `str`
+        Release date in ISO 8601 format, like :code:`"2017-03-03"`. May
+        only contain the year or the year and month.
+
+    track_count : `int`
+        Number of tracks.
+
+    disc_count : `int`
+        Number of discs.
+
+    artwork_url : `str`
+        URL of the largest available cover art.
+    """
+
+    __slots__ = (
+        "service",
+        "id",
+        "title",
+        "artists",
+        "upc",
+        "release_date",
+        "track_count",
+        "disc_count",
+        "artwork_url",
+    )
+
+    @classmethod
+    def from_discogs(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Album":
+        """
+        Create an album from Discogs API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            Discogs release, or collection, wantlist, or inventory item
+            containing basic information about a release.
+
+        cache : `dict`, keyword-only, optional
+            Cache for sharing :class:`Artist` objects.
+
+        Returns
+        -------
+        album : `Album`
+            Album.
+        """
+        data = data.get("basic_information", data)
+        released = data.get("released") or data.get("year") or None
+        images = data.get("images") or []
+        return cls(
+            service="discogs",
+            id=_str(data.get("id")),
+            title=data.get("title"),
+            artists=tuple(
+                _get_cached(cache, Artist, "discogs", a.get("id"), a)
+                for a in data.get("artists", ())
+            ),
+            upc=next(
+                (
+                    i["value"]
+                    for i in data.get("identifiers", ())
+                    if i.get("type") == "Barcode"
+                ),
+                None,
+            ),
+            release_date=_str(released),
+            track_count=len(data["tracklist"])
+            if "tracklist" in data
+            else None,
+            disc_count=(
+                sum(int(f.get("qty") or 1) for f in data["formats"])
+                if data.get("formats")
+                else None
+            ),
+            artwork_url=next(
+                (i["uri"] for i in images if i.get("type") == "primary"),
+                images[0]["uri"] if images else data.get("cover_image"),
+            ),
+        )
+
+    @classmethod
+    def from_itunes(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Album":
+        """
+        Create an album from iTunes Search API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            iTunes album (collection) or track.
+
+        cache : `dict`, keyword-only, optional
+            Cache for sharing :class:`Artist` objects.
+
+        Returns
+        -------
+        album : `Album`
+            Album. If `data` is a track, the album artist is the track
+            artist and the release date is that of the track.
+        """
+        is_album = data.get("wrapperType") == "collection"
+        return cls(
+            service="itunes",
+            id=_str(data.get("collectionId")),
+            title=data.get("collectionName"),
+            artists=(
+                _get_cached(
+                    cache, Artist, "itunes", data.get("artistId"), data
+                ),
+            ),
+            release_date=(data.get("releaseDate") or "")[:10] or None,
+            track_count=data.get("trackCount"),
+            disc_count=None if is_album else data.get("discCount"),
+            artwork_url=data.get("artworkUrl100"),
+        )
+
+    @classmethod
+    def from_qobuz(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Album":
+        """
+        Create an album from Qobuz API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            Qobuz album.
+
+        cache : `dict`, keyword-only, optional
+            Cache for sharing :class:`Artist` objects.
+
+        Returns
+        -------
+        album : `Album`
+            Album.
+        """
+        if artists := data.get("artists"):
+            artists = [a for a in artists if "main-artist" in a["roles"]]
+        else:
+            artists = [data["artist"]] if data.get("artist") else []
+        return cls(
+            service="qobuz",
+            id=_str(data.get("id")),
+            title=data.get("title"),
+            artists=tuple(
+                _get_cached(cache, Artist, "qobuz", a.get("id"), a)
+                for a in artists
+            ),
+            upc=data.get("upc"),
+            release_date=data.get("release_date_original"),
+            track_count=data.get("tracks_count"),
+            disc_count=data.get("media_count"),
+            artwork_url=(data.get("image") or {}).get("large"),
+        )
+
+    @classmethod
+    def from_spotify(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Album":
+        """
+        Create an album from Spotify Web API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            Spotify album, simplified album, or saved album.
+
+        cache : `dict`, keyword-only, optional
+            Cache for sharing :class:`Artist` objects.
+
+        Returns
+        -------
+        album : `Album`
+            Album.
+        """
+        if isinstance(data.get("album"), dict) and "added_at" in data:
+            data = data["album"]
+        images = data.get("images") or []
+        return cls(
+            service="spotify",
+            id=data.get("id"),
+            title=data.get("name"),
+            artists=tuple(
+                _get_cached(cache, Artist, "spotify", a.get("id"), a)
+                for a in data.get("artists", ())
+            ),
+            upc=(data.get("external_ids") or {}).get("upc"),
+            release_date=data.get("release_date"),
+            track_count=data.get("total_tracks"),
+            artwork_url=images[0]["url"] if images else None,
+        )
+
+    @classmethod
+    def from_tidal(
+        cls,
+        data: dict[str, Any],
+        *,
+        included: list[dict[str, Any]] = None,
+        cache: dict = None,
+    ) -> "Album":
+        """
+        Create an album from TIDAL API or private TIDAL API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            TIDAL album resource or private TIDAL API album.
+
+        included : `list`, keyword-only, optional
+            Resources included in the TIDAL API response, used to look
+            up the album artists. Not used for private TIDAL API data.
+
+        cache : `dict`, keyword-only, optional
+            Cache for sharing :class:`Artist` objects.
+
+        Returns
+        -------
+        album : `Album`
+            Album.
+        """
+        if "attributes" in data:
+            attributes = data["attributes"]
+            images = sorted(
+                attributes.get("imageLinks") or (),
+                key=lambda i: i.get("meta", {}).get("width", 0),
+            )
+            return cls(
+                service="tidal",
+                id=_str(data.get("id")),
+                title=attributes.get("title"),
+                artists=tuple(
+                    _get_cached(cache, Artist, "tidal", a.get("id"), a)
+                    for a in _get_related(data, "artists", included)
+                ),
+                upc=attributes.get("barcodeId"),
+                release_date=attributes.get("releaseDate"),
+                track_count=attributes.get("numberOfItems"),
+                disc_count=attributes.get("numberOfVolumes"),
+                artwork_url=images[-1]["href"] if images else None,
+            )
+
+        if isinstance(data.get("item"), dict):
+            data = data["item"]
+        artists = data.get("artists") or (
+            [data["artist"]] if data.get("artist") else []
+        )
+        return cls(
+            service="tidal",
+            id=_str(data.get("id")),
+            title=data.get("title"),
+            artists=tuple(
+                _get_cached(cache, Artist, "tidal", a.get("id"), a)
+                for a in artists
+                if a.get("type", "MAIN") == "MAIN"
+            ),
+            upc=data.get("upc"),
+            release_date=data.get("releaseDate"),
+            track_count=data.get("numberOfTracks"),
+            disc_count=data.get("numberOfVolumes"),
+            artwork_url=(
+                "https://resources.tidal.com/images/"
+                f"{data['cover'].replace('-', '/')}/1280x1280.jpg"
+                if data.get("cover")
+                else None
+            ),
+        )
+
+
+class Track(_Model):
+    """
+    Track.
+
+    Attributes
+    ----------
+    service : `str`
+        Service the information was obtained from.
+
+    id : `str`
+        Track ID in the service.
+
+    title : `str`
+        Track title.
+
+    artists : `tuple`
+        Track artists as :class:`Artist` objects.
+
+    album : `Album`
+        Album the track appears on.
+
+    isrc : `str`
+        International Standard Recording Code (ISRC).
+
+    duration : `float`
+        Duration in seconds.
+
+    disc_number : `int`
+        Disc number.
+
+    track_number : `int`
+        Track number on the disc.
+
+    explicit : `bool`
+        Whether the track has explicit content.
+
+    artwork_url : `str`
+        URL of the largest available cover art of the album.
+    """
+
+    __slots__ = (
+        "service",
+        "id",
+        "title",
+        "artists",
+        "album",
+        "isrc",
+        "duration",
+        "disc_number",
+        "track_number",
+        "explicit",
+        "artwork_url",
+    )
+
+    @classmethod
+    def from_discogs(
+        cls,
+        data: dict[str, Any],
+        *,
+        release: dict[str, Any] = None,
+        cache: dict = None,
+    ) -> "Track":
+        """
+        Create a track from Discogs API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            Track in the tracklist of a Discogs release. Discogs tracks
+            have no IDs, so the ID of the resulting track is
+            :code:`None`.
+
+        release : `dict`, keyword-only, optional
+            Discogs release containing the track. If provided, the
+            release is used as the album and its artists are used if the
+            track does not list its own.
+
+        cache : `dict`, keyword-only, optional
+            Cache for sharing :class:`Album` and :class:`Artist`
+            objects.
+
+        Returns
+        -------
+        track : `Track`
+            Track.
+        """
+        album = (
+            _get_cached(cache, Album, "discogs", release.get("id"), release)
+            if release
+            else None
+        )
+        disc_number, track_number = _parse_position(data.get("position"))
+        return cls(
+            service="discogs",
+            title=data.get("title"),
+            artists=(
+                tuple(
+                    _get_cached(cache, Artist, "discogs", a.get("id"), a)
+                    for a in data["artists"]
+                )
+                if data.get("artists")
+                else album.artists
+                if album
+                else ()
+            ),
+            album=album,
+            duration=_parse_duration(data.get("duration")),
+            disc_number=disc_number,
+            track_number=track_number,
+            artwork_url=album.artwork_url if album else None,
+        )
+
+    @classmethod
+    def from_itunes(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Track":
+        """
+        Create a track from iTunes Search API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            iTunes track.
+
+        cache : `dict`, keyword-only, optional
+            Cache for sharing :class:`Album` and :class:`Artist`
+            objects.
+
+        Returns
+        -------
+        track : `Track`
+            Track. The iTunes Search API does not provide ISRCs.
+        """
+        duration = data.get("trackTimeMillis")
+        return cls(
+            service="itunes",
+            id=_str(data.get("trackId")),
+            title=data.get("trackName"),
+            artists=(
+                _get_cached(
+                    cache, Artist, "itunes", data.get("artistId"), data
+                ),
+            ),
+            album=_get_cached(
+                cache, Album, "itunes", data.get("collectionId"), data
+            ),
+            duration=None if duration is None else duration / 1_000,
+            disc_number=data.get("discNumber"),
+            track_number=data.get("trackNumber"),
+            explicit=(
+                data["trackExplicitness"] == "explicit"
+                if "trackExplicitness" in data
+                else None
+            ),
+            artwork_url=data.get("artworkUrl100"),
+        )
+
+    @classmethod
+    def from_qobuz(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Track":
+        """
+        Create a track from Qobuz API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            Qobuz track.
+
+        cache : `dict`, keyword-only, optional
+            Cache for sharing :class:`Album` and :class:`Artist`
+            objects.
+
+        Returns
+        -------
+        track : `Track`
+            Track.
+        """
+        album = (
+            _get_cached(
+                cache, Album, "qobuz", data["album"].get("id"), data["album"]
+            )
+            if data.get("album")
+            else None
+        )
+        return cls(
+            service="qobuz",
+            id=_str(data.get("id")),
+            title=data.get("title"),
+            artists=(
+                (
+                    _get_cached(
+                        cache,
+                        Artist,
+                        "qobuz",
+                        data["performer"].get("id"),
+                        data["performer"],
+                    ),
+                )
+                if data.get("performer")
+                else ()
+            ),
+            album=album,
+            isrc=data.get("isrc"),
+            duration=_parse_duration(data.get("duration")),
+            disc_number=data.get("media_number"),
+            track_number=data.get("track_number"),
+            explicit=data.get("parental_warning"),
+            artwork_url=album.artwork_url if album else None,
+        )
+
+    @classmethod
+    def from_spotify(
+        cls, data: dict[str, Any], *, cache: dict = None
+    ) -> "Track":
+        """
+        Create a track from Spotify Web API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            Spotify track, or playlist or saved track item containing a
+            track.
+
+        cache : `dict`, keyword-only, optional
+            Cache for sharing :class:`Album` and :class:`Artist`
+            objects.
+
+        Returns
+        -------
+        track : `Track`
+            Track.
+        """
+        if isinstance(data.get("track"), dict):
+            data = data["track"]
+        album = (
+            _get_cached(
+                cache, Album, "spotify", data["album"].get("id"), data["album"]
+            )
+            if data.get("album")
+            else None
+        )
+        duration = data.get("duration_ms")
+        return cls(
+            service="spotify",
+            id=data.get("id"),
+            title=data.get("name"),
+            artists=tuple(
+                _get_cached(cache, Artist, "spotify", a.get("id"), a)
+                for a in data.get("artists", ())
+            ),
+            album=album,
+            isrc=(data.get("external_ids") or {}).get("isrc"),
+            duration=None if duration is None else duration / 1_000,
+            disc_number=data.get("disc_number"),
+            track_number=data.get("track_number"),
+            explicit=data.get("explicit"),
+            artwork_url=album.artwork_url if album else None,
+        )
+
+    @classmethod
+    def from_tidal(
+        cls,
+        data: dict[str, Any],
+        *,
+        included: list[dict[str, Any]] = None,
+        cache: dict = None,
+    ) -> "Track":
+        """
+        Create a track from TIDAL API or private TIDAL API data.
+
+        Parameters
+        ----------
+        data : `dict`
+            TIDAL track resource, or private TIDAL API track or
+            favorite or playlist item containing a track.
+
+        included : `list`, keyword-only, optional
+            Resources included in the TIDAL API response, used to look
+            up the track's artists and album and the album's artists.
+            Not used for private TIDAL API data. The TIDAL API does not
+            provide disc and track numbers for tracks outside of albums.
+
+        cache : `dict`, keyword-only, optional
+            Cache for sharing :class:`Album` and :class:`Artist`
+            objects.
+
+        Returns
+        -------
+        track : `Track`
+            Track.
+        """
+        if "attributes" in data:
+            attributes = data["attributes"]
+            albums = _get_related(data, "albums", included)
+            album = (
+                _get_cached(
+                    cache,
+                    Album,
+                    "tidal",
+                    albums[0]["id"],
+                    albums[0],
+                    included=included,
+                )
+                if albums and "attributes" in albums[0]
+                else None
+            )
+            return cls(
+                service="tidal",
+                id=_str(data.get("id")),
+                title=attributes.get("title"),
+                artists=tuple(
+                    _get_cached(cache, Artist, "tidal", a.get("id"), a)
+                    for a in _get_related(data, "artists", included)
+                ),
+                album=album,
+                isrc=attributes.get("isrc"),
+                duration=_parse_duration(attributes.get("duration")),
+                explicit=attributes.get("explicit"),
+                artwork_url=album.artwork_url if album else None,
+            )
+
+        if isinstance(data.get("item"), dict):
+            data = data["item"]
+        album = (
+            _get_cached(
+                cache, Album, "tidal", data["album"].get("id"), data["album"]
+            )
+            if data.get("album")
+            else None
+        )
+        return cls(
+            service="tidal",
+            id=_str(data.get("id")),
+            title=data.get("title"),
+            artists=tuple(
+                _get_cached(cache, Artist, "tidal", a.get("id"), a)
+                for a in data.get("artists", ())
+                if a.get("type", "MAIN") == "MAIN"
+            ),
+            album=album,
+            isrc=data.get("isrc"),
+            duration=_parse_duration(data.get("duration")),
+            disc_number=data.get("volumeNumber"),
+            track_number=data.get("trackNumber"),
+            explicit=data.get("explicit"),
+            artwork_url=album.artwork_url if album else None,
+        )
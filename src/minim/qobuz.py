@@ -12,16 +12,14 @@ import hashlib
 import logging
 import os
 import re
-from typing import Any, Union
+import threading
+from typing import Any, Callable, Generator, Union
 
 import requests
 
-from . import FOUND_PLAYWRIGHT, DIR_HOME, DIR_TEMP, _config
+from . import FOUND_PLAYWRIGHT, DIR_TEMP, credentials, transport
 
-if FOUND_PLAYWRIGHT:
-    from playwright.sync_api import sync_playwright
-
-__all__ = ["PrivateAPI"]
+__all__ = ["AsyncPrivateAPI", "PrivateAPI"]
 
 
 def _parse_performers(
@@ -89,7 +87,7 @@ def _parse_performers(
     return credits
 
 
-class PrivateAPI:
+class PrivateAPI(transport._LazyAuthentication, transport._BatchExecutor):
     """
     Private Qobuz API client.
 
@@ -122,7 +120,9 @@ class PrivateAPI:
     as keyword arguments. The app credentials can also be stored as
     :code:`QOBUZ_PRIVATE_APP_ID` and :code:`QOBUZ_PRIVATE_APP_SECRET`
     in the operating system's environment variables, and they will
-    automatically be retrieved.
+    automatically be retrieved. Otherwise, they are scraped from the
+    Qobuz Web Player and cached in the Minim configuration file until
+    a signed request fails, at which point they are scraped again.
 
     .. tip::
 
@@ -188,6 +188,15 @@ class PrivateAPI:
         their associated properties are stored to the Minim
         configuration file.
 
+    lazy : `bool`, keyword-only, default: :code:`False`
+        Determines whether authentication, which may require network
+        requests, is deferred until the first request that needs it so
+        that creating the client is purely local.
+
+    rate_limiter, pool_size, keep_alive, timeout : keyword-only, optional
+        Options for the underlying HTTP session, such as a client-side
+        rate limiter. See :class:`minim.transport.Session`.
+
     Attributes
     ----------
     API_URL : `str`
@@ -199,6 +208,13 @@ class PrivateAPI:
 
     _FLOWS = {"password"}
     _NAME = f"{__module__}.{__qualname__}"
+    _PROCESS_STATE = transport._LazyAuthentication._PROCESS_STATE | {
+        "_app_lock": threading.Lock
+    }
+    _APP_NAME = f"{_NAME}.app"
+    _APP_ERROR = re.compile(
+        r"^40[01] .*(app_id|app id|request_sig|signature)", re.IGNORECASE
+    )
     API_URL = "https://www.qobuz.com/api.json/0.2"
     WEB_URL = "https://play.qobuz.com"
 
@@ -215,33 +231,53 @@ class PrivateAPI:
         auth_token: str = None,
         overwrite: bool = False,
         save: bool = True,
+        lazy: bool = False,
+        rate_limiter: transport.RateLimiter = None,
+        pool_size: int = 32,
+        keep_alive: bool = True,
+        timeout: Union[float, tuple[float, float]] = (3.05, 30.0),
     ) -> None:
         """
         Create a private Qobuz API client.
         """
-        self.session = requests.Session()
+        self.session = transport.Session(
+            rate_limiter=rate_limiter,
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            timeout=timeout,
+        )
+        self._app_lock = threading.Lock()
         if user_agent:
             self.session.headers["User-Agent"] = user_agent
 
+        app_cached = False
         if (
             auth_token is None
-            and _config.has_section(self._NAME)
             and not overwrite
+            and (config := credentials.get_store().get(self._NAME))
         ):
-            flow = _config.get(self._NAME, "flow") or None
-            auth_token = _config.get(self._NAME, "auth_token")
-            app_id = _config.get(self._NAME, "app_id")
-            app_secret = _config.get(self._NAME, "app_secret")
-
-        self.set_flow(
-            flow,
-            app_id=app_id,
-            app_secret=app_secret,
-            auth_token=auth_token,
-            browser=browser,
-            save=save,
-        )
-        self.set_auth_token(auth_token, email=email, password=password)
+            flow = config["flow"] or None
+            auth_token = config["auth_token"]
+            app_id = config["app_id"]
+            app_secret = config["app_secret"]
+            app_cached = bool(app_id and app_secret)
+
+        def authenticate() -> None:
+            self.set_flow(
+                flow,
+                app_id=app_id,
+                app_secret=app_secret,
+                auth_token=auth_token,
+                browser=browser,
+                save=save,
+            )
+            if app_cached:
+                # App credentials saved with the session can go stale
+                # just like those in the app credential cache.
+                self._app_cached = True
+            self.set_auth_token(auth_token, email=email, password=password)
+
+        self._defer_authentication(authenticate, lazy)
 
     def _check_authentication(self, endpoint: str) -> None:
         """
@@ -299,12 +335,35 @@ class PrivateAPI:
             JSON-encoded content of the response.
         """
         params = kwargs.pop("params", {})
+        app_secret = self._app_secret
         timestamp = datetime.datetime.now().timestamp()
-        params["request_ts"] = timestamp
-        params["request_sig"] = hashlib.md5(
-            f"{signature}{timestamp}{self._app_secret}".encode()
-        ).hexdigest()
-        return self._get_json(url, params=params, **kwargs)
+        try:
+            return self._get_json(
+                url,
+                params=params
+                | {
+                    "request_ts": timestamp,
+                    "request_sig": hashlib.md5(
+                        f"{signature}{timestamp}{app_secret}".encode()
+                    ).hexdigest(),
+                },
+                **kwargs,
+            )
+        except RuntimeError as e:
+            # Only an invalid app ID or request signature suggests that
+            # the cached app credentials are stale.
+            if not self._app_cached or not self._APP_ERROR.search(str(e)):
+                raise
+            with self._app_lock:
+                if self._app_secret == app_secret:
+                    logging.warning(
+                        f"{e}. The cached app credentials may be stale, "
+                        "so they will be scraped again."
+                    )
+                    self._set_app_credentials(None, None, cache=False)
+            return self._get_json_secret(
+                url, signature, params=params, **kwargs
+            )
 
     def _request(self, method: str, url: str, **kwargs) -> requests.Response:
         """
@@ -326,16 +385,43 @@ class PrivateAPI:
         resp : `requests.Response`
             Response to the request.
         """
+        self._authenticate()
+
         r = self.session.request(method, url, **kwargs)
         if r.status_code not in range(200, 299):
             error = r.json()
             raise RuntimeError(f"{error['code']} {error['message']}")
         return r
 
-    def _set_app_credentials(self, app_id: str, app_secret: str) -> None:
+    def _set_app_credentials(
+        self, app_id: str, app_secret: str, *, cache: bool = True
+    ) -> None:
         """
         Set the Qobuz app ID and secret.
+
+        Parameters
+        ----------
+        app_id : `str`
+            App ID. If not provided, the cached app credentials are used
+            or, if there are none, new ones are scraped from the Qobuz
+            Web Player.
+
+        app_secret : `str`
+            App secret. If not provided, the cached app credentials are
+            used or, if there are none, new ones are scraped from the
+            Qobuz Web Player.
+
+        cache : `bool`, keyword-only, default: :code:`True`
+            Determines whether cached app credentials can be used.
         """
+        self._app_cached = False
+        if (not app_id or not app_secret) and cache:
+            config = credentials.get_store().get(self._APP_NAME)
+            if config:
+                app_id = config["app_id"]
+                app_secret = config["app_secret"]
+                self._app_cached = True
+
         if not app_id or not app_secret:
             js = re.search(
                 "/resources/.*/bundle.js",
@@ -378,6 +464,24 @@ class PrivateAPI:
             else:
                 raise RuntimeError("No valid app secret could be found.")
             logger.setLevel(logging_level)
+
+            if self._save:
+                store = credentials.get_store()
+                app_credentials = {
+                    "app_id": self.session.headers["X-App-Id"],
+                    "app_secret": self._app_secret,
+                }
+                store.set(
+                    self._APP_NAME,
+                    app_credentials
+                    | {
+                        "timestamp": datetime.datetime.now().strftime(
+                            "%Y-%m-%dT%H:%M:%SZ"
+                        )
+                    },
+                )
+                if store.get(self._NAME):
+                    store.update(self._NAME, app_credentials)
         else:
             self._app_secret = app_secret
             self.session.headers["X-App-Id"] = app_id
@@ -412,6 +516,8 @@ class PrivateAPI:
                     if self._browser:
                         har_file = DIR_TEMP / "minim_qobuz_private.har"
 
+                        from playwright.sync_api import sync_playwright
+
                         with sync_playwright() as playwright:
                             browser = playwright.firefox.launch(headless=False)
                             context = browser.new_context(
@@ -452,20 +558,23 @@ class PrivateAPI:
                     auth_token = r["user_auth_token"]
 
             if self._save:
-                _config[self._NAME] = {
+                config = {
                     "flow": self._flow,
                     "auth_token": auth_token,
                     "app_id": self.session.headers["X-App-Id"],
                     "app_secret": self._app_secret,
                 }
-                with open(DIR_HOME / "minim.cfg", "w") as f:
-                    _config.write(f)
+                credentials.get_store().set(self._NAME, config)
 
         self.session.headers["X-User-Auth-Token"] = auth_token
+        self.session.identity = None
 
         if self._flow:
             me = self.get_profile()
             self._user_id = me["id"]
+            self.session.identity = (
+                f"{self.session.headers['X-App-Id']}:{self._user_id}"
+            )
             self._sub = (
                 me["subscription"] is not None
                 and datetime.datetime.now()
@@ -551,6 +660,83 @@ class PrivateAPI:
 
         self._set_app_credentials(app_id, app_secret)
 
+    def paginate(
+        self,
+        method: Union[str, Callable],
+        *args,
+        limit: int = 50,
+        max_workers: int = None,
+        **kwargs,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield all items from a paginated private Qobuz API
+        endpoint, requesting one page at a time.
+
+        .. note::
+
+           This method is provided for convenience and is not a private
+           Qobuz API endpoint.
+
+        Parameters
+        ----------
+        method : `str` or `Callable`
+            Client method (or its name) for a private Qobuz API endpoint
+            that accepts `limit` and `offset` and returns a page of items,
+            like :meth:`get_user_playlists` or :meth:`get_favorites`.
+            If the page is nested in the response, as with
+            :meth:`get_favorites`, it is located automatically.
+
+        *args
+            Positional arguments to pass to `method`.
+
+        limit : `int`, keyword-only, default: :code:`50`
+            Maximum number of items to request per page.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of pages to request concurrently once the
+            total number of items is known from the first page. The
+            items are still yielded in order, and every request still
+            passes through the client's rate limiter. If not specified,
+            pages are requested one at a time.
+
+        **kwargs
+            Keyword arguments to pass to `method`. If `offset` is
+            specified, items before it are skipped.
+
+        Yields
+        ------
+        item : `dict`
+            Qobuz content metadata for an item.
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        kwargs["offset"] = kwargs.get("offset") or 0
+
+        def get_page(offset: int) -> dict[str, Any]:
+            page = method(*args, limit=limit, **kwargs | {"offset": offset})
+            if "items" in page:
+                return page
+            return next(
+                v
+                for v in page.values()
+                if isinstance(v, dict) and "items" in v
+            )
+
+        while True:
+            page = get_page(kwargs["offset"])
+            yield from page["items"]
+            kwargs["offset"] += len(page["items"])
+            if not page["items"] or kwargs["offset"] >= page["total"]:
+                return
+            if max_workers and max_workers > 1:
+                for next_page in transport._imap(
+                    get_page,
+                    range(kwargs["offset"], page["total"], limit),
+                    max_workers,
+                ):
+                    yield from next_page["items"]
+                return
+
     ### ALBUMS ################################################################
 
     def get_album(
@@ -2325,6 +2511,44 @@ class PrivateAPI:
             params={"type": type, "limit": limit, "offset": offset},
         )
 
+    def iter_favorites(
+        self, type: str, *, max_workers: int = None
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield Qobuz catalog information for all of the current
+        user's favorite albums, artists, or tracks.
+
+        .. admonition:: User authentication
+           :class: warning
+
+           Requires user authentication via the password flow.
+
+        .. note::
+
+           This method is provided for convenience and is not a private
+           Qobuz API endpoint.
+
+        Parameters
+        ----------
+        type : `str`
+            Media type to return.
+
+            **Valid values**: :code:`"albums"`, :code:`"artists"`, and
+            :code:`"tracks"`.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of pages to request concurrently. If not
+            specified, pages are requested one at a time.
+
+        Yields
+        ------
+        item : `dict`
+            Qobuz catalog information for a favorite item.
+        """
+        yield from self.paginate(
+            self.get_favorites, type, limit=500, max_workers=max_workers
+        )
+
     def get_favorite_ids(self) -> dict[str, Any]:
         """
         Get Qobuz IDs of the items in the current user's favorites.
@@ -3199,6 +3423,38 @@ class PrivateAPI:
             params={"limit": limit, "offset": offset},
         )["playlists"]
 
+    def iter_user_playlists(
+        self, *, max_workers: int = None
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield Qobuz catalog information for all of the current
+        user's custom and favorite playlists.
+
+        .. admonition:: User authentication
+           :class: warning
+
+           Requires user authentication via the password flow.
+
+        .. note::
+
+           This method is provided for convenience and is not a private
+           Qobuz API endpoint.
+
+        Parameters
+        ----------
+        max_workers : `int`, keyword-only, optional
+            Maximum number of pages to request concurrently. If not
+            specified, pages are requested one at a time.
+
+        Yields
+        ------
+        playlist : `dict`
+            Qobuz catalog information for a playlist.
+        """
+        yield from self.paginate(
+            self.get_user_playlists, limit=500, max_workers=max_workers
+        )
+
     def create_playlist(
         self,
         name: str,
@@ -4840,7 +5096,9 @@ class PrivateAPI:
             f"{self.API_URL}/track/get", params={"track_id": track_id}
         )
 
-    def get_tracks(self, track_ids: list[Union[int, str]]) -> dict[str, Any]:
+    def get_tracks(
+        self, track_ids: list[Union[int, str]], *, max_workers: int = None
+    ) -> dict[str, Any]:
         """
         Get Qobuz catalog information for multiple tracks.
 
@@ -4851,6 +5109,16 @@ class PrivateAPI:
 
             **Example**: :code:`[24393138, 24393139]`.
 
+            Any number of IDs can be provided. The Qobuz API accepts at
+            most 50 IDs per request, so longer lists are sent in chunks
+            of 50 IDs and the responses are merged in input order into a
+            single response of the same form.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of requests to send concurrently when more
+            than 50 track IDs are provided. If not specified, requests
+            are sent one at a time.
+
         Returns
         -------
         tracks : `dict`
@@ -5018,17 +5286,23 @@ class PrivateAPI:
                     "total": <int>
                   }
         """
-        return self._get_json(
-            "post",
-            f"{self.API_URL}/track/getList",
-            params={
-                "tracks_id": [track_ids]
-                if isinstance(track_ids, int)
-                else track_ids.split(",")
-                if isinstance(track_ids, str)
-                else track_ids
-            },
+        documents = transport._batch(
+            lambda ids: self._request(
+                "post",
+                f"{self.API_URL}/track/getList",
+                params={"tracks_id": ids},
+            ).json(),
+            track_ids,
+            50,
+            max_workers,
         )
+        tracks = documents[0]
+        merged = tracks.get("tracks", tracks)
+        for document in documents[1:]:
+            document = document.get("tracks", document)
+            merged["items"].extend(document["items"])
+            merged["total"] += document["total"]
+        return tracks
 
     def get_track_performers(
         self,
@@ -5577,3 +5851,22 @@ class PrivateAPI:
         self._check_authentication("get_last_updates")
 
         return self._get_json(f"{self.API_URL}/user/lastUpdate")
+
+
+class AsyncPrivateAPI(transport.AsyncClient):
+    """
+    Asynchronous private Qobuz API client.
+
+    Coroutine counterpart of :class:`PrivateAPI`. See
+    :class:`minim.transport.AsyncClient` for the constructor
+    parameters and how calls are dispatched.
+
+    .. note::
+
+       The constructor may retrieve the app credentials from the Qobuz
+       web player and log in synchronously. To avoid blocking a running
+       event loop, use :code:`await AsyncPrivateAPI.create(...)`
+       instead.
+    """
+
+    _CLIENT = PrivateAPI
@@ -10,30 +10,33 @@ service.
 
 import base64
 import datetime
+import functools
 import hashlib
 from http.server import HTTPServer, BaseHTTPRequestHandler
+import inspect
 import json
 import logging
 from multiprocessing import Process
 import os
 import re
 import secrets
+import sys
+import threading
 import time
-from typing import Any, Union
+from typing import Any, Callable, Generator, Union
 import urllib
 import warnings
 import webbrowser
 
 import requests
 
-from . import FOUND_FLASK, FOUND_PLAYWRIGHT, DIR_HOME, DIR_TEMP, _config
+from . import (
+    DIR_TEMP,
+    credentials,
+    transport,
+)
 
-if FOUND_FLASK:
-    from flask import Flask, request
-if FOUND_PLAYWRIGHT:
-    from playwright.sync_api import sync_playwright
-
-__all__ = ["PrivateLyricsService", "WebAPI"]
+__all__ = ["AsyncWebAPI", "PrivateLyricsService", "WebAPI"]
 
 
 class _SpotifyRedirectHandler(BaseHTTPRequestHandler):
@@ -57,7 +60,7 @@ class _SpotifyRedirectHandler(BaseHTTPRequestHandler):
         )
 
 
-class PrivateLyricsService:
+class PrivateLyricsService(transport._ProcessLocal, transport._BatchExecutor):
     """
     Spotify Lyrics service client.
 
@@ -129,6 +132,10 @@ class PrivateLyricsService:
         associated properties are stored to the Minim configuration
         file.
 
+    rate_limiter, pool_size, keep_alive, timeout : keyword-only, optional
+        Options for the underlying HTTP session, such as a client-side
+        rate limiter. See :class:`minim.transport.Session`.
+
     Attributes
     ----------
     LYRICS_URL : `str`
@@ -137,11 +144,12 @@ class PrivateLyricsService:
     TOKEN_URL : `str`
         URL for the Spotify Web Player access token endpoint.
 
-    session : `requests.Session`
+    session : `minim.transport.Session`
         Session used to send requests to the Spotify Lyrics service.
     """
 
     _NAME = f"{__module__}.{__qualname__}"
+    _PROCESS_STATE = {"_token_lock": threading.Lock}
 
     LYRICS_URL = "https://spclient.wg.spotify.com/color-lyrics/v2"
     TOKEN_URL = "https://open.spotify.com/get_access_token"
@@ -153,17 +161,29 @@ class PrivateLyricsService:
         access_token: str = None,
         expiry: Union[datetime.datetime, str] = None,
         save: bool = True,
+        rate_limiter: transport.RateLimiter = None,
+        pool_size: int = 32,
+        keep_alive: bool = True,
+        timeout: Union[float, tuple[float, float]] = (3.05, 30.0),
     ) -> None:
         """
         Create a Spotify Lyrics service client.
         """
-        self.session = requests.Session()
+        self.session = transport.Session(
+            rate_limiter=rate_limiter,
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            timeout=timeout,
+        )
         self.session.headers["App-Platform"] = "WebPlayer"
+        self._token_lock = threading.Lock()
 
-        if access_token is None and _config.has_section(self._NAME):
-            sp_dc = _config.get(self._NAME, "sp_dc")
-            access_token = _config.get(self._NAME, "access_token")
-            expiry = _config.get(self._NAME, "expiry")
+        if access_token is None and (
+            config := credentials.get_store().get(self._NAME)
+        ):
+            sp_dc = config["sp_dc"]
+            access_token = config["access_token"]
+            expiry = config["expiry"]
 
         self.set_sp_dc(sp_dc, save=save)
         self.set_access_token(access_token=access_token, expiry=expiry)
@@ -215,14 +235,27 @@ class PrivateLyricsService:
             Response to the request.
         """
         if self._expiry is not None and datetime.datetime.now() > self._expiry:
-            self.set_access_token()
-
+            with self._token_lock:
+                if (
+                    self._expiry is not None
+                    and datetime.datetime.now() > self._expiry
+                ):
+                    self.session._emit("token_refresh", self._NAME)
+                    self.set_access_token()
+
+        authorization = self.session.headers.get("Authorization")
         r = self.session.request(method, url, **kwargs)
         if r.status_code != 200:
             emsg = f"{r.status_code} {r.reason}"
             if r.status_code == 401 and retry:
                 logging.warning(emsg)
-                self.set_access_token()
+                with self._token_lock:
+                    if (
+                        self.session.headers.get("Authorization")
+                        == authorization
+                    ):
+                        self.session._emit("token_refresh", self._NAME)
+                        self.set_access_token()
                 return self._request(method, url, False, **kwargs)
             else:
                 raise RuntimeError(emsg)
@@ -282,13 +315,12 @@ class PrivateLyricsService:
             )
 
             if self._save:
-                _config[self._NAME] = {
+                config = {
                     "sp_dc": self._sp_dc,
                     "access_token": access_token,
                     "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
                 }
-                with open(DIR_HOME / "minim.cfg", "w") as f:
-                    _config.write(f)
+                credentials.get_store().set(self._NAME, config)
 
         self.session.headers["Authorization"] = f"Bearer {access_token}"
         self._expiry = (
@@ -354,7 +386,7 @@ class PrivateLyricsService:
         )
 
 
-class WebAPI:
+class WebAPI(transport._LazyAuthentication, transport._BatchExecutor):
     """
     Spotify Web API client.
 
@@ -540,6 +572,21 @@ class WebAPI:
         associated properties are stored to the Minim configuration
         file.
 
+    refresh_margin : `float`, keyword-only, optional
+        Number of seconds before the access token expires at which it
+        is proactively refreshed in a background thread, so that
+        requests never wait on a token refresh. If not specified, the
+        access token is refreshed only when a request finds it expired.
+
+    lazy : `bool`, keyword-only, default: :code:`False`
+        Determines whether authentication, which may require network
+        requests, is deferred until the first request that needs it so
+        that creating the client is purely local.
+
+    rate_limiter, pool_size, keep_alive, timeout : keyword-only, optional
+        Options for the underlying HTTP session, such as a client-side
+        rate limiter. See :class:`minim.transport.Session`.
+
     Attributes
     ----------
     API_URL : `str`
@@ -554,12 +601,15 @@ class WebAPI:
     WEB_PLAYER_TOKEN_URL : `str`
         URL for Spotify Web Player access token requests.
 
-    session : `requests.Session`
+    session : `minim.transport.Session`
         Session used to send requests to the Spotify Web API.
     """
 
     _FLOWS = {"authorization_code", "pkce", "client_credentials", "web_player"}
     _NAME = f"{__module__}.{__qualname__}"
+    _PROCESS_STATE = transport._LazyAuthentication._PROCESS_STATE | {
+        "_token_lock": threading.Lock
+    }
 
     API_URL = "https://api.spotify.com/v1"
     AUTH_URL = "https://accounts.spotify.com/authorize"
@@ -697,32 +747,38 @@ class WebAPI:
         expiry: Union[datetime.datetime, str] = None,
         overwrite: bool = False,
         save: bool = True,
+        refresh_margin: float = None,
+        lazy: bool = False,
+        rate_limiter: transport.RateLimiter = None,
+        pool_size: int = 32,
+        keep_alive: bool = True,
+        timeout: Union[float, tuple[float, float]] = (3.05, 30.0),
     ) -> None:
         """
         Create a Spotify Web API client.
         """
-        self.session = requests.Session()
+        self.session = transport.Session(
+            rate_limiter=rate_limiter,
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            timeout=timeout,
+        )
+        self._token_lock = threading.Lock()
 
         if (
             access_token is None
-            and _config.has_section(self._NAME)
             and not overwrite
+            and (config := credentials.get_store().get(self._NAME))
         ):
-            flow = _config.get(self._NAME, "flow")
-            access_token = _config.get(self._NAME, "access_token")
-            refresh_token = _config.get(
-                self._NAME, "refresh_token", fallback=None
-            )
-            expiry = _config.get(self._NAME, "expiry", fallback=None)
-            client_id = _config.get(self._NAME, "client_id")
-            client_secret = _config.get(
-                self._NAME, "client_secret", fallback=None
-            )
-            redirect_uri = _config.get(
-                self._NAME, "redirect_uri", fallback=None
-            )
-            scopes = _config.get(self._NAME, "scopes")
-            sp_dc = _config.get(self._NAME, "sp_dc", fallback=None)
+            flow = config["flow"]
+            access_token = config["access_token"]
+            refresh_token = config.get("refresh_token")
+            expiry = config.get("expiry")
+            client_id = config["client_id"]
+            client_secret = config.get("client_secret")
+            redirect_uri = config.get("redirect_uri")
+            scopes = config["scopes"]
+            sp_dc = config.get("sp_dc")
 
         self.set_flow(
             flow,
@@ -736,8 +792,19 @@ class WebAPI:
             sp_dc=sp_dc,
             save=save,
         )
-        self.set_access_token(
-            access_token, refresh_token=refresh_token, expiry=expiry
+        self._defer_authentication(
+            functools.partial(
+                self.set_access_token,
+                access_token,
+                refresh_token=refresh_token,
+                expiry=expiry,
+            ),
+            lazy,
+        )
+        self._token_refresher = (
+            None
+            if refresh_margin is None
+            else transport.TokenRefresher(self, margin=refresh_margin)
         )
 
     def _check_scope(self, endpoint: str, scope: str) -> None:
@@ -791,6 +858,8 @@ class WebAPI:
         if self._web_framework == "playwright":
             har_file = DIR_TEMP / "minim_spotify.har"
 
+            from playwright.sync_api import sync_playwright
+
             with sync_playwright() as playwright:
                 browser = playwright.firefox.launch(headless=False)
                 context = browser.new_context(record_har_path=har_file)
@@ -831,6 +900,8 @@ class WebAPI:
                 queries = httpd.response
 
             elif self._web_framework == "flask":
+                from flask import Flask, request
+
                 app = Flask(__name__)
                 json_file = DIR_TEMP / "minim_spotify.json"
 
@@ -894,6 +965,7 @@ class WebAPI:
         """
         Refresh the expired excess token.
         """
+        self.session._emit("token_refresh", self._NAME)
         if (
             self._flow == "web_player"
             or not self._refresh_token
@@ -924,16 +996,15 @@ class WebAPI:
             self._scopes = r["scope"]
 
             if self._save:
-                _config[self._NAME].update(
+                credentials.get_store().update(
+                    self._NAME,
                     {
                         "access_token": r["access_token"],
                         "refresh_token": self._refresh_token,
                         "expiry": self._expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
                         "scopes": self._scopes,
-                    }
+                    },
                 )
-                with open(DIR_HOME / "minim.cfg", "w") as f:
-                    _config.write(f)
 
     def _request(
         self, method: str, url: str, retry: bool = True, **kwargs
@@ -961,9 +1032,17 @@ class WebAPI:
         resp : `requests.Response`
             Response to the request.
         """
-        if self._expiry is not None and datetime.datetime.now() > self._expiry:
-            self._refresh_access_token()
+        self._authenticate()
 
+        if self._expiry is not None and datetime.datetime.now() > self._expiry:
+            with self._token_lock:
+                if (
+                    self._expiry is not None
+                    and datetime.datetime.now() > self._expiry
+                ):
+                    self._refresh_access_token()
+
+        authorization = self.session.headers.get("Authorization")
         r = self.session.request(method, url, **kwargs)
         if r.status_code not in range(200, 299):
             error = r.json()["error"]
@@ -972,7 +1051,12 @@ class WebAPI:
                 emsg += f" {error['message']}"
             if r.status_code == 401 and retry:
                 logging.warning(emsg)
-                self._refresh_access_token()
+                with self._token_lock:
+                    if (
+                        self.session.headers.get("Authorization")
+                        == authorization
+                    ):
+                        self._refresh_access_token()
                 return self._request(method, url, False, **kwargs)
             else:
                 raise RuntimeError(emsg)
@@ -1072,7 +1156,7 @@ class WebAPI:
                 )
 
             if self._save:
-                _config[self._NAME] = {
+                config = {
                     "flow": self._flow,
                     "client_id": self._client_id,
                     "access_token": access_token,
@@ -1080,16 +1164,14 @@ class WebAPI:
                     "scopes": self._scopes,
                 }
                 if refresh_token:
-                    _config[self._NAME]["refresh_token"] = refresh_token
+                    config["refresh_token"] = refresh_token
                 for attr in ("client_secret", "redirect_uri", "sp_dc"):
                     if hasattr(self, f"_{attr}"):
-                        _config[self._NAME][attr] = (
-                            getattr(self, f"_{attr}") or ""
-                        )
-                with open(DIR_HOME / "minim.cfg", "w") as f:
-                    _config.write(f)
+                        config[attr] = getattr(self, f"_{attr}") or ""
+                credentials.get_store().set(self._NAME, config)
 
         self.session.headers["Authorization"] = f"Bearer {access_token}"
+        self.session.identity = None
         self._refresh_token = refresh_token
         self._expiry = (
             datetime.datetime.strptime(expiry, "%Y-%m-%dT%H:%M:%SZ")
@@ -1097,10 +1179,13 @@ class WebAPI:
             else expiry
         )
 
+        user_id = ""
         if self._flow in {"authorization_code", "pkce"} or (
             self._flow == "web_player" and self._sp_dc
         ):
-            self._user_id = self.get_profile()["id"]
+            user_id = self._user_id = self.get_profile()["id"]
+        if self._client_id:
+            self.session.identity = f"{self._client_id}:{user_id}"
 
     def set_flow(
         self,
@@ -1230,7 +1315,10 @@ class WebAPI:
                 self._web_framework = (
                     web_framework
                     if web_framework in {None, "http.server"}
-                    or globals()[f"FOUND_{web_framework.upper()}"]
+                    or getattr(
+                        sys.modules[__package__],
+                        f"FOUND_{web_framework.upper()}",
+                    )
                     else None
                 )
                 if self._web_framework is None and web_framework:
@@ -1245,6 +1333,82 @@ class WebAPI:
             elif flow == "client_credentials":
                 self._scopes = ""
 
+    def paginate(
+        self,
+        method: Union[str, Callable],
+        *args,
+        limit: int = 50,
+        max_workers: int = None,
+        **kwargs,
+    ) -> Generator[Any, None, None]:
+        """
+        Lazily yield all items from a paginated Spotify Web API
+        endpoint, requesting one page at a time.
+
+        .. note::
+
+           This method is provided for convenience and is not a Spotify
+           Web API endpoint.
+
+        Parameters
+        ----------
+        method : `str` or `Callable`
+            Client method (or its name) for a Spotify Web API endpoint
+            that returns a page of items, like :meth:`get_saved_tracks`
+            or :meth:`get_followed_artists`. Both offset- and
+            cursor-based pagination are supported.
+
+        *args
+            Positional arguments to pass to `method`.
+
+        limit : `int`, keyword-only, default: :code:`50`
+            Maximum number of items to request per page.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of pages to request concurrently once the
+            total number of items is known from the first page. The
+            items are still yielded in order, and every request still
+            passes through the client's rate limiter. If not specified,
+            pages are requested one at a time.
+
+            Cursor-based endpoints are always paginated one page at a
+            time.
+
+        **kwargs
+            Keyword arguments to pass to `method`. If `offset` is
+            specified, items before it are skipped.
+
+        Yields
+        ------
+        item : `dict`
+            Spotify content metadata for an item.
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        cursor = "offset" not in inspect.signature(method).parameters
+        if not cursor:
+            kwargs["offset"] = kwargs.get("offset") or 0
+
+        while True:
+            page = method(*args, limit=limit, **kwargs)
+            yield from page["items"]
+            if not page.get("next") or not page["items"]:
+                return
+            if cursor:
+                kwargs["after"] = page["cursors"]["after"]
+                continue
+            kwargs["offset"] += len(page["items"])
+            if max_workers and max_workers > 1 and "total" in page:
+                for items in transport._imap(
+                    lambda offset: method(
+                        *args, limit=limit, **kwargs | {"offset": offset}
+                    )["items"],
+                    range(kwargs["offset"], page["total"], limit),
+                    max_workers,
+                ):
+                    yield from items
+                return
+
     ### ALBUMS ################################################################
 
     def get_album(self, id: str, *, market: str = None) -> dict:
@@ -1406,7 +1570,11 @@ class WebAPI:
         )
 
     def get_albums(
-        self, ids: Union[str, list[str]], *, market: str = None
+        self,
+        ids: Union[str, list[str]],
+        *,
+        market: str = None,
+        max_workers: int = None,
     ) -> dict[str, Any]:
         """
         `Albums > Get Several Albums <https://developer.spotify.com/
@@ -1419,7 +1587,9 @@ class WebAPI:
         ids : `str` or `list`
             A (comma-separated) list of the Spotify IDs for the albums.
 
-            **Maximum**: 20 IDs.
+            Any number of IDs can be provided; they are sent in
+            chunks of up to 20 IDs and the results are merged in
+            input order.
 
             **Example**: :code:`"382ObEPsp2rxGrnsizN5TX,
             1A2GTWGtFfWp7KSQTwWOyo, 2noRn2Aes5aoNVsU6iWThc"`.
@@ -1438,6 +1608,11 @@ class WebAPI:
 
             **Example**: :code:`"ES"`.
 
+        max_workers : `int`, keyword-only, optional
+            Maximum number of requests to send concurrently when more
+            IDs are provided than can be sent in one request. If not
+            specified, requests are sent one at a time.
+
         Returns
         -------
         albums : `list`
@@ -1568,13 +1743,19 @@ class WebAPI:
                     }
                   ]
         """
-        return self._get_json(
-            f"{self.API_URL}/albums",
-            params={
-                "ids": ids if isinstance(ids, str) else ",".join(ids),
-                "market": market,
-            },
-        )["albums"]
+        return [
+            album
+            for albums in transport._batch(
+                lambda ids: self._get_json(
+                    f"{self.API_URL}/albums",
+                    params={"ids": ",".join(ids), "market": market},
+                )["albums"],
+                ids,
+                20,
+                max_workers,
+            )
+            for album in albums
+        ]
 
     def get_album_tracks(
         self,
@@ -6132,6 +6313,59 @@ class WebAPI:
             },
         )
 
+    def iter_playlist_items(
+        self,
+        playlist_id: str,
+        *,
+        additional_types: Union[str, list[str]] = None,
+        fields: str = None,
+        market: str = None,
+        max_workers: int = None,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield all items of a playlist owned by a Spotify user.
+
+        .. note::
+
+           This method is provided for convenience and is not a Spotify
+           Web API endpoint. See :meth:`get_playlist_items` for more
+           information about the parameters.
+
+        Parameters
+        ----------
+        playlist_id : `str`
+            The Spotify ID of the playlist.
+
+        additional_types : `str` or `list`, keyword-only, optional
+            A (comma-separated) list of item types besides the default
+            track type.
+
+        fields : `str`, keyword-only, optional
+            Filters for the query. If `fields` is specified, it must
+            include :code:`items` and :code:`next` for pagination to
+            work.
+
+        market : `str`, keyword-only, optional
+            An ISO 3166-1 alpha-2 country code.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of pages to request concurrently. If not
+            specified, pages are requested one at a time.
+
+        Yields
+        ------
+        item : `dict`
+            Spotify content metadata for a playlist item.
+        """
+        yield from self.paginate(
+            self.get_playlist_items,
+            playlist_id,
+            additional_types=additional_types,
+            fields=fields,
+            market=market,
+            max_workers=max_workers,
+        )
+
     def add_playlist_items(
         self,
         playlist_id: str,
@@ -6160,16 +6394,9 @@ class WebAPI:
 
         uris : `str` or `list`, keyword-only, optional
             A (comma-separated) list of Spotify URIs to add; can be
-            track or episode URIs. A maximum of 100 items can be added
-            in one request.
-
-            .. note::
-
-               It is likely that passing a large number of item URIs as
-               a query parameter will exceed the maximum length of the
-               request URI. When adding a large number of items, it is
-               recommended to pass them in the request body (as a
-               `list`).
+            track or episode URIs. Any number of items can be
+            provided; they are added in order in chunks of up to 100
+            items, the maximum that can be added in one request.
 
             **Example**: :code:`"spotify:track:4iV5W9uYEdYUVa79Axb7Rh,
             spotify:track:1301WleyT98MSxVHPZCA6M,
@@ -6203,21 +6430,21 @@ class WebAPI:
             ),
         )
 
-        if isinstance(uris, str):
-            url = f"{self.API_URL}/playlists/{playlist_id}/items?{uris=}"
+        uris = transport._split_ids(uris)
+        if not uris:
+            raise ValueError("No Spotify URIs provided.")
+        # Chunks are sent sequentially so that the items keep their
+        # relative order in the playlist.
+        for i in range(0, len(uris), 100):
+            json = {"uris": uris[i : i + 100]}
             if position is not None:
-                url += f"{position=}"
-            return self._request("post", url).json()["snapshot_id"]
-
-        elif isinstance(uris, list):
-            json = {"uris": uris}
-            if position is not None:
-                json["position"] = position
-            self._request(
+                json["position"] = position + i
+            snapshot_id = self._request(
                 "post",
                 f"{self.API_URL}/playlists/{playlist_id}/items",
                 json=json,
             ).json()["snapshot_id"]
+        return snapshot_id
 
     def update_playlist_items(
         self,
@@ -8423,6 +8650,7 @@ class WebAPI:
         ids: Union[int, str, list[Union[int, str]]],
         *,
         market: str = None,
+        max_workers: int = None,
     ) -> list[dict[str, Any]]:
         """
         `Tracks > Get Several Tracks <https://developer.spotify.com/
@@ -8435,7 +8663,9 @@ class WebAPI:
         ids : `int`, `str`, or `list`
             A (comma-separated) list of the Spotify IDs for the tracks.
 
-            **Maximum**: 50 IDs.
+            Any number of IDs can be provided; they are sent in
+            chunks of up to 50 IDs and the results are merged in
+            input order.
 
             **Example**: :code:`"7ouMYWpwJ422jRcDASZB7P,
             4VqPOruhp5EdPBeR92t6lQ, 2takcwOaAZWiXQijPHIx7B"`.
@@ -8454,6 +8684,11 @@ class WebAPI:
 
             **Example**: :code:`"ES"`.
 
+        max_workers : `int`, keyword-only, optional
+            Maximum number of requests to send concurrently when more
+            IDs are provided than can be sent in one request. If not
+            specified, requests are sent one at a time.
+
         Returns
         -------
         tracks : `dict` or `list`
@@ -8574,13 +8809,19 @@ class WebAPI:
                     }
                   ]
         """
-        return self._get_json(
-            f"{self.API_URL}/tracks",
-            params={
-                "ids": ids if isinstance(ids, str) else ",".join(ids),
-                "market": market,
-            },
-        )["tracks"]
+        return [
+            track
+            for tracks in transport._batch(
+                lambda ids: self._get_json(
+                    f"{self.API_URL}/tracks",
+                    params={"ids": ",".join(ids), "market": market},
+                )["tracks"],
+                ids,
+                50,
+                max_workers,
+            )
+            for track in tracks
+        ]
 
     def get_saved_tracks(
         self, *, limit: int = None, market: str = None, offset: int = None
@@ -8765,7 +9006,45 @@ class WebAPI:
             params={"limit": limit, "market": market, "offset": offset},
         )
 
-    def save_tracks(self, ids: Union[str, list[str]]) -> None:
+    def iter_saved_tracks(
+        self, *, market: str = None, max_workers: int = None
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield all songs saved in the current Spotify user's 'Your
+        Music' library.
+
+        .. admonition:: Authorization scope
+           :class: warning
+
+           Requires the :code:`user-library-read` scope.
+
+        .. note::
+
+           This method is provided for convenience and is not a Spotify
+           Web API endpoint.
+
+        Parameters
+        ----------
+        market : `str`, keyword-only, optional
+            An ISO 3166-1 alpha-2 country code.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of pages to request concurrently. If not
+            specified, pages are requested one at a time.
+
+        Yields
+        ------
+        track : `dict`
+            Spotify catalog information for a saved track and the time
+            it was saved.
+        """
+        yield from self.paginate(
+            self.get_saved_tracks, market=market, max_workers=max_workers
+        )
+
+    def save_tracks(
+        self, ids: Union[str, list[str]], *, max_workers: int = None
+    ) -> None:
         """
         `Tracks > Save Track for Current User
         <https://developer.spotify.com/documentation/web-api/reference/
@@ -8782,21 +9061,27 @@ class WebAPI:
         ids : `str` or `list`
             A (comma-separated) list of the Spotify IDs for the tracks.
 
-            **Maximum**: 50 IDs.
+            Any number of IDs can be provided; they are sent in
+            chunks of up to 50 IDs.
 
             **Example**: :code:`"7ouMYWpwJ422jRcDASZB7P,
             4VqPOruhp5EdPBeR92t6lQ, 2takcwOaAZWiXQijPHIx7B"`.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of requests to send concurrently when more
+            IDs are provided than can be sent in one request. If not
+            specified, requests are sent one at a time.
         """
         self._check_scope("save_tracks", "user-library-modify")
 
-        if isinstance(ids, str):
-            self._request(
-                "put", f"{self.API_URL}/me/tracks", params={"ids": ids}
-            )
-        elif isinstance(ids, list):
-            self._request(
+        transport._batch(
+            lambda ids: self._request(
                 "put", f"{self.API_URL}/me/tracks", json={"ids": ids}
-            )
+            ),
+            ids,
+            50,
+            max_workers,
+        )
 
     def remove_saved_tracks(self, ids: Union[str, list[str]]) -> None:
         """
@@ -8831,7 +9116,9 @@ class WebAPI:
                 "delete", f"{self.API_URL}/me/tracks", json={"ids": ids}
             )
 
-    def check_saved_tracks(self, ids: Union[str, list[str]]) -> list[bool]:
+    def check_saved_tracks(
+        self, ids: Union[str, list[str]], *, max_workers: int = None
+    ) -> list[bool]:
         """
         `Tracks > Check User's Saved Tracks
         <https://developer.spotify.com/documentation/web-api/reference/
@@ -8849,11 +9136,18 @@ class WebAPI:
         ids : `str` or `list`
             A (comma-separated) list of the Spotify IDs for the tracks.
 
-            **Maximum**: 50 IDs.
+            Any number of IDs can be provided; they are sent in
+            chunks of up to 50 IDs and the results are merged in
+            input order.
 
             **Example**: :code:`"7ouMYWpwJ422jRcDASZB7P,
             4VqPOruhp5EdPBeR92t6lQ, 2takcwOaAZWiXQijPHIx7B"`.
 
+        max_workers : `int`, keyword-only, optional
+            Maximum number of requests to send concurrently when more
+            IDs are provided than can be sent in one request. If not
+            specified, requests are sent one at a time.
+
         Returns
         -------
         contains : `list`
@@ -8864,10 +9158,19 @@ class WebAPI:
         """
         self._check_scope("check_saved_tracks", "user-library-read")
 
-        return self._get_json(
-            f"{self.API_URL}/me/tracks/contains",
-            params={"ids": ids if isinstance(ids, str) else ",".join(ids)},
-        )
+        return [
+            saved
+            for contains in transport._batch(
+                lambda ids: self._get_json(
+                    f"{self.API_URL}/me/tracks/contains",
+                    params={"ids": ",".join(ids)},
+                ),
+                ids,
+                50,
+                max_workers,
+            )
+            for saved in contains
+        ]
 
     def get_track_audio_features(self, id: str) -> dict[str, Any]:
         """
@@ -8917,7 +9220,7 @@ class WebAPI:
         return self._get_json(f"{self.API_URL}/audio-features/{id}")
 
     def get_tracks_audio_features(
-        self, ids: Union[str, list[str]]
+        self, ids: Union[str, list[str]], *, max_workers: int = None
     ) -> list[dict[str, Any]]:
         """
         `Tracks > Get Tracks' Audio Features
@@ -8930,11 +9233,18 @@ class WebAPI:
         ids : `str` or `list`
             A (comma-separated) list of the Spotify IDs for the tracks.
 
-            **Maximum**: 100 IDs.
+            Any number of IDs can be provided; they are sent in
+            chunks of up to 100 IDs and the results are merged in
+            input order.
 
             **Example**: :code:`"7ouMYWpwJ422jRcDASZB7P,
             4VqPOruhp5EdPBeR92t6lQ, 2takcwOaAZWiXQijPHIx7B"`.
 
+        max_workers : `int`, keyword-only, optional
+            Maximum number of requests to send concurrently when more
+            IDs are provided than can be sent in one request. If not
+            specified, requests are sent one at a time.
+
         Returns
         -------
         audio_features : `dict` or `list`
@@ -8968,10 +9278,19 @@ class WebAPI:
                     }
                   ]
         """
-        return self._get_json(
-            f"{self.API_URL}/audio-features",
-            params={"ids": ids if isinstance(ids, str) else ",".join(ids)},
-        )["audio_features"]
+        return [
+            features
+            for audio_features in transport._batch(
+                lambda ids: self._get_json(
+                    f"{self.API_URL}/audio-features",
+                    params={"ids": ",".join(ids)},
+                )["audio_features"],
+                ids,
+                100,
+                max_workers,
+            )
+            for features in audio_features
+        ]
 
     def get_track_audio_analysis(self, id: str) -> dict[str, Any]:
         """
@@ -9689,6 +10008,27 @@ class WebAPI:
             params={"type": "artist", "after": after, "limit": limit},
         )["artists"]
 
+    def iter_followed_artists(self) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield all artists followed by the current user.
+
+        .. admonition:: Authorization scope
+           :class: warning
+
+           Requires the :code:`user-follow-read` scope.
+
+        .. note::
+
+           This method is provided for convenience and is not a Spotify
+           Web API endpoint.
+
+        Yields
+        ------
+        artist : `dict`
+            Spotify catalog information for a followed artist.
+        """
+        yield from self.paginate(self.get_followed_artists)
+
     def follow_people(self, ids: Union[str, list[str]], type: str) -> None:
         """
         `Users > Follow Artists or Users <https://developer.spotify.com/
@@ -9860,3 +10200,22 @@ class WebAPI:
             f"{self.API_URL}/playlists/{playlist_id}/followers/contains",
             params={"ids": ids if isinstance(ids, str) else ",".join(ids)},
         )
+
+
+class AsyncWebAPI(transport.AsyncClient):
+    """
+    Asynchronous Spotify Web API client.
+
+    Coroutine counterpart of :class:`WebAPI`. See
+    :class:`minim.transport.AsyncClient` for the constructor
+    parameters and how calls are dispatched.
+
+    .. note::
+
+       The constructor obtains an access token synchronously, which for
+       the authorization code and PKCE flows may involve a web browser
+       and a local redirect server. To avoid blocking a running event
+       loop, use :code:`await AsyncWebAPI.create(...)` instead.
+    """
+
+    _CLIENT = WebAPI
@@ -10,6 +10,7 @@ TIDAL API.
 
 import base64
 import datetime
+import functools
 import hashlib
 from http.server import HTTPServer, BaseHTTPRequestHandler
 import json
@@ -19,24 +20,25 @@ import os
 import pathlib
 import re
 import secrets
+import sys
+import threading
 import time
-from typing import Any, Union
+from typing import Any, Callable, Generator, Union
 import urllib
 import warnings
 import webbrowser
 from xml.dom import minidom
 
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 import requests
 
-from . import FOUND_FLASK, FOUND_PLAYWRIGHT, DIR_HOME, DIR_TEMP, _config
+from . import (
+    FOUND_PLAYWRIGHT,
+    DIR_TEMP,
+    credentials,
+    transport,
+)
 
-if FOUND_FLASK:
-    from flask import Flask, request
-if FOUND_PLAYWRIGHT:
-    from playwright.sync_api import sync_playwright
-
-__all__ = ["API", "PrivateAPI"]
+__all__ = ["API", "AsyncAPI", "AsyncPrivateAPI", "PrivateAPI"]
 
 
 class _TIDALRedirectHandler(BaseHTTPRequestHandler):
@@ -60,7 +62,7 @@ class _TIDALRedirectHandler(BaseHTTPRequestHandler):
         )
 
 
-class API:
+class API(transport._LazyAuthentication, transport._BatchExecutor):
     """
     TIDAL API client.
 
@@ -199,9 +201,24 @@ class API:
         associated properties are stored to the Minim configuration
         file.
 
+    refresh_margin : `float`, keyword-only, optional
+        Number of seconds before the access token expires at which it
+        is proactively refreshed in a background thread, so that
+        requests never wait on a token refresh. If not specified, the
+        access token is refreshed only when a request finds it expired.
+
+    lazy : `bool`, keyword-only, default: :code:`False`
+        Determines whether authentication, which may require network
+        requests, is deferred until the first request that needs it so
+        that creating the client is purely local.
+
+    rate_limiter, pool_size, keep_alive, timeout : keyword-only, optional
+        Options for the underlying HTTP session, such as a client-side
+        rate limiter. See :class:`minim.transport.Session`.
+
     Attributes
     ----------
-    session : `requests.Session`
+    session : `minim.transport.Session`
         Session used to send requests to the TIDAL API.
 
     API_URL : `str`
@@ -216,6 +233,9 @@ class API:
 
     _FLOWS = {"client_credentials", "pkce"}
     _NAME = f"{__module__}.{__qualname__}"
+    _PROCESS_STATE = transport._LazyAuthentication._PROCESS_STATE | {
+        "_token_lock": threading.Lock
+    }
     _VERSION = "0.1.99"
     API_URL = "https://openapi.tidal.com/v2"
     AUTH_URL = "https://login.tidal.com/authorize"
@@ -313,34 +333,40 @@ class API:
         expiry: Union[datetime.datetime, str] = None,
         overwrite: bool = False,
         save: bool = True,
+        refresh_margin: float = None,
+        lazy: bool = False,
+        rate_limiter: transport.RateLimiter = None,
+        pool_size: int = 32,
+        keep_alive: bool = True,
+        timeout: Union[float, tuple[float, float]] = (3.05, 30.0),
     ) -> None:
         """
         Create a TIDAL API client.
         """
-        self.session = requests.Session()
+        self.session = transport.Session(
+            rate_limiter=rate_limiter,
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            timeout=timeout,
+        )
+        self._token_lock = threading.Lock()
         self.session.headers["accept"] = self.session.headers[
             "Content-Type"
         ] = "application/vnd.api+json"
 
         if (
             access_token is None
-            and _config.has_section(self._NAME)
             and not overwrite
+            and (config := credentials.get_store().get(self._NAME))
         ):
-            flow = _config.get(self._NAME, "flow")
-            access_token = _config.get(self._NAME, "access_token")
-            refresh_token = _config.get(
-                self._NAME, "refresh_token", fallback=None
-            )
-            expiry = _config.get(self._NAME, "expiry")
-            client_id = _config.get(self._NAME, "client_id")
-            client_secret = _config.get(
-                self._NAME, "client_secret", fallback=None
-            )
-            redirect_uri = _config.get(
-                self._NAME, "redirect_uri", fallback=None
-            )
-            scopes = _config.get(self._NAME, "scopes")
+            flow = config["flow"]
+            access_token = config["access_token"]
+            refresh_token = config.get("refresh_token")
+            expiry = config["expiry"]
+            client_id = config["client_id"]
+            client_secret = config.get("client_secret")
+            redirect_uri = config.get("redirect_uri")
+            scopes = config["scopes"]
 
         self.set_flow(
             flow,
@@ -353,8 +379,19 @@ class API:
             scopes=scopes,
             save=save,
         )
-        self.set_access_token(
-            access_token, refresh_token=refresh_token, expiry=expiry
+        self._defer_authentication(
+            functools.partial(
+                self.set_access_token,
+                access_token,
+                refresh_token=refresh_token,
+                expiry=expiry,
+            ),
+            lazy,
+        )
+        self._token_refresher = (
+            None
+            if refresh_margin is None
+            else transport.TokenRefresher(self, margin=refresh_margin)
         )
 
     def _check_authentication(self, endpoint: str) -> None:
@@ -421,6 +458,8 @@ class API:
         if self._web_framework == "playwright":
             har_file = DIR_TEMP / "minim_tidal.har"
 
+            from playwright.sync_api import sync_playwright
+
             with sync_playwright() as playwright:
                 browser = playwright.firefox.launch(headless=False)
                 context = browser.new_context(record_har_path=har_file)
@@ -461,6 +500,8 @@ class API:
                 queries = httpd.response
 
             elif self._web_framework == "flask":
+                from flask import Flask, request
+
                 app = Flask(__name__)
                 json_file = DIR_TEMP / "minim_tidal.json"
 
@@ -520,10 +561,39 @@ class API:
         """
         return self._request("get", url, **kwargs).json()
 
+    @staticmethod
+    def _merge_documents(documents: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Merge JSON:API documents returned for chunks of a single
+        request.
+
+        Parameters
+        ----------
+        documents : `list`
+            JSON:API documents.
+
+        Returns
+        -------
+        document : `dict`
+            JSON:API document containing the primary and related
+            resources of all documents, without duplicates, in their
+            original order. Pagination links are omitted since they
+            only apply to the individual documents.
+        """
+        document = {"data": []}
+        seen = set()
+        for key in ("data", "included"):
+            for resource in (r for d in documents for r in d.get(key, [])):
+                if (key, resource["type"], resource["id"]) not in seen:
+                    seen.add((key, resource["type"], resource["id"]))
+                    document.setdefault(key, []).append(resource)
+        return document
+
     def _refresh_access_token(self) -> None:
         """
         Refresh the expired excess token.
         """
+        self.session._emit("token_refresh", self._NAME)
         if self._flow == "client_credentials":
             self.set_access_token()
         else:
@@ -548,16 +618,15 @@ class API:
             self._scopes = r["scope"]
 
             if self._save:
-                _config[self._NAME].update(
+                credentials.get_store().update(
+                    self._NAME,
                     {
                         "access_token": r["access_token"],
                         "refresh_token": self._refresh_token,
                         "expiry": self._expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
                         "scopes": self._scopes,
-                    }
+                    },
                 )
-                with open(DIR_HOME / "minim.cfg", "w") as f:
-                    _config.write(f)
 
     def _request(self, method: str, url: str, **kwargs) -> requests.Response:
         """
@@ -579,8 +648,15 @@ class API:
         resp : `requests.Response`
             Response to the request.
         """
+        self._authenticate()
+
         if self._expiry is not None and datetime.datetime.now() > self._expiry:
-            self._refresh_access_token()
+            with self._token_lock:
+                if (
+                    self._expiry is not None
+                    and datetime.datetime.now() > self._expiry
+                ):
+                    self._refresh_access_token()
 
         r = self.session.request(method, url, **kwargs)
         if r.status_code not in range(200, 299):
@@ -671,7 +747,7 @@ class API:
             )
 
             if self._save:
-                _config[self._NAME] = {
+                config = {
                     "flow": self._flow,
                     "client_id": self._client_id,
                     "access_token": access_token,
@@ -679,16 +755,14 @@ class API:
                     "scopes": self._scopes,
                 }
                 if refresh_token:
-                    _config[self._NAME]["refresh_token"] = refresh_token
+                    config["refresh_token"] = refresh_token
                 for attr in ("client_secret", "redirect_uri"):
                     if hasattr(self, f"_{attr}"):
-                        _config[self._NAME][attr] = (
-                            getattr(self, f"_{attr}") or ""
-                        )
-                with open(DIR_HOME / "minim.cfg", "w") as f:
-                    _config.write(f)
+                        config[attr] = getattr(self, f"_{attr}") or ""
+                credentials.get_store().set(self._NAME, config)
 
         self.session.headers["Authorization"] = f"Bearer {access_token}"
+        self.session.identity = None
         self._refresh_token = refresh_token
         self._expiry = (
             datetime.datetime.strptime(expiry, "%Y-%m-%dT%H:%M:%SZ")
@@ -696,8 +770,11 @@ class API:
             else expiry
         )
 
+        user_id = ""
         if self._flow == "pkce":
-            self._user_id = self.get_me()["data"]["id"]
+            user_id = self._user_id = self.get_me()["data"]["id"]
+        if self._client_id:
+            self.session.identity = f"{self._client_id}:{user_id}"
 
     def set_flow(
         self,
@@ -812,7 +889,10 @@ class API:
             self._web_framework = (
                 web_framework
                 if web_framework in {None, "http.server"}
-                or globals()[f"FOUND_{web_framework.upper()}"]
+                or getattr(
+                    sys.modules[__package__],
+                    f"FOUND_{web_framework.upper()}",
+                )
                 else None
             )
             if self._web_framework is None and web_framework:
@@ -827,6 +907,53 @@ class API:
         elif flow == "client_credentials":
             self._scopes = ""
 
+    def paginate(
+        self, method: Union[str, Callable], *args, **kwargs
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield all resources from a paginated TIDAL API endpoint,
+        requesting one page at a time.
+
+        .. note::
+
+           This method is provided for convenience and is not a TIDAL API
+           endpoint.
+
+        Parameters
+        ----------
+        method : `str` or `Callable`
+            Client method (or its name) for a TIDAL API endpoint that
+            accepts a `cursor` and returns a page of resources, like
+            :meth:`get_albums` or :meth:`get_album_relationship`.
+
+        *args
+            Positional arguments to pass to `method`.
+
+        **kwargs
+            Keyword arguments to pass to `method`.
+
+        Yields
+        ------
+        resource : `dict`
+            TIDAL resource object from the :code:`data` member of each
+            page. Related resources in :code:`included` are not yielded.
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+
+        while True:
+            page = method(*args, **kwargs)
+            yield from page["data"]
+            links = page.get("links", {})
+            cursor = links.get("meta", {}).get("nextCursor")
+            if cursor is None and links.get("next"):
+                cursor = urllib.parse.parse_qs(
+                    urllib.parse.urlparse(links["next"]).query
+                ).get("page[cursor]", [None])[0]
+            if not cursor or not page["data"]:
+                return
+            kwargs["cursor"] = cursor
+
     ### ALBUMS ################################################################
 
     def get_album(
@@ -885,6 +1012,7 @@ class API:
         user_ids: Union[int, str, list[Union[int, str]], None] = None,
         include: Union[str, list[str], None] = None,
         cursor: Union[int, str, None] = None,
+        max_workers: int = None,
     ) -> dict[str, Any]:
         """
         `Albums > Get multiple albums <https://tidal-music.github.io
@@ -900,7 +1028,9 @@ class API:
 
         album_ids : `int`, `str`, or `list`, keyword-only, optional
             TIDAL album ID(s). Only optional if either `barcode_ids` or
-            `user_ids` is provided.
+            `user_ids` is provided. Any number of IDs can be provided;
+            they are sent in chunks of up to 20 IDs and the resulting
+            documents are merged.
 
             **Examples**: :code:`251380836`, :code:`"251380836"`,
             :code:`"251380836,275646830"`,
@@ -936,7 +1066,13 @@ class API:
 
         cursor : `int` or `str`, keyword-only, optional
             Pagination cursor. If not specified, the first page of
-            results will be returned.
+            results will be returned. Cannot be used when more than 20
+            album IDs are provided.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of requests to send concurrently when more
+            than 20 album IDs are provided. If not specified, requests
+            are sent one at a time.
 
         Returns
         -------
@@ -950,6 +1086,27 @@ class API:
             user_ids = user_ids.split(",")
         if isinstance(album_ids, str) and "," in album_ids:
             album_ids = album_ids.split(",")
+        if isinstance(album_ids, list) and len(album_ids) > 20:
+            if cursor is not None:
+                emsg = (
+                    "A pagination cursor cannot be used when more than "
+                    "20 album IDs are provided."
+                )
+                raise ValueError(emsg)
+            return self._merge_documents(
+                transport._batch(
+                    lambda ids: self.get_albums(
+                        country_code,
+                        album_ids=ids,
+                        barcode_ids=barcode_ids,
+                        user_ids=user_ids,
+                        include=include,
+                    ),
+                    album_ids,
+                    20,
+                    max_workers,
+                )
+            )
         if isinstance(barcode_ids, str) and "," in barcode_ids:
             barcode_ids = barcode_ids.split(",")
         return self._get_json(
@@ -3444,6 +3601,7 @@ class API:
         user_ids: Union[int, str, list[Union[int, str]], None] = None,
         include: Union[str, list[str], None] = None,
         cursor: Union[int, str, None] = None,
+        max_workers: int = None,
     ) -> dict[str, Any]:
         """
         `Tracks > Get multiple tracks <https://tidal-music.github.io
@@ -3458,7 +3616,9 @@ class API:
             **Example**: :code:`"US"`.
 
         track_ids : `int`, `str`, or `list`, keyword-only, optional
-            TIDAL track ID(s).
+            TIDAL track ID(s). Any number of IDs can be provided; they
+            are sent in chunks of up to 20 IDs and the resulting
+            documents are merged.
 
             **Examples**: :code:`75413016`, :code:`"75413016"`, and
             :code:`["46369325", "75413016"]`.
@@ -3488,7 +3648,13 @@ class API:
             :code:`["albums", "artists"]`.
 
         cursor : `int` or `str`, keyword-only, optional
-            Pagination cursor.
+            Pagination cursor. Cannot be used when more than 20 track IDs
+            are provided.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of requests to send concurrently when more
+            than 20 track IDs are provided. If not specified, requests
+            are sent one at a time.
 
         Returns
         -------
@@ -3504,6 +3670,27 @@ class API:
             isrcs = isrcs.split(",")
         if isinstance(track_ids, str) and "," in track_ids:
             track_ids = track_ids.split(",")
+        if isinstance(track_ids, list) and len(track_ids) > 20:
+            if cursor is not None:
+                emsg = (
+                    "A pagination cursor cannot be used when more than "
+                    "20 track IDs are provided."
+                )
+                raise ValueError(emsg)
+            return self._merge_documents(
+                transport._batch(
+                    lambda ids: self.get_tracks(
+                        country_code,
+                        track_ids=ids,
+                        isrcs=isrcs,
+                        user_ids=user_ids,
+                        include=include,
+                    ),
+                    track_ids,
+                    20,
+                    max_workers,
+                )
+            )
         return self._get_json(
             f"{self.API_URL}/tracks",
             params={
@@ -5333,7 +5520,7 @@ class API:
         )
 
 
-class PrivateAPI:
+class PrivateAPI(transport._LazyAuthentication, transport._BatchExecutor):
     """
     Private TIDAL API client.
 
@@ -5472,6 +5659,21 @@ class PrivateAPI:
         associated properties are stored to the Minim configuration
         file.
 
+    refresh_margin : `float`, keyword-only, optional
+        Number of seconds before the access token expires at which it
+        is proactively refreshed in a background thread, so that
+        requests never wait on a token refresh. If not specified, the
+        access token is refreshed only when a request finds it expired.
+
+    lazy : `bool`, keyword-only, default: :code:`False`
+        Determines whether authentication, which may require network
+        requests, is deferred until the first request that needs it so
+        that creating the client is purely local.
+
+    rate_limiter, pool_size, keep_alive, timeout : keyword-only, optional
+        Options for the underlying HTTP session, such as a client-side
+        rate limiter. See :class:`minim.transport.Session`.
+
     Attributes
     ----------
     API_URL : `str`
@@ -5495,12 +5697,15 @@ class PrivateAPI:
     WEB_URL : `str`
         URL for the TIDAL Web Player.
 
-    session : `requests.Session`
+    session : `minim.transport.Session`
         Session used to send requests to the private TIDAL API.
     """
 
     _FLOWS = {"pkce", "device_code"}
     _NAME = f"{__module__}.{__qualname__}"
+    _PROCESS_STATE = transport._LazyAuthentication._PROCESS_STATE | {
+        "_token_lock": threading.Lock
+    }
 
     API_URL = "https://api.tidal.com"
     AUTH_URL = "https://auth.tidal.com/v1/oauth2"
@@ -5523,26 +5728,38 @@ class PrivateAPI:
         expiry: datetime.datetime = None,
         overwrite: bool = False,
         save: bool = True,
+        refresh_margin: float = None,
+        lazy: bool = False,
+        rate_limiter: transport.RateLimiter = None,
+        pool_size: int = 32,
+        keep_alive: bool = True,
+        timeout: Union[float, tuple[float, float]] = (3.05, 30.0),
     ) -> None:
         """
         Create a private TIDAL API client.
         """
-        self.session = requests.Session()
+        self.session = transport.Session(
+            rate_limiter=rate_limiter,
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            timeout=timeout,
+        )
+        self._token_lock = threading.Lock()
         if user_agent:
             self.session.headers["User-Agent"] = user_agent
 
         if (
             access_token is None
-            and _config.has_section(self._NAME)
             and not overwrite
+            and (config := credentials.get_store().get(self._NAME))
         ):
-            flow = _config.get(self._NAME, "flow")
-            access_token = _config.get(self._NAME, "access_token")
-            refresh_token = _config.get(self._NAME, "refresh_token")
-            expiry = _config.get(self._NAME, "expiry")
-            client_id = _config.get(self._NAME, "client_id")
-            client_secret = _config.get(self._NAME, "client_secret")
-            scopes = _config.get(self._NAME, "scopes")
+            flow = config["flow"]
+            access_token = config["access_token"]
+            refresh_token = config["refresh_token"]
+            expiry = config["expiry"]
+            client_id = config["client_id"]
+            client_secret = config["client_secret"]
+            scopes = config["scopes"]
 
         self.set_flow(
             flow,
@@ -5552,8 +5769,19 @@ class PrivateAPI:
             scopes=scopes,
             save=save,
         )
-        self.set_access_token(
-            access_token, refresh_token=refresh_token, expiry=expiry
+        self._defer_authentication(
+            functools.partial(
+                self.set_access_token,
+                access_token,
+                refresh_token=refresh_token,
+                expiry=expiry,
+            ),
+            lazy,
+        )
+        self._token_refresher = (
+            None
+            if refresh_margin is None
+            else transport.TokenRefresher(self, margin=refresh_margin)
         )
 
     def _check_scope(
@@ -5643,6 +5871,8 @@ class PrivateAPI:
         if self._browser:
             har_file = DIR_TEMP / "minim_tidal_private.har"
 
+            from playwright.sync_api import sync_playwright
+
             with sync_playwright() as playwright:
                 browser = playwright.firefox.launch(headless=False)
                 context = browser.new_context(
@@ -5736,6 +5966,7 @@ class PrivateAPI:
         """
         Refresh the expired excess token.
         """
+        self.session._emit("token_refresh", self._NAME)
         if (
             self._flow is None
             or not self._refresh_token
@@ -5763,15 +5994,14 @@ class PrivateAPI:
             self._scopes = r["scope"]
 
             if self._save:
-                _config[self._NAME].update(
+                credentials.get_store().update(
+                    self._NAME,
                     {
                         "access_token": r["access_token"],
                         "expiry": self._expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
                         "scopes": self._scopes,
-                    }
+                    },
                 )
-                with open(DIR_HOME / "minim.cfg", "w") as f:
-                    _config.write(f)
 
     def _request(
         self, method: str, url: str, retry: bool = True, **kwargs
@@ -5799,9 +6029,17 @@ class PrivateAPI:
         resp : `requests.Response`
             Response to the request.
         """
-        if self._expiry is not None and datetime.datetime.now() > self._expiry:
-            self._refresh_access_token()
+        self._authenticate()
 
+        if self._expiry is not None and datetime.datetime.now() > self._expiry:
+            with self._token_lock:
+                if (
+                    self._expiry is not None
+                    and datetime.datetime.now() > self._expiry
+                ):
+                    self._refresh_access_token()
+
+        authorization = self.session.headers.get("Authorization")
         r = self.session.request(method, url, **kwargs)
         if r.status_code not in range(200, 299):
             if r.text:
@@ -5834,7 +6072,12 @@ class PrivateAPI:
                 emsg = f"{r.status_code} {r.reason}"
             if r.status_code == 401 and substatus == 11003 and retry:
                 logging.warning(emsg)
-                self._refresh_access_token()
+                with self._token_lock:
+                    if (
+                        self.session.headers.get("Authorization")
+                        == authorization
+                    ):
+                        self._refresh_access_token()
                 return self._request(method, url, False, **kwargs)
             else:
                 raise RuntimeError(emsg)
@@ -5947,7 +6190,7 @@ class PrivateAPI:
                 )
 
                 if self._save:
-                    _config[self._NAME] = {
+                    config = {
                         "flow": self._flow,
                         "client_id": self._client_id,
                         "access_token": access_token,
@@ -5956,12 +6199,10 @@ class PrivateAPI:
                         "scopes": self._scopes,
                     }
                     if hasattr(self, "_client_secret"):
-                        _config[self._NAME]["client_secret"] = (
-                            self._client_secret
-                        )
-                    with open(DIR_HOME / "minim.cfg", "w") as f:
-                        _config.write(f)
+                        config["client_secret"] = self._client_secret
+                    credentials.get_store().set(self._NAME, config)
 
+        self.session.identity = None
         if len(access_token) == 16:
             self.session.headers["x-tidal-token"] = access_token
             self._refresh_token = self._expiry = None
@@ -5978,6 +6219,9 @@ class PrivateAPI:
                 me = self.get_profile()
                 self._country_code = me["countryCode"]
                 self._user_id = me["userId"]
+                self.session.identity = (
+                    f"{self._client_id}:{self._user_id}:{self._country_code}"
+                )
 
     def set_flow(
         self,
@@ -6072,6 +6316,76 @@ class PrivateAPI:
             self.session.headers["x-tidal-token"] = self._client_id
             self._scopes = ""
 
+    def paginate(
+        self,
+        method: Union[str, Callable],
+        *args,
+        limit: int = 50,
+        max_workers: int = None,
+        **kwargs,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield all items from a paginated private TIDAL API
+        endpoint, requesting one page at a time.
+
+        .. note::
+
+           This method is provided for convenience and is not a private
+           TIDAL API endpoint.
+
+        Parameters
+        ----------
+        method : `str` or `Callable`
+            Client method (or its name) for a private TIDAL API endpoint
+            that accepts `limit` and `offset` and returns a page of items,
+            like :meth:`get_favorite_tracks`.
+
+        *args
+            Positional arguments to pass to `method`.
+
+        limit : `int`, keyword-only, default: :code:`50`
+            Maximum number of items to request per page.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of pages to request concurrently once the
+            total number of items is known from the first page. The
+            items are still yielded in order, and every request still
+            passes through the client's rate limiter. If not specified,
+            pages are requested one at a time.
+
+        **kwargs
+            Keyword arguments to pass to `method`. If `offset` is
+            specified, items before it are skipped.
+
+        Yields
+        ------
+        item : `dict`
+            TIDAL content metadata for an item.
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        kwargs["offset"] = kwargs.get("offset") or 0
+
+        while True:
+            page = method(*args, limit=limit, **kwargs)
+            yield from page["items"]
+            kwargs["offset"] += len(page["items"])
+            if (
+                not page["items"]
+                or kwargs["offset"] >= page["totalNumberOfItems"]
+            ):
+                return
+            if max_workers and max_workers > 1:
+                for items in transport._imap(
+                    lambda offset: method(
+                        *args, limit=limit, **kwargs | {"offset": offset}
+                    )["items"],
+                    range(kwargs["offset"], page["totalNumberOfItems"], limit),
+                    max_workers,
+                ):
+                    yield from items
+                return
+
     ### ALBUMS ################################################################
 
     def get_album(
@@ -10468,6 +10782,12 @@ class PrivateAPI:
             with self.session.get(manifest["urls"][0]) as r:
                 stream = r.content
             if manifest["encryptionType"] == "OLD_AES":
+                from cryptography.hazmat.primitives.ciphers import (
+                    Cipher,
+                    algorithms,
+                    modes,
+                )
+
                 key_id = base64.b64decode(manifest["keyId"])
                 key_nonce = (
                     Cipher(
@@ -11395,6 +11715,65 @@ class PrivateAPI:
             },
         )
 
+    def iter_favorite_tracks(
+        self,
+        country_code: str = None,
+        *,
+        order: str = "DATE",
+        order_direction: str = "DESC",
+        max_workers: int = None,
+    ) -> Generator[dict[str, Any], None, None]:
+        """
+        Lazily yield TIDAL catalog information for all tracks in the
+        current user's collection.
+
+        .. admonition:: User authentication and authorization scope
+           :class: warning
+
+           Requires user authentication and the :code:`r_usr`
+           authorization scope if the device code flow was used.
+
+        .. note::
+
+           This method is provided for convenience and is not a private
+           TIDAL API endpoint.
+
+        Parameters
+        ----------
+        country_code : `str`, optional
+            ISO 3166-1 alpha-2 country code. If not provided, the
+            country code associated with the user account in the current
+            session or the current IP address will be used instead.
+
+        order : `str`, keyword-only, default: :code:`"DATE"`
+            Sorting order.
+
+            **Valid values**: :code:`"DATE"` and :code:`"NAME"`.
+
+        order_direction : `str`, keyword-only, default: :code:`"DESC"`
+            Sorting order direction.
+
+            **Valid values**: :code:`"DESC"` and :code:`"ASC"`.
+
+        max_workers : `int`, keyword-only, optional
+            Maximum number of pages to request concurrently. If not
+            specified, pages are requested one at a time.
+
+        Yields
+        ------
+        track : `dict`
+            TIDAL catalog information for a track in the current user's
+            collection and the time it was added.
+        """
+        yield from self.paginate(
+            self.get_favorite_tracks,
+            country_code,
+            limit=100,
+            order=order,
+            order_direction=order_direction,
+            max_workers=max_workers,
+        )
+
     def favorite_tracks(
         self,
         track_ids: Union[int, str, list[Union[int, str]]],
@@ -12336,3 +12715,40 @@ class PrivateAPI:
             f"{self.API_URL}/v1/users/{self._user_id}"
             f"/favorites/videos/{video_ids}",
         )
+
+
+class AsyncAPI(transport.AsyncClient):
+    """
+    Asynchronous TIDAL API client.
+
+    Coroutine counterpart of :class:`API`. See
+    :class:`minim.transport.AsyncClient` for the constructor
+    parameters and how calls are dispatched.
+
+    .. note::
+
+       The constructor obtains an access token synchronously using the
+       client credentials or PKCE flow. To avoid blocking a running
+       event loop, use :code:`await AsyncAPI.create(...)` instead.
+    """
+
+    _CLIENT = API
+
+
+class AsyncPrivateAPI(transport.AsyncClient):
+    """
+    Asynchronous private TIDAL API client.
+
+    Coroutine counterpart of :class:`PrivateAPI`. See
+    :class:`minim.transport.AsyncClient` for the constructor
+    parameters and how calls are dispatched.
+
+    .. note::
+
+       For the device code and PKCE flows, the constructor waits
+       synchronously for the user to authorize Minim and then looks up
+       the user's profile. To avoid blocking a running event loop, use
+       :code:`await AsyncPrivateAPI.create(...)` instead.
+    """
+
+    _CLIENT = PrivateAPI
@@ -0,0 +1,3803 @@
+"""
+Transport
+=========
+.. moduleauthor:: Benjamin Ye <GitHub: bbye98>
+
+This module contains the HTTP transport shared by all Minim API clients,
+including the retry and backoff policy, the circuit breaker, and the
+client-side rate limiter applied to every request, request priorities,
+an optional persistent response cache, a background access token
+refresher, and the base class for the thread-backed asynchronous
+clients.
+"""
+
+import asyncio
+import base64
+import bisect
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import contextlib
+import contextvars
+import copy
+import datetime
+from email.utils import parsedate_to_datetime
+import functools
+import hashlib
+import heapq
+import inspect
+import io
+import itertools
+import json
+import logging
+import os
+from pathlib import Path
+import queue
+import random
+import re
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Callable, Generator, Iterable, Union
+import urllib
+import warnings
+import weakref
+
+import requests
+from urllib3.connection import HTTPConnection
+
+from . import DIR_TEMP, VERSION
+
+__all__ = [
+    "AsyncClient",
+    "Cassette",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "HedgingPolicy",
+    "MetricsCollector",
+    "RateLimiter",
+    "RequestEvent",
+    "RequestHook",
+    "ResponseCache",
+    "Result",
+    "RetryPolicy",
+    "Session",
+    "TokenRefresher",
+    "priority",
+    "PRIORITIES",
+]
+
+PRIORITIES = {"interactive": 0, "normal": 1, "bulk": 2}
+
+_priority = contextvars.ContextVar("priority", default=PRIORITIES["normal"])
+_ID_SEGMENT = re.compile(
+    r"\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+    r"|[A-Z]{2}[A-Z0-9]{3}\d{7}",
+    re.IGNORECASE,
+)
+_instances = weakref.WeakSet()
+_logger = logging.getLogger(__name__)
+_REQUEST_SIGNATURE = inspect.signature(requests.Session.request)
+_INTERNAL_DIRS = tuple(
+    f"{Path(module.__file__).parent}{os.sep}"
+    for module in (sys.modules[__package__], requests)
+)
+
+
+def _after_fork() -> None:
+    """
+    Reset the per-process state of all live objects in a child process
+    after a fork. Background threads are restarted last, once the locks
+    they may acquire have been replaced.
+    """
+    for obj in sorted(
+        list(_instances), key=lambda obj: isinstance(obj, TokenRefresher)
+    ):
+        obj._reset_process_state()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+class _ProcessLocal:
+    """
+    Base class for objects holding locks, connection pools, background
+    threads, or other state that must not be shared between processes.
+
+    Such state is listed in `_PROCESS_STATE`, which maps attribute names
+    to factories for their initial values (or :code:`None` to reset the
+    attribute to :code:`None`). It is left out when the object is
+    pickled and recreated by :meth:`_reset_process_state` when the
+    object is unpickled and in the child process after a fork, so that
+    objects can be passed to process pools without sharing sockets or
+    locks with the parent process.
+    """
+
+    _PROCESS_STATE = {}
+
+    def __new__(cls, *args, **kwargs) -> "_ProcessLocal":
+        self = super().__new__(cls)
+        _instances.add(self)
+        return self
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            k: v
+            for k, v in self.__dict__.items()
+            if k not in self._PROCESS_STATE
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._reset_process_state()
+
+    def _reset_process_state(self) -> None:
+        """
+        Recreate the per-process state.
+        """
+        for name, factory in self._PROCESS_STATE.items():
+            setattr(self, name, None if factory is None else factory())
+
+
+class _SQLiteStore(_ProcessLocal):
+    """
+    Base class for objects whose state is stored in a SQLite database
+    that can be shared by multiple threads and processes.
+
+    .. attention::
+
+       This class should *not* be instantiated manually. Subclasses must
+       define the `path` attribute and the `_SCHEMA` class attribute.
+    """
+
+    _PROCESS_STATE = {"_connection": None, "_pid": None}
+    _SCHEMA = ()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get a connection to the database, reconnecting if the process
+        has been forked.
+
+        Returns
+        -------
+        connection : `sqlite3.Connection`
+            Database connection.
+        """
+        if (
+            getattr(self, "_connection", None) is None
+            or self._pid != os.getpid()
+        ):
+            self._connection = sqlite3.connect(
+                self.path,
+                timeout=60,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            for statement in self._SCHEMA:
+                self._connection.execute(statement)
+            self._pid = os.getpid()
+        return self._connection
+
+
+class _Flight:
+    """
+    In-flight GET request whose response is shared by all concurrent
+    callers making the identical request.
+    """
+
+    __slots__ = ("error", "event", "response")
+
+    def __init__(self) -> None:
+        """
+        Create an in-flight request.
+        """
+        self.event = threading.Event()
+        self.error = self.response = None
+
+    def wait(self) -> requests.Response:
+        """
+        Wait for the request to complete.
+
+        Returns
+        -------
+        resp : `requests.Response`
+            Copy of the response to the request.
+        """
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return copy.copy(self.response)
+
+
+def _batch(
+    func: Callable,
+    ids: Union[int, str, list[Union[int, str]]],
+    size: int,
+    max_workers: int = None,
+) -> list[Any]:
+    """
+    Call a function on consecutive chunks of IDs, each containing at
+    most `size` IDs, and return the results in input order.
+
+    Parameters
+    ----------
+    func : `callable`
+        Function that accepts a `list` of IDs as strings.
+
+    ids : `int`, `str`, or `list`
+        (Comma-separated) list of IDs.
+
+    size : `int`
+        Maximum number of IDs per chunk.
+
+    max_workers : `int`, optional
+        Maximum number of chunks to process concurrently. If not
+        specified, chunks are processed one at a time.
+
+    Returns
+    -------
+    results : `list`
+        Return values of `func` for each chunk.
+    """
+    ids = _split_ids(ids)
+    chunks = [ids[i : i + size] for i in range(0, len(ids), size)]
+    if max_workers and max_workers > 1 and len(chunks) > 1:
+        return list(_imap(func, chunks, max_workers))
+    return [func(chunk) for chunk in chunks]
+
+
+def _get_endpoint(url: str) -> str:
+    """
+    Get the endpoint template for a URL by replacing the path segments
+    that look like IDs with a placeholder, so that requests for
+    different resources are grouped together.
+
+    Parameters
+    ----------
+    url : `str`
+        URL for the request.
+
+    Returns
+    -------
+    endpoint : `str`
+        Host and templated path of the URL, like
+        :code:`"api.spotify.com/v1/albums/{id}/tracks"`.
+    """
+    url = urllib.parse.urlsplit(url)
+    return url.netloc + "/".join(
+        "{id}"
+        if _ID_SEGMENT.fullmatch(segment)
+        or len(segment) >= 16
+        and any(c.isdigit() for c in segment)
+        else segment
+        for segment in url.path.split("/")
+    )
+
+
+def _get_stacklevel() -> int:
+    """
+    Get the stack level that attributes a warning issued by the caller
+    to the first frame outside Minim and Requests, usually user code.
+
+    Returns
+    -------
+    stacklevel : `int`
+        Stack level to pass to :func:`warnings.warn`.
+    """
+    frame = sys._getframe(1)
+    stacklevel = 1
+    while frame is not None and frame.f_code.co_filename.startswith(
+        _INTERNAL_DIRS
+    ):
+        frame = frame.f_back
+        stacklevel += 1
+    return stacklevel
+
+
+def _imap(
+    func: Callable, items: Iterable, max_workers: int
+) -> Generator[Any, None, None]:
+    """
+    Lazily call a function on each item using a bounded pool of worker
+    threads and yield the results in input order.
+
+    At most `max_workers` calls are in flight at any time, and a new
+    call is only started once the oldest result has been consumed, so
+    abandoning the generator early does not issue the remaining calls.
+
+    Parameters
+    ----------
+    func : `callable`
+        Function to call on each item.
+
+    items : iterable
+        Items to pass to `func`.
+
+    max_workers : `int`
+        Maximum number of concurrent calls.
+
+    Yields
+    ------
+    result : `Any`
+        Return value of `func` for an item. If the call raised an
+        exception, it is re-raised here and no further results are
+        yielded.
+    """
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers, thread_name_prefix="minim")
+    try:
+        futures = deque(
+            executor.submit(contextvars.copy_context().run, func, item)
+            for item in itertools.islice(items, max_workers)
+        )
+        while futures:
+            result = futures.popleft().result()
+            for item in itertools.islice(items, 1):
+                futures.append(
+                    executor.submit(contextvars.copy_context().run, func, item)
+                )
+            yield result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _split_ids(ids: Union[int, str, list[Union[int, str]]]) -> list[str]:
+    """
+    Normalize a (comma-separated) list of IDs.
+
+    Parameters
+    ----------
+    ids : `int`, `str`, or `list`
+        (Comma-separated) list of IDs.
+
+    Returns
+    -------
+    ids : `list`
+        IDs as strings with surrounding whitespace removed. Empty IDs
+        are dropped.
+    """
+    if isinstance(ids, (int, str)):
+        ids = str(ids).split(",")
+    return [id for id in (str(id).strip() for id in ids) if id]
+
+
+class _BatchExecutor:
+    """
+    Mixin for API clients that can call one of their methods on many
+    sets of arguments concurrently.
+
+    The calls share the client's session, connection pool, rate
+    limiter, and access token.
+    """
+
+    @staticmethod
+    def _call(method: Callable, index: int, arguments: Any) -> "Result":
+        """
+        Call a method on a set of arguments and capture the outcome.
+
+        Parameters
+        ----------
+        method : `callable`
+            Method to call.
+
+        index : `int`
+            Position of the set of arguments in the input.
+
+        arguments : `Any`
+            Set of arguments. See :meth:`map`.
+
+        Returns
+        -------
+        result : `Result`
+            Outcome of the call.
+        """
+        if isinstance(arguments, tuple):
+            args, kwargs = arguments, {}
+        elif isinstance(arguments, dict):
+            args, kwargs = (), arguments
+        else:
+            args, kwargs = (arguments,), {}
+        start = time.perf_counter()
+        try:
+            value, error = method(*args, **kwargs), None
+        except Exception as e:
+            value, error = None, e
+        return Result(
+            index, args, kwargs, value, error, time.perf_counter() - start
+        )
+
+    def imap(
+        self,
+        method: Union[str, Callable],
+        arguments: Iterable,
+        *,
+        max_workers: int = 8,
+        ordered: bool = True,
+    ) -> Generator["Result", None, None]:
+        """
+        Lazily call a client method on many sets of arguments using a
+        bounded pool of worker threads.
+
+        .. note::
+
+           This method is provided for convenience and is not an API
+           endpoint.
+
+        Parameters
+        ----------
+        method : `str` or `Callable`
+            Client method (or its name) to call.
+
+        arguments : iterable
+            Sets of arguments to call `method` with. Each set can be a
+            `tuple` of positional arguments, a `dict` of keyword
+            arguments, or any other object to pass as the only
+            positional argument. `arguments` is consumed lazily, so it
+            can be a generator.
+
+        max_workers : `int`, keyword-only, default: :code:`8`
+            Maximum number of concurrent calls.
+
+        ordered : `bool`, keyword-only, default: :code:`True`
+            Determines whether results are yielded in input order. If
+            :code:`False`, results are yielded as soon as the calls
+            complete.
+
+        Yields
+        ------
+        result : `Result`
+            Outcome of a call. Exceptions raised by `method` are
+            captured in the result instead of aborting the batch.
+        """
+        if isinstance(method, str):
+            method = getattr(self, method)
+        arguments = enumerate(arguments)
+        if ordered:
+            yield from _imap(
+                lambda item: self._call(method, *item),
+                arguments,
+                max_workers,
+            )
+            return
+
+        executor = ThreadPoolExecutor(max_workers, thread_name_prefix="minim")
+        try:
+            pending = {
+                executor.submit(
+                    contextvars.copy_context().run, self._call, method, *item
+                )
+                for item in itertools.islice(arguments, max_workers)
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for item in itertools.islice(arguments, 1):
+                        pending.add(
+                            executor.submit(
+                                contextvars.copy_context().run,
+                                self._call,
+                                method,
+                                *item,
+                            )
+                        )
+                    yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def map(
+        self,
+        method: Union[str, Callable],
+        arguments: Iterable,
+        *,
+        max_workers: int = 8,
+    ) -> list["Result"]:
+        """
+        Call a client method on many sets of arguments using a bounded
+        pool of worker threads.
+
+        .. note::
+
+           This method is provided for convenience and is not an API
+           endpoint.
+
+        Parameters
+        ----------
+        method : `str` or `Callable`
+            Client method (or its name) to call.
+
+        arguments : iterable
+            Sets of arguments to call `method` with. Each set can be a
+            `tuple` of positional arguments, a `dict` of keyword
+            arguments, or any other object to pass as the only
+            positional argument.
+
+        max_workers : `int`, keyword-only, default: :code:`8`
+            Maximum number of concurrent calls.
+
+        Returns
+        -------
+        results : `list`
+            Outcomes of the calls, in input order. Exceptions raised by
+            `method` are captured in the results instead of aborting the
+            batch.
+
+        Examples
+        --------
+        >>> results = client.map("search", ["Taylor Swift", "Adele"])
+        >>> [r.value for r in results if r.ok]
+        """
+        return list(self.imap(method, arguments, max_workers=max_workers))
+
+
+class _KeepAliveAdapter(requests.adapters.HTTPAdapter):
+    """
+    HTTP adapter that enables TCP keep-alive probes on pooled
+    connections.
+    """
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        kwargs.setdefault(
+            "socket_options",
+            [
+                *HTTPConnection.default_socket_options,
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            ],
+        )
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _LazyAuthentication(_ProcessLocal):
+    """
+    Mixin for API clients that can defer authentication until it is
+    first needed.
+
+    When authentication is deferred, it is completed by the first call
+    to :meth:`_authenticate`, which clients make before sending a
+    request, or by the first access to an attribute that is only set
+    during authentication, such as the user ID. Concurrent callers wait
+    for a single authentication.
+    """
+
+    _PROCESS_STATE = {"_auth_lock": threading.Lock, "_auth_thread": None}
+    _pending_auth = None
+    _auth_thread = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._pending_auth is not None and not name.startswith("__"):
+            self._authenticate()
+            return object.__getattribute__(self, name)
+        emsg = f"{type(self).__name__!r} object has no attribute {name!r}"
+        raise AttributeError(emsg)
+
+    def _authenticate(self) -> None:
+        """
+        Complete the deferred authentication, if any.
+        """
+        if (
+            self._pending_auth is None
+            or self._auth_thread == threading.get_ident()
+        ):
+            return
+        with self._auth_lock:
+            if self._pending_auth is not None:
+                self._auth_thread = threading.get_ident()
+                try:
+                    self._pending_auth()
+                    self._pending_auth = None
+                finally:
+                    self._auth_thread = None
+
+    def _defer_authentication(self, func: Callable, lazy: bool) -> None:
+        """
+        Authenticate now or defer authentication until it is first
+        needed.
+
+        Parameters
+        ----------
+        func : `Callable`
+            Function that authenticates the client.
+
+        lazy : `bool`
+            Determines whether authentication is deferred.
+        """
+        if lazy:
+            self._auth_lock = threading.Lock()
+            self._pending_auth = func
+        else:
+            func()
+
+
+class AsyncClient:
+    """
+    Base class for asynchronous API clients.
+
+    An asynchronous client wraps a synchronous client and exposes all of
+    its public methods, with the same signatures and docstrings, as
+    coroutines. Calls are dispatched to a pool of `max_concurrency`
+    worker threads that share the synchronous client's connection pool,
+    authorization flow, and access token, so that many tasks can use
+    one client without creating a client per task.
+
+    Each call still occupies a worker thread for as long as its request
+    takes, so at most `max_concurrency` requests are in flight at any
+    time, and further calls wait until a worker becomes available.
+    Raising `max_concurrency` increases throughput at the cost of one
+    thread per additional request in flight.
+
+    .. note::
+
+       Requests are sent using the blocking :mod:`requests` session of
+       the synchronous client rather than an asyncio-native HTTP
+       transport, so this class makes a client awaitable without
+       blocking the event loop but does not reduce the number of
+       threads needed for concurrent requests.
+
+    .. attention::
+
+       This class should *not* be instantiated manually. Instead, use
+       one of its subclasses, such as :class:`minim.spotify.AsyncWebAPI`.
+
+    Parameters
+    ----------
+    *args, **kwargs
+        Positional and keyword arguments passed to the constructor of
+        the synchronous client.
+
+    client : `object`, keyword-only, optional
+        Existing synchronous client to wrap. If provided, `args` and
+        `kwargs` are ignored.
+
+    max_concurrency : `int`, keyword-only, default: :code:`32`
+        Maximum number of requests in flight at any time. The
+        connection pool of the synchronous client is enlarged to match
+        if it is smaller.
+
+    Attributes
+    ----------
+    client : `object`
+        Wrapped synchronous client.
+    """
+
+    _CLIENT = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """
+        Generate coroutine counterparts of the public methods of the
+        synchronous client.
+        """
+        super().__init_subclass__(**kwargs)
+        if cls._CLIENT is None:
+            return
+        for name, func in inspect.getmembers(cls._CLIENT, inspect.isfunction):
+            if not name.startswith("_") and name not in cls.__dict__:
+                setattr(cls, name, cls._wrap(name, func))
+
+    @staticmethod
+    def _wrap(name: str, func: Callable) -> Callable:
+        """
+        Create a coroutine function that calls a method of the
+        synchronous client in a worker thread, or an asynchronous
+        generator function if the method is a generator function.
+
+        Parameters
+        ----------
+        name : `str`
+            Method name.
+
+        func : `callable`
+            Method of the synchronous client.
+
+        Returns
+        -------
+        method : `callable`
+            Coroutine or asynchronous generator function with the same
+            signature and docstring as `func`.
+        """
+
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            async def method(self, *args, **kwargs):
+                # Each item is produced in a worker thread, so the event
+                # loop is never blocked while a page is being requested.
+                iterator = await self._run(
+                    getattr(self.client, name), *args, **kwargs
+                )
+                done = object()
+                while (
+                    item := await self._run(next, iterator, done)
+                ) is not done:
+                    yield item
+
+            return method
+
+        @functools.wraps(func)
+        async def method(self, *args, **kwargs):
+            return await self._run(getattr(self.client, name), *args, **kwargs)
+
+        return method
+
+    def __init__(
+        self, *args, client: object = None, max_concurrency: int = 32, **kwargs
+    ) -> None:
+        """
+        Create an asynchronous API client.
+        """
+        self.client = (
+            self._CLIENT(*args, **kwargs) if client is None else client
+        )
+        self._executor = ThreadPoolExecutor(
+            max_concurrency, thread_name_prefix=type(self).__name__
+        )
+        if self.client.session.pool_size < max_concurrency:
+            self.client.session.pool_size = max_concurrency
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Get an attribute of the synchronous client.
+        """
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call a function in a worker thread.
+
+        Parameters
+        ----------
+        func : `callable`
+            Function to call.
+
+        *args, **kwargs
+            Positional and keyword arguments passed to `func`.
+
+        Returns
+        -------
+        result : `Any`
+            Return value of `func`.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            functools.partial(
+                contextvars.copy_context().run, func, *args, **kwargs
+            ),
+        )
+
+    @classmethod
+    async def create(cls, *args, **kwargs) -> "AsyncClient":
+        """
+        Create an asynchronous API client without blocking the event
+        loop during authorization.
+
+        Parameters
+        ----------
+        *args, **kwargs
+            Positional and keyword arguments passed to the constructor.
+
+        Returns
+        -------
+        client : `AsyncClient`
+            Asynchronous API client.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(cls, *args, **kwargs)
+        )
+
+    async def aclose(self) -> None:
+        """
+        Shut down the worker threads and close the session.
+        """
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._executor.shutdown
+        )
+        self.client.session.close()
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Exception raised when a request is rejected without being sent
+    because the circuit breaker of the session is open.
+
+    Parameters
+    ----------
+    message : `str`
+        Error message.
+
+    retry_after : `float`
+        Number of seconds until the circuit breaker lets probe requests
+        through again.
+
+    Attributes
+    ----------
+    retry_after : `float`
+        Number of seconds until the circuit breaker lets probe requests
+        through again.
+    """
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        """
+        Create a circuit breaker exception.
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Cassette(_ProcessLocal, requests.adapters.BaseAdapter):
+    """
+    Transport adapter that records requests and responses to, or replays
+    them from, a cassette file, so that API clients can be tested and
+    benchmarked offline and deterministically.
+
+    Cassettes are either HTTP Archive (HAR) 1.2 files, if the file name
+    ends in :code:`.har`, or JSON Lines (JSONL) files with one HAR entry
+    per line.
+
+    Since cassettes are meant to be shared, credentials are redacted
+    before they are written:
+
+    * The :attr:`FILTERED_HEADERS` request and response headers are
+      omitted.
+    * The values of the :attr:`FILTERED_FIELDS` query parameters in the
+      request URL are replaced with :attr:`REDACTED`.
+    * The values of the :attr:`FILTERED_FIELDS` form fields and JSON
+      object keys, at any depth, in request and response bodies are
+      replaced with :attr:`REDACTED`.
+
+    Everything else, including URL paths, other headers, and bodies in
+    other formats, is written verbatim.
+
+    In replay mode, requests are matched to recorded entries by method,
+    URL, and body after the same redaction, ignoring the query
+    parameters in `ignore_params`.
+    Requests matching several entries, such as a retried request, get
+    the recorded responses in order, with the last one repeated once
+    they are exhausted. A :code:`RuntimeError` is raised for requests
+    that were not recorded.
+
+    Parameters
+    ----------
+    path : `str` or `pathlib.Path`
+        Path to the cassette file.
+
+    mode : `str`, keyword-only, default: :code:`"replay"`
+        Cassette mode.
+
+        **Valid values**:
+
+        * :code:`"record"` to send requests over the network and append
+          them and their responses to the cassette. HAR cassettes are
+          written when the adapter is closed; JSONL cassettes are
+          written as responses arrive.
+        * :code:`"replay"` to serve recorded responses without any
+          network access.
+
+    latency : `float` or `str`, keyword-only, optional
+        Simulated latency in replay mode, either a fixed number of
+        seconds or :code:`"recorded"` to wait as long as the recorded
+        request took. If not specified, responses are served
+        immediately.
+
+    ignore_params : `tuple`, keyword-only, optional
+        Query parameters ignored when matching requests, such as
+        timestamps and signatures that change between runs.
+
+        **Default**: :code:`("request_ts", "request_sig")`.
+
+    Attributes
+    ----------
+    FILTERED_FIELDS : `tuple`
+        Query parameters, form fields, and JSON object keys whose values
+        are redacted, matched case-insensitively.
+
+    FILTERED_HEADERS : `tuple`
+        Headers that are not written to the cassette.
+
+    REDACTED : `str`
+        Placeholder for redacted values.
+
+    adapter : `requests.adapters.BaseAdapter`
+        Transport adapter used to send requests in record mode. Set
+        automatically when the cassette is attached to a
+        :class:`Session`.
+
+    Examples
+    --------
+    Record the requests sent by a client, and then replay them:
+
+    >>> client.session.cassette = transport.Cassette(
+    ...     "spotify.har", mode="record"
+    ... )
+    >>> client.get_track("4cOdK2wGLETKBW3PvgPWqT")
+    >>> client.session.close()
+    >>> client.session.cassette = transport.Cassette("spotify.har")
+    >>> client.get_track("4cOdK2wGLETKBW3PvgPWqT")
+    """
+
+    FILTERED_FIELDS = (
+        "access_token",
+        "accessToken",
+        "app_secret",
+        "client_secret",
+        "code_verifier",
+        "email",
+        "oauth_token",
+        "oauth_token_secret",
+        "password",
+        "refresh_token",
+        "sp_dc",
+        "user_auth_token",
+    )
+    FILTERED_HEADERS = (
+        "Authorization",
+        "Cookie",
+        "Set-Cookie",
+        "X-User-Auth-Token",
+        "x-tidal-token",
+    )
+    REDACTED = "REDACTED"
+    _PROCESS_STATE = {"_lock": threading.Lock}
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        mode: str = "replay",
+        latency: Union[float, str] = None,
+        ignore_params: tuple[str, ...] = ("request_ts", "request_sig"),
+    ) -> None:
+        """
+        Create a cassette.
+        """
+        if mode not in {"record", "replay"}:
+            emsg = (
+                f"Invalid cassette mode {mode!r}. Valid values: "
+                "'record', 'replay'."
+            )
+            raise ValueError(emsg)
+        if isinstance(latency, str) and latency != "recorded":
+            emsg = (
+                f"Invalid latency {latency!r}. Valid values: a number of "
+                "seconds or 'recorded'."
+            )
+            raise ValueError(emsg)
+
+        super().__init__()
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.ignore_params = set(ignore_params)
+        self.adapter = (
+            requests.adapters.HTTPAdapter() if mode == "record" else None
+        )
+
+        self._har = self.path.suffix.lower() == ".har"
+        self._lock = threading.Lock()
+        self._entries = []
+        self._positions = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self._entries = (
+                    json.load(f)["log"]["entries"]
+                    if self._har
+                    else [json.loads(line) for line in f if line.strip()]
+                )
+        elif mode == "replay":
+            emsg = f"Cassette {str(self.path)!r} does not exist."
+            raise FileNotFoundError(emsg)
+        self._responses = {}
+        for entry in self._entries:
+            request = entry["request"]
+            self._responses.setdefault(
+                self._get_key(
+                    request["method"],
+                    request["url"],
+                    self._decode(request.get("postData")),
+                ),
+                [],
+            ).append(entry)
+
+    @staticmethod
+    def _decode(content: dict[str, Any]) -> bytes:
+        """
+        Decode the body of a recorded request or response.
+
+        Parameters
+        ----------
+        content : `dict`
+            HAR :code:`postData` or :code:`content` object.
+
+        Returns
+        -------
+        body : `bytes`
+            Body.
+        """
+        if not content or "text" not in content:
+            return b""
+        if content.get("encoding") == "base64":
+            return base64.b64decode(content["text"])
+        return content["text"].encode()
+
+    @staticmethod
+    def _encode(body: Union[str, bytes], mime_type: str) -> dict[str, Any]:
+        """
+        Encode the body of a request or response for the cassette.
+
+        Parameters
+        ----------
+        body : `str` or `bytes`
+            Body.
+
+        mime_type : `str`
+            MIME type of the body.
+
+        Returns
+        -------
+        content : `dict`
+            HAR :code:`postData` or :code:`content` object. Bodies that
+            are not valid UTF-8 are Base64-encoded.
+        """
+        if isinstance(body, str):
+            body = body.encode()
+        content = {"size": len(body), "mimeType": mime_type}
+        try:
+            content["text"] = body.decode()
+        except UnicodeDecodeError:
+            content["text"] = base64.b64encode(body).decode()
+            content["encoding"] = "base64"
+        return content
+
+    def _get_headers(self, headers: dict[str, str]) -> list[dict[str, str]]:
+        """
+        Convert headers to HAR format, omitting filtered headers.
+
+        Parameters
+        ----------
+        headers : `dict`
+            Headers.
+
+        Returns
+        -------
+        headers : `list`
+            HAR headers.
+        """
+        filtered = {h.lower() for h in self.FILTERED_HEADERS}
+        return [
+            {"name": k, "value": v}
+            for k, v in headers.items()
+            if k.lower() not in filtered
+        ]
+
+    def _get_key(
+        self, method: str, url: str, body: Union[str, bytes]
+    ) -> tuple[str, str, str]:
+        """
+        Get the key used to match a request to recorded entries.
+
+        Parameters
+        ----------
+        method : `str`
+            Method for the request.
+
+        url : `str`
+            URL for the request.
+
+        body : `str` or `bytes`
+            Body of the request.
+
+        Returns
+        -------
+        key : `tuple`
+            Method, normalized URL, and digest of the body, after
+            redaction.
+        """
+        url = urllib.parse.urlsplit(self._redact_url(url))
+        query = urllib.parse.urlencode(
+            sorted(
+                (k, v)
+                for k, v in urllib.parse.parse_qsl(
+                    url.query, keep_blank_values=True
+                )
+                if k not in self.ignore_params
+            )
+        )
+        return (
+            method.upper(),
+            url._replace(query=query, fragment="").geturl(),
+            hashlib.sha256(self._redact_body(body)).hexdigest(),
+        )
+
+    def _record(
+        self, request: requests.PreparedRequest, r: requests.Response
+    ) -> None:
+        """
+        Append a request and its response to the cassette.
+
+        Parameters
+        ----------
+        request : `requests.PreparedRequest`
+            Request.
+
+        r : `requests.Response`
+            Response, whose content is read.
+        """
+        elapsed = 1_000 * r.elapsed.total_seconds()
+        url = self._redact_url(request.url)
+        content = self._redact_body(r.content)
+        entry = {
+            "startedDateTime": (
+                datetime.datetime.now(datetime.timezone.utc) - r.elapsed
+            ).isoformat(),
+            "time": elapsed,
+            "request": {
+                "method": request.method,
+                "url": url,
+                "httpVersion": "HTTP/1.1",
+                "cookies": [],
+                "headers": self._get_headers(request.headers),
+                "queryString": [
+                    {"name": k, "value": v}
+                    for k, v in urllib.parse.parse_qsl(
+                        urllib.parse.urlsplit(url).query,
+                        keep_blank_values=True,
+                    )
+                ],
+                "headersSize": -1,
+                "bodySize": len(request.body or b""),
+            },
+            "response": {
+                "status": r.status_code,
+                "statusText": r.reason or "",
+                "httpVersion": "HTTP/1.1",
+                "cookies": [],
+                "headers": self._get_headers(
+                    {
+                        k: v
+                        for k, v in r.headers.items()
+                        if k.lower()
+                        not in {"content-encoding", "transfer-encoding"}
+                    }
+                ),
+                "content": self._encode(
+                    content, r.headers.get("Content-Type", "")
+                ),
+                "redirectURL": r.headers.get("Location", ""),
+                "headersSize": -1,
+                "bodySize": len(content),
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": elapsed, "receive": 0},
+        }
+        if request.body:
+            entry["request"]["postData"] = self._encode(
+                self._redact_body(request.body),
+                request.headers.get("Content-Type", ""),
+            )
+            del entry["request"]["postData"]["size"]
+
+        with self._lock:
+            self._entries.append(entry)
+            if not self._har:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+
+    def _redact_body(self, body: Union[str, bytes]) -> bytes:
+        """
+        Redact the values of filtered fields in a JSON or URL-encoded
+        form body.
+
+        Parameters
+        ----------
+        body : `str` or `bytes`
+            Body.
+
+        Returns
+        -------
+        body : `bytes`
+            Redacted body, or the original body if it contains no
+            filtered fields or is in another format.
+        """
+        if isinstance(body, str):
+            body = body.encode()
+        if not body:
+            return b""
+        try:
+            text = body.decode()
+        except UnicodeDecodeError:
+            return body
+        filtered = {f.lower() for f in self.FILTERED_FIELDS}
+
+        try:
+            data = json.loads(text)
+        except ValueError:
+            try:
+                fields = urllib.parse.parse_qsl(
+                    text, keep_blank_values=True, strict_parsing=True
+                )
+            except ValueError:
+                return body
+            if not any(k.lower() in filtered for k, _ in fields):
+                return body
+            return urllib.parse.urlencode(
+                [
+                    (k, self.REDACTED if k.lower() in filtered else v)
+                    for k, v in fields
+                ]
+            ).encode()
+
+        found = False
+
+        def redact(obj: Any) -> None:
+            nonlocal found
+            if isinstance(obj, dict):
+                for k, v in obj.items():
+                    if k.lower() in filtered:
+                        obj[k] = self.REDACTED
+                        found = True
+                    else:
+                        redact(v)
+            elif isinstance(obj, list):
+                for item in obj:
+                    redact(item)
+
+        redact(data)
+        return json.dumps(data).encode() if found else body
+
+    def _redact_url(self, url: str) -> str:
+        """
+        Redact the values of filtered query parameters in a URL.
+
+        Parameters
+        ----------
+        url : `str`
+            URL.
+
+        Returns
+        -------
+        url : `str`
+            Redacted URL.
+        """
+        filtered = {f.lower() for f in self.FILTERED_FIELDS}
+        parts = urllib.parse.urlsplit(url)
+        query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not any(k.lower() in filtered for k, _ in query):
+            return url
+        return parts._replace(
+            query=urllib.parse.urlencode(
+                [
+                    (k, self.REDACTED if k.lower() in filtered else v)
+                    for k, v in query
+                ]
+            )
+        ).geturl()
+
+    def _replay(
+        self, request: requests.PreparedRequest, stream: bool
+    ) -> requests.Response:
+        """
+        Serve the recorded response to a request.
+
+        Parameters
+        ----------
+        request : `requests.PreparedRequest`
+            Request.
+
+        stream : `bool`
+            Whether the response content should be streamed.
+
+        Returns
+        -------
+        resp : `requests.Response`
+            Recorded response.
+        """
+        key = self._get_key(request.method, request.url, request.body)
+        with self._lock:
+            entries = self._responses.get(key)
+            if not entries:
+                emsg = (
+                    f"No response to {request.method} {request.url} was "
+                    f"recorded in cassette {str(self.path)!r}."
+                )
+                raise RuntimeError(emsg)
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        entry = entries[min(position, len(entries) - 1)]
+
+        delay = (
+            entry.get("time", 0) / 1_000
+            if self.latency == "recorded"
+            else self.latency or 0
+        )
+        if delay:
+            time.sleep(delay)
+
+        response = entry["response"]
+        body = self._decode(response["content"])
+        r = requests.Response()
+        r.status_code = response["status"]
+        r.reason = response.get("statusText", "")
+        r.headers = requests.structures.CaseInsensitiveDict(
+            {h["name"]: h["value"] for h in response["headers"]}
+        )
+        r.headers["Content-Length"] = str(len(body))
+        r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+        r.raw = io.BytesIO(body)
+        if not stream:
+            r._content = body
+            r._content_consumed = True
+        r.url = request.url
+        r.request = request
+        r.connection = self
+        r.elapsed = datetime.timedelta(seconds=delay)
+        return r
+
+    def close(self) -> None:
+        """
+        Write the cassette if it is a HAR file in record mode, and close
+        the adapter used to send requests.
+        """
+        if self.adapter is not None:
+            self.adapter.close()
+        if self.mode == "record" and self._har:
+            with self._lock:
+                with open(self.path, "w") as f:
+                    json.dump(
+                        {
+                            "log": {
+                                "version": "1.2",
+                                "creator": {
+                                    "name": "minim",
+                                    "version": VERSION,
+                                },
+                                "entries": self._entries,
+                            }
+                        },
+                        f,
+                        indent=2,
+                    )
+
+    def send(
+        self, request: requests.PreparedRequest, stream: bool = False, **kwargs
+    ) -> requests.Response:
+        """
+        Send a request, or serve its recorded response.
+
+        Parameters
+        ----------
+        request : `requests.PreparedRequest`
+            Request.
+
+        stream : `bool`, default: :code:`False`
+            Whether the response content should be streamed.
+
+        **kwargs
+            Keyword arguments passed to the :meth:`send` method of
+            :attr:`adapter` in record mode.
+
+        Returns
+        -------
+        resp : `requests.Response`
+            Response.
+        """
+        if self.mode == "replay":
+            return self._replay(request, stream)
+        r = self.adapter.send(request, stream=stream, **kwargs)
+        self._record(request, r)
+        return r
+
+
+class CircuitBreaker(_ProcessLocal):
+    """
+    Circuit breaker that stops sending requests to a service that is
+    failing.
+
+    The breaker starts closed and records the outcome of every request
+    attempt. Server errors (5xx status codes), connection errors, and
+    timeouts count as failures. When the failure rate within the
+    sliding window reaches `failure_rate`, the breaker opens and
+    requests fail immediately with a :class:`CircuitOpenError`. After
+    `cooldown` seconds, the breaker becomes half-open and lets up to
+    `probes` requests through. It closes again if they all succeed
+    and reopens as soon as one of them fails.
+
+    Parameters
+    ----------
+    failure_rate : `float`, keyword-only, default: :code:`0.5`
+        Fraction of failed requests within the window at which the
+        breaker opens.
+
+    min_requests : `int`, keyword-only, default: :code:`20`
+        Minimum number of requests within the window before the
+        failure rate is evaluated.
+
+    window : `float`, keyword-only, default: :code:`60.0`
+        Length of the sliding window in seconds.
+
+    cooldown : `float`, keyword-only, default: :code:`30.0`
+        Number of seconds the breaker stays open before letting probe
+        requests through.
+
+    probes : `int`, keyword-only, default: :code:`3`
+        Number of successful probe requests required to close the
+        breaker.
+    """
+
+    CLOSED = "closed"
+    HALF_OPEN = "half-open"
+    OPEN = "open"
+    _PROCESS_STATE = {"_lock": threading.Lock}
+
+    def __init__(
+        self,
+        *,
+        failure_rate: float = 0.5,
+        min_requests: int = 20,
+        window: float = 60.0,
+        cooldown: float = 30.0,
+        probes: int = 3,
+    ) -> None:
+        """
+        Create a circuit breaker.
+        """
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+        self.probes = probes
+
+        self._lock = threading.Lock()
+        self._outcomes = deque()
+        self._failures = 0
+        self._state = self.CLOSED
+        self._opened = 0.0
+        self._probes = self._successes = 0
+
+    def _open(self, now: float) -> None:
+        """
+        Open the breaker.
+
+        Parameters
+        ----------
+        now : `float`
+            Current monotonic time.
+        """
+        self._state = self.OPEN
+        self._opened = now
+        self._outcomes.clear()
+        self._failures = 0
+
+    @property
+    def state(self) -> str:
+        """
+        Current state of the breaker: :code:`"closed"`,
+        :code:`"open"`, or :code:`"half-open"`.
+        """
+        with self._lock:
+            if (
+                self._state == self.OPEN
+                and time.monotonic() - self._opened >= self.cooldown
+            ):
+                return self.HALF_OPEN
+            return self._state
+
+    def acquire(self, url: str = None) -> None:
+        """
+        Ask the breaker for permission to send a request.
+
+        Parameters
+        ----------
+        url : `str`, optional
+            URL for the request, used in the error message.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the breaker is open, or half-open with all probe requests
+            already in flight.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.OPEN:
+                if now - self._opened < self.cooldown:
+                    retry_after = self.cooldown - (now - self._opened)
+                    emsg = (
+                        "Circuit breaker is open after repeated failures; "
+                        f"request to {url} not sent. Retry in "
+                        f"{retry_after:.1f} s."
+                    )
+                    raise CircuitOpenError(emsg, retry_after)
+                self._state = self.HALF_OPEN
+                self._probes = self._successes = 0
+            if self._state == self.HALF_OPEN:
+                if self._probes >= self.probes:
+                    emsg = (
+                        "Circuit breaker is half-open and waiting on "
+                        f"probe requests; request to {url} not sent."
+                    )
+                    raise CircuitOpenError(emsg, 0.0)
+                self._probes += 1
+
+    def record(self, failed: bool) -> None:
+        """
+        Record the outcome of a request.
+
+        Parameters
+        ----------
+        failed : `bool`
+            Whether the request failed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.HALF_OPEN:
+                if failed:
+                    self._open(now)
+                elif (successes := self._successes + 1) >= self.probes:
+                    self._state = self.CLOSED
+                else:
+                    self._successes = successes
+                return
+            if self._state == self.OPEN:
+                return
+
+            self._outcomes.append((now, failed))
+            self._failures += failed
+            while self._outcomes and now - self._outcomes[0][0] > self.window:
+                self._failures -= self._outcomes.popleft()[1]
+            if (
+                len(self._outcomes) >= self.min_requests
+                and self._failures >= self.failure_rate * len(self._outcomes)
+            ):
+                _logger.warning(
+                    f"Circuit breaker opened after {self._failures} of "
+                    f"the last {len(self._outcomes)} requests failed."
+                )
+                self._open(now)
+
+    def release(self) -> None:
+        """
+        Give back the permission to send a request without recording an
+        outcome, such as when the request could not be sent or failed
+        for a reason unrelated to the service. If the breaker is
+        half-open, this frees a probe slot.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probes = max(self._successes, self._probes - 1)
+
+    def reset(self) -> None:
+        """
+        Close the breaker and forget all recorded outcomes.
+        """
+        with self._lock:
+            self._state = self.CLOSED
+            self._outcomes.clear()
+            self._failures = 0
+
+
+class HedgingPolicy(_ProcessLocal):
+    """
+    Policy for hedging GET requests to latency-sensitive endpoints.
+
+    If no response to a hedged request has arrived within the hedging
+    delay, a duplicate request is sent and whichever response arrives
+    first is used. By default, the delay is the rolling
+    :math:`p`-th percentile of the latency of the endpoint, so only the
+    slowest requests are duplicated. The number of duplicates is capped
+    by a budget relative to the number of hedged requests.
+
+    Parameters
+    ----------
+    endpoints : `str` or `list`, keyword-only, optional
+        Regular expression patterns searched for in the URL path of GET
+        requests to determine which endpoints are hedged. If an empty
+        `list`, all GET requests are hedged.
+
+        **Default**: :attr:`ENDPOINTS`, which covers search endpoints.
+
+    delay : `float`, keyword-only, optional
+        Fixed hedging delay in seconds. If not specified, the rolling
+        `quantile` of the latency of each endpoint is used instead.
+
+    quantile : `float`, keyword-only, default: :code:`0.95`
+        Quantile of the recent latencies of an endpoint to use as its
+        hedging delay.
+
+    initial_delay : `float`, keyword-only, default: :code:`1.0`
+        Hedging delay in seconds for an endpoint until `min_samples`
+        latencies have been recorded for it.
+
+    min_samples : `int`, keyword-only, default: :code:`20`
+        Minimum number of recorded latencies before the rolling
+        quantile is used.
+
+    window : `int`, keyword-only, default: :code:`200`
+        Number of most recent latencies kept for each endpoint.
+
+    budget : `float`, keyword-only, default: :code:`0.05`
+        Maximum number of duplicate requests as a fraction of the number
+        of hedged requests. For example, :code:`0.05` allows at most 5%
+        extra traffic.
+
+    Attributes
+    ----------
+    ENDPOINTS : `tuple`
+        Default endpoint patterns to hedge.
+    """
+
+    ENDPOINTS = (r"/search(/|$)",)
+    _PROCESS_STATE = {"_lock": threading.Lock}
+
+    def __init__(
+        self,
+        *,
+        endpoints: Union[str, list[str]] = None,
+        delay: float = None,
+        quantile: float = 0.95,
+        initial_delay: float = 1.0,
+        min_samples: int = 20,
+        window: int = 200,
+        budget: float = 0.05,
+    ) -> None:
+        """
+        Create a hedging policy.
+        """
+        if isinstance(endpoints, str):
+            endpoints = [endpoints]
+        self.endpoints = [
+            re.compile(pattern, re.IGNORECASE)
+            for pattern in (self.ENDPOINTS if endpoints is None else endpoints)
+        ]
+        self.delay = delay
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.budget = budget
+
+        self._lock = threading.Lock()
+        self._credit = 1.0
+        self._latencies = {}
+
+    def consume_budget(self) -> bool:
+        """
+        Withdraw a duplicate request from the budget.
+
+        Returns
+        -------
+        allowed : `bool`
+            Whether the budget allows another duplicate request.
+        """
+        with self._lock:
+            if self._credit < 1.0:
+                return False
+            self._credit -= 1.0
+            return True
+
+    def get_delay(self, url: str) -> float:
+        """
+        Get the hedging delay for a request and credit the budget for
+        it.
+
+        Parameters
+        ----------
+        url : `str`
+            URL for the request.
+
+        Returns
+        -------
+        delay : `float`
+            Hedging delay in seconds.
+        """
+        with self._lock:
+            self._credit = min(self._credit + self.budget, 10.0)
+            if self.delay is not None:
+                return self.delay
+            latencies = self._latencies.get(urllib.parse.urlsplit(url).path)
+            if latencies is None or len(latencies) < self.min_samples:
+                return self.initial_delay
+            latencies = sorted(latencies)
+            return latencies[round(self.quantile * (len(latencies) - 1))]
+
+    def is_hedged(self, method: str, url: str) -> bool:
+        """
+        Determine whether a request should be hedged.
+
+        Parameters
+        ----------
+        method : `str`
+            Method for the request.
+
+        url : `str`
+            URL for the request.
+
+        Returns
+        -------
+        hedged : `bool`
+            Whether the request should be hedged.
+        """
+        if method != "GET":
+            return False
+        path = urllib.parse.urlsplit(url).path
+        return not self.endpoints or any(
+            pattern.search(path) for pattern in self.endpoints
+        )
+
+    def record(self, url: str, latency: float) -> None:
+        """
+        Record the latency of a successful request.
+
+        Parameters
+        ----------
+        url : `str`
+            URL for the request.
+
+        latency : `float`
+            Time in seconds until the response arrived.
+        """
+        path = urllib.parse.urlsplit(url).path
+        with self._lock:
+            if path not in self._latencies:
+                self._latencies[path] = deque(maxlen=self.window)
+            self._latencies[path].append(latency)
+
+
+class RateLimiter(_SQLiteStore):
+    """
+    Token-bucket rate limiter.
+
+    Tokens are added to the bucket at a constant `rate` up to a
+    maximum of `burst` tokens, and each request consumes one token.
+    When the bucket is empty, requests block until a token becomes
+    available.
+
+    By default, the bucket is local to the limiter and shared by all
+    threads using it. If a `name` is specified, the bucket state is
+    instead stored in a small SQLite database so that all limiters with
+    the same name, in any process on the machine, draw from a single
+    global budget.
+
+    Parameters
+    ----------
+    rate : `float`
+        Number of tokens added to the bucket per second.
+
+        **Example**: :code:`60 / 60` for 60 requests per minute.
+
+    burst : `int`, default: :code:`1`
+        Maximum number of tokens in the bucket, i.e., the maximum number
+        of requests that can be sent back-to-back.
+
+    name : `str`, keyword-only, optional
+        Name of the shared bucket. If not specified, the bucket is not
+        shared with other processes.
+
+    path : `str` or `pathlib.Path`, keyword-only, optional
+        Path to the SQLite database storing shared buckets. Only used if
+        `name` is specified.
+
+        **Default**: :code:`DIR_TEMP / "minim_rate_limits.sqlite"`.
+
+    Notes
+    -----
+    Requests waiting for a token are served in order of priority, and
+    in order of arrival within the same priority, so that interactive
+    requests are dispatched before queued bulk requests. See
+    :func:`priority`. Priorities are only honored among the threads of
+    one process; processes sharing a bucket compete on equal terms.
+    """
+
+    _PROCESS_STATE = _SQLiteStore._PROCESS_STATE | {
+        "_lock": threading.Lock,
+        "_queue": threading.Condition,
+        "_waiters": list,
+        "_arrivals": itertools.count,
+    }
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, "
+        "tokens REAL NOT NULL, updated REAL NOT NULL)",
+    )
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        *,
+        name: str = None,
+        path: Union[str, Path] = None,
+    ) -> None:
+        """
+        Create a token-bucket rate limiter.
+        """
+        if rate <= 0 or burst < 1:
+            emsg = f"Invalid rate limit ({rate=}, {burst=})."
+            raise ValueError(emsg)
+
+        self.rate = rate
+        self.burst = burst
+        self.name = name
+        self.path = Path(path or DIR_TEMP / "minim_rate_limits.sqlite")
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._queue = threading.Condition()
+        self._waiters = []
+        self._arrivals = itertools.count()
+
+    def _take(self, tokens: float, updated: float, now: float) -> tuple:
+        """
+        Refill a bucket and try to take a token from it.
+
+        Parameters
+        ----------
+        tokens : `float`
+            Number of tokens in the bucket at time `updated`.
+
+        updated : `float`
+            Time of the last update to the bucket.
+
+        now : `float`
+            Current time.
+
+        Returns
+        -------
+        tokens : `float`
+            Number of tokens left in the bucket.
+
+        delay : `float`
+            Time in seconds to wait before trying again, or :code:`0`
+            if a token was taken.
+        """
+        tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+        if tokens >= 1:
+            return tokens - 1, 0.0
+        return tokens, (1 - tokens) / self.rate
+
+    def _try_acquire(self) -> float:
+        """
+        Try to take a token from the bucket without blocking.
+
+        Returns
+        -------
+        delay : `float`
+            Time in seconds to wait before trying again, or :code:`0`
+            if a token was taken.
+        """
+        with self._lock:
+            if self.name is None:
+                now = time.monotonic()
+                self._tokens, delay = self._take(
+                    self._tokens, self._updated, now
+                )
+                self._updated = now
+                return delay
+
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = connection.execute(
+                    "SELECT tokens, updated FROM buckets WHERE name = ?",
+                    (self.name,),
+                ).fetchone()
+                tokens, delay = self._take(
+                    *(row or (float(self.burst), now)), now
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)",
+                    (self.name, tokens, now),
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            return delay
+
+    def acquire(self, priority: Union[int, str] = None) -> float:
+        """
+        Take a token from the bucket, blocking until one is available
+        and no request with a higher priority is waiting.
+
+        Parameters
+        ----------
+        priority : `int` or `str`, optional
+            Priority of the request, either as a name in
+            :code:`PRIORITIES` or as an integer, where lower values are
+            served first. If not specified, the priority set using
+            :func:`priority` is used.
+
+        Returns
+        -------
+        waited : `float`
+            Time in seconds spent waiting for a token.
+        """
+        if priority is None:
+            priority = _priority.get()
+        elif isinstance(priority, str):
+            priority = PRIORITIES[priority]
+        start = time.monotonic()
+        waited = False
+        with self._queue:
+            waiter = (priority, next(self._arrivals))
+            heapq.heappush(self._waiters, waiter)
+            self._queue.notify_all()
+        try:
+            while True:
+                with self._queue:
+                    while self._waiters[0] != waiter:
+                        self._queue.wait()
+                        waited = True
+                if not (delay := self._try_acquire()):
+                    return time.monotonic() - start if waited else 0.0
+                # Wake up early if a request with a higher priority
+                # arrives so that it can take the next token instead.
+                with self._queue:
+                    self._queue.wait(delay)
+                waited = True
+        finally:
+            with self._queue:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+                self._queue.notify_all()
+
+
+class RequestEvent:
+    """
+    Information about a request passed to the callbacks of a
+    :class:`RequestHook`.
+
+    Attributes
+    ----------
+    method : `str`
+        Method for the request.
+
+    url : `str`
+        URL for the request, without query parameters passed
+        separately.
+
+    endpoint : `str`
+        Endpoint template, i.e., the host and path of the URL with the
+        segments that look like IDs replaced by :code:`{id}`.
+
+    status : `int`
+        Status code of the response. :code:`None` before the response
+        arrives or if the request failed.
+
+    elapsed : `float`
+        Time in seconds from sending the request to receiving the
+        response or the error, including retries.
+
+    request_size : `int`
+        Size of the request body in bytes.
+
+    response_size : `int`
+        Size of the response body in bytes.
+
+    retries : `int`
+        Number of times the request was retried.
+
+    from_cache : `bool`
+        Whether the response was served from the response cache.
+
+    error : `Exception`
+        Exception raised by the request, if any.
+    """
+
+    __slots__ = (
+        "method",
+        "url",
+        "endpoint",
+        "status",
+        "elapsed",
+        "request_size",
+        "response_size",
+        "retries",
+        "from_cache",
+        "error",
+    )
+
+    def __init__(self, method: str, url: str) -> None:
+        """
+        Create a request event.
+        """
+        self.method = method
+        self.url = url
+        self.endpoint = _get_endpoint(url)
+        self.status = self.error = None
+        self.elapsed = 0.0
+        self.request_size = self.response_size = self.retries = 0
+        self.from_cache = False
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(method={self.method!r}, "
+            f"endpoint={self.endpoint!r}, status={self.status!r}, "
+            f"elapsed={self.elapsed:.3f})"
+        )
+
+
+class RequestHook:
+    """
+    Base class for request instrumentation hooks.
+
+    Hooks are attached to the session of an API client by appending
+    them to its :attr:`Session.request_hooks` list. Subclasses override
+    any of the callbacks below, which are called synchronously in the
+    thread sending the request. Exceptions raised by callbacks are
+    logged and otherwise ignored.
+    """
+
+    def after(self, event: RequestEvent) -> None:
+        """
+        Called after a response is received.
+
+        Parameters
+        ----------
+        event : `RequestEvent`
+            Request event with the status code, timing, and sizes.
+        """
+
+    def before(self, event: RequestEvent) -> None:
+        """
+        Called before a request is sent.
+
+        Parameters
+        ----------
+        event : `RequestEvent`
+            Request event.
+        """
+
+    def error(self, event: RequestEvent) -> None:
+        """
+        Called when a request fails with an exception.
+
+        Parameters
+        ----------
+        event : `RequestEvent`
+            Request event with the exception and timing.
+        """
+
+    def token_refresh(self, client: str) -> None:
+        """
+        Called when an API client refreshes its access token.
+
+        Parameters
+        ----------
+        client : `str`
+            Fully qualified name of the API client class.
+        """
+
+
+class MetricsCollector(_ProcessLocal, RequestHook):
+    """
+    In-memory collector of request metrics that can be attached to the
+    sessions of one or more API clients as a hook.
+
+    For each endpoint template (see :class:`RequestEvent`) and method,
+    the collector counts requests, status codes, errors, retries,
+    cached responses, and bytes sent and received, and records a
+    latency histogram. Access token refreshes are counted per client.
+
+    Parameters
+    ----------
+    buckets : `tuple`, keyword-only, optional
+        Upper bounds in seconds of the latency histogram buckets.
+
+        **Default**: :attr:`BUCKETS`.
+
+    Attributes
+    ----------
+    BUCKETS : `tuple`
+        Default latency histogram buckets.
+
+    Examples
+    --------
+    >>> metrics = transport.MetricsCollector()
+    >>> client.session.request_hooks.append(metrics)
+    >>> ...
+    >>> print(metrics.summary())
+    """
+
+    BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    _PROCESS_STATE = {"_lock": threading.Lock}
+
+    def __init__(self, *, buckets: tuple[float, ...] = None) -> None:
+        """
+        Create a metrics collector.
+        """
+        self.buckets = tuple(sorted(buckets or self.BUCKETS))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def _get_quantile(
+        self, histogram: list[int], count: int, quantile: float
+    ) -> float:
+        """
+        Estimate a latency quantile from a histogram.
+
+        Parameters
+        ----------
+        histogram : `list`
+            Number of requests in each bucket, with the overflow bucket
+            last.
+
+        count : `int`
+            Total number of requests.
+
+        quantile : `float`
+            Quantile to estimate.
+
+        Returns
+        -------
+        latency : `float`
+            Upper bound of the bucket containing the quantile, or
+            :code:`inf` if it is in the overflow bucket.
+        """
+        rank = quantile * count
+        cumulative = 0
+        for bound, n in zip((*self.buckets, float("inf")), histogram):
+            cumulative += n
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+    def _get_stats(self, event: RequestEvent) -> dict[str, Any]:
+        """
+        Get the statistics for the endpoint of a request, creating them
+        if necessary. Must be called with the lock held.
+
+        Parameters
+        ----------
+        event : `RequestEvent`
+            Request event.
+
+        Returns
+        -------
+        stats : `dict`
+            Statistics for the endpoint.
+        """
+        key = (event.method, event.endpoint)
+        if key not in self._endpoints:
+            self._endpoints[key] = {
+                "requests": 0,
+                "errors": 0,
+                "retries": 0,
+                "cached": 0,
+                "statuses": Counter(),
+                "bytes_sent": 0,
+                "bytes_received": 0,
+                "latency_sum": 0.0,
+                "histogram": [0] * (len(self.buckets) + 1),
+            }
+        return self._endpoints[key]
+
+    def _observe(self, event: RequestEvent) -> dict[str, Any]:
+        """
+        Record the size and latency of a completed request. Must be
+        called with the lock held.
+
+        Parameters
+        ----------
+        event : `RequestEvent`
+            Request event.
+
+        Returns
+        -------
+        stats : `dict`
+            Statistics for the endpoint.
+        """
+        stats = self._get_stats(event)
+        stats["requests"] += 1
+        stats["retries"] += event.retries
+        stats["bytes_sent"] += event.request_size
+        stats["bytes_received"] += event.response_size
+        stats["latency_sum"] += event.elapsed
+        stats["histogram"][
+            bisect.bisect_left(self.buckets, event.elapsed)
+        ] += 1
+        return stats
+
+    def after(self, event: RequestEvent) -> None:
+        with self._lock:
+            stats = self._observe(event)
+            stats["statuses"][event.status] += 1
+            stats["cached"] += event.from_cache
+
+    def before(self, event: RequestEvent) -> None:
+        pass
+
+    def error(self, event: RequestEvent) -> None:
+        with self._lock:
+            self._observe(event)["errors"] += 1
+
+    def prometheus(self, prefix: str = "minim") -> str:
+        """
+        Export the metrics in the Prometheus text exposition format.
+
+        Parameters
+        ----------
+        prefix : `str`, default: :code:`"minim"`
+            Prefix for the metric names.
+
+        Returns
+        -------
+        metrics : `str`
+            Metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            endpoints = copy.deepcopy(self._endpoints)
+            refreshes = dict(self._token_refreshes)
+
+        lines = [
+            f"# HELP {prefix}_requests_total Requests by status code.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        for (method, endpoint), stats in endpoints.items():
+            labels = f'method="{method}",endpoint="{endpoint}"'
+            for status, count in sorted(
+                stats["statuses"].items(), key=lambda item: str(item[0])
+            ):
+                lines.append(
+                    f'{prefix}_requests_total{{{labels},status="{status}"}} '
+                    f"{count}"
+                )
+            if stats["errors"]:
+                lines.append(
+                    f'{prefix}_requests_total{{{labels},status="error"}} '
+                    f"{stats['errors']}"
+                )
+        for name, key, help in (
+            ("retries", "retries", "Retried request attempts."),
+            ("cached_responses", "cached", "Responses served from cache."),
+            ("request_bytes", "bytes_sent", "Request body bytes sent."),
+            ("response_bytes", "bytes_received", "Response bytes received."),
+        ):
+            lines.extend(
+                (
+                    f"# HELP {prefix}_{name}_total {help}",
+                    f"# TYPE {prefix}_{name}_total counter",
+                )
+            )
+            lines.extend(
+                f'{prefix}_{name}_total{{method="{method}",'
+                f'endpoint="{endpoint}"}} {stats[key]}'
+                for (method, endpoint), stats in endpoints.items()
+            )
+        lines.extend(
+            (
+                f"# HELP {prefix}_request_duration_seconds Request latency.",
+                f"# TYPE {prefix}_request_duration_seconds histogram",
+            )
+        )
+        for (method, endpoint), stats in endpoints.items():
+            labels = f'method="{method}",endpoint="{endpoint}"'
+            cumulative = 0
+            for bound, count in zip(
+                (*self.buckets, "+Inf"), stats["histogram"]
+            ):
+                cumulative += count
+                lines.append(
+                    f"{prefix}_request_duration_seconds_bucket"
+                    f'{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.extend(
+                (
+                    f"{prefix}_request_duration_seconds_sum{{{labels}}} "
+                    f"{stats['latency_sum']}",
+                    f"{prefix}_request_duration_seconds_count{{{labels}}} "
+                    f"{stats['requests']}",
+                )
+            )
+        lines.extend(
+            (
+                f"# HELP {prefix}_token_refreshes_total Access token "
+                "refreshes.",
+                f"# TYPE {prefix}_token_refreshes_total counter",
+            )
+        )
+        lines.extend(
+            f'{prefix}_token_refreshes_total{{client="{client}"}} {count}'
+            for client, count in refreshes.items()
+        )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """
+        Discard all collected metrics.
+        """
+        with self._lock:
+            self._endpoints = {}
+            self._token_refreshes = Counter()
+
+    def summary(self) -> str:
+        """
+        Summarize the metrics in a table with one row per endpoint,
+        sorted by total time spent.
+
+        Returns
+        -------
+        summary : `str`
+            Table with the number of requests, errors, and retries, the
+            mean and estimated 95th and 99th percentile latencies, and
+            the number of bytes received for each endpoint.
+        """
+        with self._lock:
+            endpoints = copy.deepcopy(self._endpoints)
+            refreshes = dict(self._token_refreshes)
+
+        header = (
+            f"{'endpoint':<56}{'requests':>9}{'errors':>7}{'retries':>8}"
+            f"{'mean (s)':>10}{'p95 (s)':>9}{'p99 (s)':>9}{'received':>12}"
+        )
+        rows = [header, "-" * len(header)]
+        for (method, endpoint), stats in sorted(
+            endpoints.items(), key=lambda item: -item[1]["latency_sum"]
+        ):
+            count = stats["requests"]
+            rows.append(
+                f"{f'{method} {endpoint}'[:55]:<56}{count:>9}"
+                f"{stats['errors']:>7}{stats['retries']:>8}"
+                f"{stats['latency_sum'] / count:>10.3f}"
+                f"{self._get_quantile(stats['histogram'], count, 0.95):>9}"
+                f"{self._get_quantile(stats['histogram'], count, 0.99):>9}"
+                f"{stats['bytes_received']:>12}"
+            )
+        rows.extend(
+            f"{client}: {count} access token refresh(es)"
+            for client, count in refreshes.items()
+        )
+        return "\n".join(rows)
+
+    def token_refresh(self, client: str) -> None:
+        with self._lock:
+            self._token_refreshes[client] += 1
+
+
+class ResponseCache(_SQLiteStore):
+    """
+    Persistent, size-capped cache for responses to GET requests.
+
+    Responses are keyed by the request URL, its query parameters, and
+    the authenticated identity of the client, so that different users
+    never share cached personal data. Each endpoint family has its own
+    time-to-live (TTL). When a cached response expires and the server
+    provided a validator (:code:`ETag` or :code:`Last-Modified`), it is
+    revalidated with a conditional request instead of being downloaded
+    again. When the total size of the cached responses exceeds the size
+    cap, the least recently used responses are evicted.
+
+    Parameters
+    ----------
+    path : `str` or `pathlib.Path`, optional
+        Path to the SQLite database storing the cached responses.
+
+        **Default**: :code:`DIR_TEMP / "minim_cache.sqlite"`.
+
+    ttl : `float`, keyword-only, default: :code:`3600`
+        Default TTL in seconds for responses whose URLs do not match any
+        pattern in `ttls`.
+
+    ttls : `dict`, keyword-only, optional
+        TTLs in seconds for endpoint families, with regular expression
+        patterns searched for in the URL path as keys. The first
+        matching pattern determines the TTL. A TTL of :code:`0` disables
+        caching for the endpoint family.
+
+        **Default**: :attr:`TTLS`, which disables caching for endpoints
+        returning user-specific or short-lived data and caches catalog
+        data for one day.
+
+    max_size : `int`, keyword-only, default: :code:`268_435_456`
+        Maximum total size in bytes of the cached response bodies.
+
+    Attributes
+    ----------
+    IGNORED_PARAMS : `set`
+        Query parameters that change with every request, such as
+        request signatures and timestamps, and are therefore excluded
+        from the cache key.
+
+    TTLS : `dict`
+        Default TTLs for endpoint families.
+    """
+
+    IGNORED_PARAMS = {"request_sig", "request_ts"}
+    TTLS = {
+        r"(playbackinfo|getfileurl|stream|lyrics|manifest)": 0,
+        r"/(me|users?|user|favorites?|playlists?|oauth|marketplace|"
+        r"sessions?|inventory|collection|wants)(/|$)": 0,
+        r"/(albums?|artists?|tracks?|releases?|masters?|labels?|videos?|"
+        r"shows?|episodes?|audiobooks?|chapters?|lookup)(/|$)": 86_400,
+    }
+    _PROCESS_STATE = _SQLiteStore._PROCESS_STATE | {"_lock": threading.Lock}
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, "
+        "url TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL, "
+        "content BLOB NOT NULL, encoding TEXT, expires REAL NOT NULL, "
+        "etag TEXT, last_modified TEXT, accessed REAL NOT NULL, "
+        "size INTEGER NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS responses_accessed "
+        "ON responses (accessed)",
+    )
+
+    def __init__(
+        self,
+        path: Union[str, Path] = None,
+        *,
+        ttl: float = 3600,
+        ttls: dict[str, float] = None,
+        max_size: int = 268_435_456,
+    ) -> None:
+        """
+        Create a response cache.
+        """
+        self.path = Path(path or DIR_TEMP / "minim_cache.sqlite")
+        self.ttl = ttl
+        self.ttls = {
+            re.compile(k, re.IGNORECASE): v
+            for k, v in (self.TTLS if ttls is None else ttls).items()
+        }
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """
+        Remove all cached responses.
+        """
+        with self._lock:
+            self._connect().execute("DELETE FROM responses")
+
+    @classmethod
+    def get_key(
+        cls,
+        method: str,
+        url: str,
+        params: Any = None,
+        identity: str = "",
+    ) -> str:
+        """
+        Get the cache key for a request.
+
+        Parameters
+        ----------
+        method : `str`
+            Method for the request.
+
+        url : `str`
+            URL for the request.
+
+        params : `dict`, `list`, or `str`, optional
+            Query parameters for the request.
+
+        identity : `str`, optional
+            Authenticated identity of the client and other
+            request-specific headers.
+
+        Returns
+        -------
+        key : `str`
+            Cache key.
+        """
+        request = requests.models.PreparedRequest()
+        request.prepare_url(url, params)
+        url = urllib.parse.urlsplit(request.url)
+        query = sorted(
+            (k, v)
+            for k, v in urllib.parse.parse_qsl(
+                url.query, keep_blank_values=True
+            )
+            if k not in cls.IGNORED_PARAMS
+        )
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    method.upper(),
+                    url._replace(query="", fragment="").geturl(),
+                    query,
+                    identity,
+                ]
+            ).encode()
+        ).hexdigest()
+
+    def get_ttl(self, url: str) -> float:
+        """
+        Get the TTL for responses from an endpoint.
+
+        Parameters
+        ----------
+        url : `str`
+            URL for the request.
+
+        Returns
+        -------
+        ttl : `float`
+            TTL in seconds.
+        """
+        path = urllib.parse.urlsplit(url).path
+        for pattern, ttl in self.ttls.items():
+            if pattern.search(path):
+                return ttl
+        return self.ttl
+
+    def load(self, key: str) -> tuple[requests.Response, bool]:
+        """
+        Load a cached response.
+
+        Parameters
+        ----------
+        key : `str`
+            Cache key.
+
+        Returns
+        -------
+        resp : `requests.Response`
+            Cached response, or :code:`None` if no response is cached
+            for `key`.
+
+        fresh : `bool`
+            Whether the cached response has not expired yet.
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT url, status, headers, content, encoding, expires "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None, False
+            connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                (time.time(), key),
+            )
+
+        r = requests.Response()
+        r.url, r.status_code, headers, r._content, r.encoding, expires = row
+        r.headers = requests.structures.CaseInsensitiveDict(
+            json.loads(headers)
+        )
+        r.reason = "OK"
+        r.from_cache = True
+        return r, time.time() < expires
+
+    def refresh(
+        self, key: str, ttl: float, r: requests.Response = None
+    ) -> None:
+        """
+        Extend the lifetime of a cached response after it has been
+        revalidated.
+
+        Parameters
+        ----------
+        key : `str`
+            Cache key.
+
+        ttl : `float`
+            TTL in seconds.
+
+        r : `requests.Response`, optional
+            :code:`304 Not Modified` response from the server, whose
+            validators replace the cached ones.
+        """
+        etag = last_modified = None
+        if r is not None:
+            etag = r.headers.get("ETag")
+            last_modified = r.headers.get("Last-Modified")
+        with self._lock:
+            self._connect().execute(
+                "UPDATE responses SET expires = ?, accessed = ?, "
+                "etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (time.time() + ttl, time.time(), etag, last_modified, key),
+            )
+
+    def get_validators(self, key: str) -> dict[str, str]:
+        """
+        Get the conditional request headers for revalidating a cached
+        response.
+
+        Parameters
+        ----------
+        key : `str`
+            Cache key.
+
+        Returns
+        -------
+        headers : `dict`
+            :code:`If-None-Match` and/or :code:`If-Modified-Since`
+            headers, or an empty `dict` if the server provided no
+            validators.
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT etag, last_modified FROM responses WHERE key = ?",
+                    (key,),
+                )
+                .fetchone()
+            )
+        headers = {}
+        if row is not None:
+            if row[0]:
+                headers["If-None-Match"] = row[0]
+            if row[1]:
+                headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def store(self, key: str, r: requests.Response, ttl: float) -> None:
+        """
+        Store a response and evict the least recently used responses
+        if the cache exceeds its size cap.
+
+        Parameters
+        ----------
+        key : `str`
+            Cache key.
+
+        r : `requests.Response`
+            Response to store.
+
+        ttl : `float`
+            TTL in seconds.
+        """
+        if "no-store" in r.headers.get("Cache-Control", ""):
+            return
+        content = r.content
+        if len(content) > self.max_size:
+            return
+
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        r.url,
+                        r.status_code,
+                        json.dumps(dict(r.headers)),
+                        content,
+                        r.encoding,
+                        now + ttl,
+                        r.headers.get("ETag"),
+                        r.headers.get("Last-Modified"),
+                        now,
+                        len(content),
+                    ),
+                )
+                excess = (
+                    connection.execute(
+                        "SELECT COALESCE(SUM(size), 0) FROM responses"
+                    ).fetchone()[0]
+                    - self.max_size
+                )
+                for key_, size in connection.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed"
+                ).fetchall():
+                    if excess <= 0:
+                        break
+                    connection.execute(
+                        "DELETE FROM responses WHERE key = ?", (key_,)
+                    )
+                    excess -= size
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+
+class Result:
+    """
+    Outcome of a single call made by the :code:`map` and :code:`imap`
+    methods of the API clients.
+
+    Parameters
+    ----------
+    index : `int`
+        Position of the set of arguments in the input.
+
+    args : `tuple`
+        Positional arguments the method was called with.
+
+    kwargs : `dict`
+        Keyword arguments the method was called with.
+
+    value : `Any`
+        Return value of the call, or :code:`None` if it failed.
+
+    error : `Exception`
+        Exception raised by the call, or :code:`None` if it succeeded.
+
+    elapsed : `float`
+        Wall-clock duration of the call in seconds.
+    """
+
+    __slots__ = ("index", "args", "kwargs", "value", "error", "elapsed")
+
+    def __init__(
+        self,
+        index: int,
+        args: tuple,
+        kwargs: dict[str, Any],
+        value: Any,
+        error: Exception,
+        elapsed: float,
+    ) -> None:
+        """
+        Create a call outcome.
+        """
+        self.index = index
+        self.args = args
+        self.kwargs = kwargs
+        self.value = value
+        self.error = error
+        self.elapsed = elapsed
+
+    def __repr__(self) -> str:
+        outcome = (
+            f"value={self.value!r}" if self.ok else f"error={self.error!r}"
+        )
+        return (
+            f"{type(self).__name__}(index={self.index}, {outcome}, "
+            f"elapsed={self.elapsed:.3f})"
+        )
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the call succeeded.
+        """
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """
+        Get the return value of the call, re-raising the exception if
+        the call failed.
+
+        Returns
+        -------
+        value : `Any`
+            Return value of the call.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class RetryPolicy(_ProcessLocal):
+    """
+    Retry policy with exponential backoff, jitter, and support for the
+    :code:`Retry-After` header.
+
+    Idempotent methods (:code:`GET`, :code:`HEAD`, :code:`PUT`,
+    :code:`DELETE`, etc.) are retried on throttling, server errors,
+    and connection errors. Non-idempotent methods (:code:`POST` and
+    :code:`PATCH`) are only retried when the server guarantees that the
+    request was not processed, i.e., on throttling and connection
+    timeouts.
+
+    Parameters
+    ----------
+    total : `int`, keyword-only, default: :code:`5`
+        Maximum number of retries for a single request.
+
+    backoff_factor : `float`, keyword-only, default: :code:`0.5`
+        Base delay in seconds. The delay before the :math:`n`-th retry
+        is :code:`backoff_factor * 2 ** n`, capped at `backoff_max`.
+
+    backoff_max : `float`, keyword-only, default: :code:`60.0`
+        Maximum delay in seconds between two attempts when the server
+        does not specify one.
+
+    jitter : `bool`, keyword-only, default: :code:`True`
+        Determines whether full jitter is applied to the computed
+        backoff delay to prevent synchronized retries across workers.
+
+    status_codes : `set`, keyword-only, optional
+        Status codes for which idempotent requests are retried.
+
+        **Default**: :code:`{429, 500, 502, 503, 504}`.
+
+    non_idempotent_status_codes : `set`, keyword-only, optional
+        Status codes for which non-idempotent requests are retried.
+
+        **Default**: :code:`{429}`.
+
+    retry_after_max : `float`, keyword-only, default: :code:`300.0`
+        Maximum delay in seconds to honor from a :code:`Retry-After`
+        header. If the server asks for a longer wait, the request is
+        not retried.
+
+    budget : `int`, keyword-only, default: :code:`60`
+        Maximum number of retries across all requests made by a client
+        within `budget_period`. Once exhausted, failed requests are no
+        longer retried until older retries fall out of the window. If
+        :code:`None`, the budget is unlimited.
+
+    budget_period : `float`, keyword-only, default: :code:`60.0`
+        Length of the sliding window for `budget`, in seconds.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(
+        {"DELETE", "GET", "HEAD", "OPTIONS", "PUT", "TRACE"}
+    )
+    _PROCESS_STATE = {"_lock": threading.Lock}
+
+    def __init__(
+        self,
+        *,
+        total: int = 5,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 60.0,
+        jitter: bool = True,
+        status_codes: set[int] = None,
+        non_idempotent_status_codes: set[int] = None,
+        retry_after_max: float = 300.0,
+        budget: int = 60,
+        budget_period: float = 60.0,
+    ) -> None:
+        """
+        Create a retry policy.
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.status_codes = (
+            {429, 500, 502, 503, 504} if status_codes is None else status_codes
+        )
+        self.non_idempotent_status_codes = (
+            {429}
+            if non_idempotent_status_codes is None
+            else non_idempotent_status_codes
+        )
+        self.retry_after_max = retry_after_max
+        self.budget = budget
+        self.budget_period = budget_period
+
+        self._lock = threading.Lock()
+        self._retries = deque()
+
+    def _consume_budget(self) -> bool:
+        """
+        Withdraw a retry from the budget.
+
+        Returns
+        -------
+        allowed : `bool`
+            Whether the retry budget allows another retry.
+        """
+        if self.budget is None:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            while (
+                self._retries and now - self._retries[0] > self.budget_period
+            ):
+                self._retries.popleft()
+            if len(self._retries) >= self.budget:
+                return False
+            self._retries.append(now)
+            return True
+
+    def get_delay(
+        self, attempt: int, response: requests.Response = None
+    ) -> float:
+        """
+        Get the delay before the next attempt.
+
+        Parameters
+        ----------
+        attempt : `int`
+            Number of retries already made for the request.
+
+        response : `requests.Response`, optional
+            Response to the previous attempt. If it has a
+            :code:`Retry-After` header, the delay it specifies is used.
+
+        Returns
+        -------
+        delay : `float`
+            Delay in seconds.
+        """
+        if response is not None:
+            retry_after = self.parse_retry_after(
+                response.headers.get("Retry-After")
+            )
+            if retry_after is not None:
+                return retry_after
+
+        delay = min(self.backoff_max, self.backoff_factor * 2**attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def is_retryable(
+        self,
+        method: str,
+        attempt: int,
+        *,
+        response: requests.Response = None,
+        exception: Exception = None,
+    ) -> bool:
+        """
+        Determine whether a failed attempt should be retried.
+
+        Parameters
+        ----------
+        method : `str`
+            Method for the request.
+
+        attempt : `int`
+            Number of retries already made for the request.
+
+        response : `requests.Response`, keyword-only, optional
+            Response to the failed attempt.
+
+        exception : `Exception`, keyword-only, optional
+            Exception raised by the failed attempt.
+
+        Returns
+        -------
+        retryable : `bool`
+            Whether the request should be retried.
+        """
+        if attempt >= self.total:
+            return False
+
+        idempotent = method.upper() in self.IDEMPOTENT_METHODS
+        if response is not None:
+            if response.status_code not in (
+                self.status_codes
+                if idempotent
+                else self.non_idempotent_status_codes
+            ):
+                return False
+            retry_after = self.parse_retry_after(
+                response.headers.get("Retry-After")
+            )
+            if retry_after is not None and retry_after > self.retry_after_max:
+                return False
+        elif not isinstance(
+            exception,
+            (requests.ConnectionError, requests.Timeout)
+            if idempotent
+            else requests.ConnectTimeout,
+        ):
+            return False
+        return self._consume_budget()
+
+    @staticmethod
+    def parse_retry_after(value: str) -> float:
+        """
+        Parse the value of a :code:`Retry-After` header.
+
+        Parameters
+        ----------
+        value : `str`
+            Header value, either a number of seconds or an HTTP date.
+
+        Returns
+        -------
+        delay : `float`
+            Delay in seconds, or :code:`None` if `value` is missing or
+            invalid.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            # Dates with a "-0000" zone are parsed as naive UTC times.
+            date = date.replace(tzinfo=datetime.timezone.utc)
+        delay = date - datetime.datetime.now(datetime.timezone.utc)
+        return max(0.0, delay.total_seconds())
+
+
+class Session(_ProcessLocal, requests.Session):
+    """
+    HTTP session used by all Minim API clients.
+
+    This is a drop-in replacement for :class:`requests.Session` that
+    paces requests using a :class:`RateLimiter`, transparently retries
+    throttled and failed requests according to a :class:`RetryPolicy`,
+    so that bulk jobs slow down instead of failing when a service is
+    under load, and optionally serves GET requests from a
+    :class:`ResponseCache`. Identical GET requests made concurrently by
+    multiple threads are coalesced so that only one of them is sent and
+    its response is shared with the others. When the service keeps
+    failing, a :class:`CircuitBreaker` makes further requests fail
+    immediately instead of waiting on it.
+
+    Parameters
+    ----------
+    retry : `RetryPolicy`, keyword-only, optional
+        Retry policy. If not specified, a :class:`RetryPolicy` with
+        default settings is used. Set the :attr:`retry` attribute to
+        :code:`None` to disable retries.
+
+    rate_limiter : `RateLimiter`, keyword-only, optional
+        Client-side rate limiter. If not specified, requests are not
+        paced, and request priorities set using :func:`priority` have
+        no effect. A named limiter shares one budget with other
+        processes.
+
+    circuit_breaker : `CircuitBreaker`, keyword-only, optional
+        Circuit breaker. If not specified, a :class:`CircuitBreaker`
+        with default settings is used. Set the :attr:`circuit_breaker`
+        attribute to :code:`None` to disable it.
+
+    cache : `ResponseCache`, keyword-only, optional
+        Response cache for GET requests. If not specified, responses
+        are not cached.
+
+    coalesce : `bool`, keyword-only, default: :code:`True`
+        Determines whether identical concurrent GET requests are
+        coalesced.
+
+    hedging : `HedgingPolicy`, keyword-only, optional
+        Hedging policy for latency-sensitive GET requests. If not
+        specified, requests are not hedged.
+
+    request_hooks : `list`, keyword-only, optional
+        Request instrumentation hooks, such as a
+        :class:`MetricsCollector`.
+
+    cassette : `Cassette`, keyword-only, optional
+        Cassette to record requests to or replay responses from. If not
+        specified, requests are sent over the network.
+
+    pool_size : `int`, keyword-only, default: :code:`32`
+        Maximum number of connections kept open to each host. Should be
+        at least the number of threads sending requests through the
+        session concurrently, or connections are discarded and
+        re-established for every request.
+
+    keep_alive : `bool`, keyword-only, default: :code:`True`
+        Determines whether connections are reused between requests.
+        If :code:`True`, TCP keep-alive probes are also enabled so that
+        idle pooled connections dropped by the server are detected.
+
+    timeout : `float` or `tuple`, keyword-only, default: :code:`(3.05, 30.0)`
+        Default timeout in seconds for requests that do not specify
+        one, either as a single value or as a (connect, read) tuple.
+        If :code:`None`, requests wait indefinitely.
+
+    Attributes
+    ----------
+    cache : `ResponseCache`
+        Response cache for GET requests sent through this session.
+
+    cassette : `Cassette`
+        Cassette that requests sent through this session are recorded
+        to or replayed from. Setting this attribute mounts or unmounts
+        the cassette.
+
+    circuit_breaker : `CircuitBreaker`
+        Circuit breaker for the service this session sends requests
+        to.
+
+    coalesce : `bool`
+        Whether identical concurrent GET requests sent through this
+        session are coalesced.
+
+    hedging : `HedgingPolicy`
+        Hedging policy for GET requests sent through this session.
+
+    identity : `str`
+        Stable identity of the authenticated client, such as its client
+        ID and user ID, used to key cached and coalesced responses
+        instead of the credentials attached to requests so that cached
+        responses outlive access token refreshes. Set by the Minim API
+        clients after authenticating. If :code:`None`, a digest of the
+        credentials is used.
+
+    request_hooks : `list`
+        Request instrumentation hooks called for every request sent
+        through this session.
+
+    pool_size : `int`
+        Maximum number of connections kept open to each host. Setting
+        this attribute replaces the connection pools and the pool of
+        worker threads used to send hedged requests.
+
+    rate_limiter : `RateLimiter`
+        Client-side rate limiter for requests sent through this
+        session.
+
+    retry : `RetryPolicy`
+        Retry policy for requests sent through this session.
+
+    timeout : `float` or `tuple`
+        Default timeout for requests sent through this session.
+    """
+
+    _IDENTITY_HEADERS = (
+        "Authorization",
+        "X-App-Id",
+        "X-User-Auth-Token",
+        "x-tidal-token",
+    )
+    _PROCESS_STATE = {
+        "adapters": OrderedDict,
+        "_flights": dict,
+        "_flights_lock": threading.Lock,
+        "_hedging_executor": None,
+    }
+
+    def __init__(
+        self,
+        *,
+        retry: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        circuit_breaker: CircuitBreaker = None,
+        cache: ResponseCache = None,
+        coalesce: bool = True,
+        hedging: HedgingPolicy = None,
+        request_hooks: list[RequestHook] = None,
+        cassette: Cassette = None,
+        pool_size: int = 32,
+        keep_alive: bool = True,
+        timeout: Union[float, tuple[float, float]] = (3.05, 30.0),
+    ) -> None:
+        """
+        Create a HTTP session.
+        """
+        super().__init__()
+        self.retry = RetryPolicy() if retry is None else retry
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = (
+            CircuitBreaker() if circuit_breaker is None else circuit_breaker
+        )
+        self.cache = cache
+        self.coalesce = coalesce
+        self.hedging = hedging
+        self.identity = None
+        self.request_hooks = list(request_hooks or [])
+        self.timeout = timeout
+        self._priority_warned = False
+
+        self._keep_alive = keep_alive
+        if not keep_alive:
+            self.headers["Connection"] = "close"
+        self._cassette = None
+        self._hedging_executor = None
+        self.pool_size = pool_size
+        self.cassette = cassette
+
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size
+
+    @pool_size.setter
+    def pool_size(self, pool_size: int) -> None:
+        adapter = (
+            _KeepAliveAdapter
+            if self._keep_alive
+            else requests.adapters.HTTPAdapter
+        )(pool_connections=pool_size, pool_maxsize=pool_size)
+        if self._cassette is None:
+            for prefix in ("http://", "https://"):
+                self.mount(prefix, adapter)
+        else:
+            self._cassette.adapter = adapter
+        if self._hedging_executor is not None:
+            self._hedging_executor.shutdown(wait=False)
+        # Each hedged request may occupy two workers, one for the
+        # original request and one for its duplicate.
+        self._hedging_executor = ThreadPoolExecutor(
+            2 * pool_size, thread_name_prefix="minim-hedging"
+        )
+        self._pool_size = pool_size
+
+    def _reset_process_state(self) -> None:
+        """
+        Recreate the per-process state, including new connection pools
+        so that no connections are shared with the parent process.
+        """
+        super()._reset_process_state()
+        self.cassette = self._cassette
+
+    @property
+    def cassette(self) -> Cassette:
+        return self._cassette
+
+    @cassette.setter
+    def cassette(self, cassette: Cassette) -> None:
+        self._cassette = None
+        self.pool_size = self._pool_size
+        if cassette is not None:
+            if cassette.mode == "record":
+                cassette.adapter = self.get_adapter("https://")
+            for prefix in ("http://", "https://"):
+                self.mount(prefix, cassette)
+        self._cassette = cassette
+
+    def _get_identity(self, headers: dict[str, str] = None) -> str:
+        """
+        Get a digest of the identity of the client and other
+        request-specific headers attached to a request.
+
+        Parameters
+        ----------
+        headers : `dict`, optional
+            Headers for the request, which take precedence over the
+            session headers.
+
+        Returns
+        -------
+        identity : `str`
+            Digest of the identity and headers.
+        """
+        identity_headers = {h.lower() for h in self._IDENTITY_HEADERS}
+        if self.identity is not None and not any(
+            k.lower() in identity_headers for k in headers or {}
+        ):
+            identity = [self.identity]
+        else:
+            merged = requests.structures.CaseInsensitiveDict(
+                self.headers, **(headers or {})
+            )
+            identity = []
+            for header in self._IDENTITY_HEADERS:
+                value = merged.get(header) or ""
+                if value.startswith("OAuth "):
+                    value = "".join(
+                        re.findall(r'oauth_token="(.*?)"', value)
+                    )
+                identity.append(value)
+        identity.extend(
+            f"{k.lower()}: {v}"
+            for k, v in sorted((headers or {}).items())
+            if k.lower() not in identity_headers
+        )
+        return hashlib.sha256("\n".join(identity).encode()).hexdigest()
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request, pacing it according to the rate limiter and
+        retrying it according to the retry policy.
+
+        Parameters
+        ----------
+        method : `str`
+            Method for the request.
+
+        url : `str`
+            URL for the request.
+
+        **kwargs
+            Keyword arguments passed to
+            :meth:`requests.Session.request`.
+
+        Returns
+        -------
+        resp : `requests.Response`
+            Response to the request. If all retries are exhausted, the
+            response to the last attempt is returned.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if (
+            self.rate_limiter is None
+            and not self._priority_warned
+            and _priority.get() != PRIORITIES["normal"]
+        ):
+            self._priority_warned = True
+            wmsg = (
+                "Request priorities have no effect because the session "
+                "has no rate limiter. To dispatch requests in order of "
+                "priority, pass a RateLimiter to the client using the "
+                "'rate_limiter' keyword argument."
+            )
+            warnings.warn(wmsg, RuntimeWarning, stacklevel=_get_stacklevel())
+        attempt = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.acquire(url)
+            try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+                r = (
+                    self._send_hedged(method, url, **kwargs)
+                    if self.hedging is not None
+                    and not kwargs.get("stream")
+                    and self.hedging.is_hedged(method, url)
+                    else super().request(method, url, **kwargs)
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record(True)
+                if self.retry is None or not self.retry.is_retryable(
+                    method, attempt, exception=e
+                ):
+                    raise
+                delay = self.retry.get_delay(attempt)
+                reason = type(e).__name__
+            except BaseException:
+                # Other errors say nothing about the health of the
+                # service, but must not hold on to a probe slot.
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.release()
+                raise
+            else:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record(r.status_code >= 500)
+                if self.retry is None or not self.retry.is_retryable(
+                    method, attempt, response=r
+                ):
+                    r.retries = attempt
+                    return r
+                delay = self.retry.get_delay(attempt, r)
+                reason = f"{r.status_code} {r.reason}"
+                r.close()
+
+            attempt += 1
+            _logger.warning(
+                f"{method} {url} failed ({reason}). Retrying in "
+                f"{delay:.1f} s (attempt {attempt}/{self.retry.total})."
+            )
+            time.sleep(delay)
+
+    def _send_hedged(
+        self, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        """
+        Send a request and, if no response has arrived within the
+        hedging delay, a duplicate request, and return whichever
+        response arrives first.
+
+        Parameters
+        ----------
+        method : `str`
+            Method for the request.
+
+        url : `str`
+            URL for the request.
+
+        **kwargs
+            Keyword arguments passed to
+            :meth:`requests.Session.request`.
+
+        Returns
+        -------
+        resp : `requests.Response`
+            First response to the request or its duplicate.
+        """
+        results = queue.SimpleQueue()
+        winner = threading.Lock()
+        priority = _priority.get()
+
+        def attempt(hedge: bool) -> None:
+            if hedge and self.rate_limiter is not None:
+                self.rate_limiter.acquire(priority)
+            start = time.perf_counter()
+            try:
+                r = requests.Session.request(self, method, url, **kwargs)
+            except Exception as e:
+                results.put((None, e))
+                return
+            self.hedging.record(url, time.perf_counter() - start)
+            # Load the body here so that the first complete response,
+            # not the first response headers, wins.
+            _ = r.content
+            if winner.acquire(blocking=False):
+                results.put((r, None))
+            else:
+                r.close()
+
+        self._hedging_executor.submit(attempt, False)
+        attempts = 1
+        try:
+            r, e = results.get(timeout=self.hedging.get_delay(url))
+        except queue.Empty:
+            if self.hedging.consume_budget():
+                self._hedging_executor.submit(attempt, True)
+                attempts += 1
+            r, e = results.get()
+        # A failed attempt only counts if the other one also failed.
+        while e is not None and (attempts := attempts - 1):
+            r, e = results.get()
+        if e is not None:
+            raise e
+        return r
+
+    def _send_cached(
+        self, key: str, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        """
+        Send a GET request, serving it from the response cache if a
+        fresh response is available and revalidating stale responses.
+
+        Parameters
+        ----------
+        key : `str`
+            Cache key for the request.
+
+        method : `str`
+            Method for the request.
+
+        url : `str`
+            URL for the request.
+
+        **kwargs
+            Keyword arguments passed to
+            :meth:`requests.Session.request`.
+
+        Returns
+        -------
+        resp : `requests.Response`
+            Response to the request.
+        """
+        ttl = self.cache.get_ttl(url)
+        if not ttl:
+            return self._send(method, url, **kwargs)
+
+        cached, fresh = self.cache.load(key)
+        if fresh:
+            return cached
+        if cached is not None and (
+            validators := self.cache.get_validators(key)
+        ):
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **validators}
+
+        r = self._send(method, url, **kwargs)
+        if r.status_code == 304 and cached is not None:
+            self.cache.refresh(key, ttl, r)
+            return cached
+        if r.status_code == 200:
+            self.cache.store(key, r, ttl)
+        return r
+
+    def _emit(self, callback: str, *args) -> None:
+        """
+        Call a callback of all request instrumentation hooks.
+
+        Parameters
+        ----------
+        callback : `str`
+            Name of the callback.
+
+        *args
+            Positional arguments passed to the callback.
+        """
+        for hook in self.request_hooks:
+            try:
+                getattr(hook, callback)(*args)
+            except Exception as e:
+                _logger.warning(
+                    f"Request hook {type(hook).__name__}.{callback} "
+                    f"failed: {e!r}"
+                )
+
+    def _dispatch(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the coalescing, caching, rate limiting,
+        and retry layers of the session.
+
+        Parameters
+        ----------
+        method : `str`
+            Method for the request.
+
+        url : `str`
+            URL for the request.
+
+        **kwargs
+            Keyword arguments passed to
+            :meth:`requests.Session.request`.
+
+        Returns
+        -------
+        resp : `requests.Response`
+            Response to the request. If all retries are exhausted, the
+            response to the last attempt is returned.
+        """
+        method = method.upper()
+        if (
+            method != "GET"
+            or kwargs.get("stream")
+            or self.cache is None
+            and not self.coalesce
+        ):
+            return self._send(method, url, **kwargs)
+
+        key = (self.cache or ResponseCache).get_key(
+            method,
+            url,
+            kwargs.get("params"),
+            self._get_identity(kwargs.get("headers")),
+        )
+        if not self.coalesce:
+            return self._send_cached(key, method, url, **kwargs)
+
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if leader := flight is None:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            return flight.wait()
+
+        try:
+            r = (
+                self._send(method, url, **kwargs)
+                if self.cache is None
+                else self._send_cached(key, method, url, **kwargs)
+            )
+            # Load the body before the response is shared with the
+            # coalesced requests, since it can only be read once.
+            _ = r.content
+            flight.response = r
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.event.set()
+        return r
+
+    def request(
+        self, method: str, url: str, *args, **kwargs
+    ) -> requests.Response:
+        """
+        Construct and send a request through the coalescing, caching,
+        rate limiting, and retry layers of the session, calling the
+        request instrumentation hooks.
+
+        Parameters
+        ----------
+        method : `str`
+            Method for the request.
+
+        url : `str`
+            URL for the request.
+
+        *args
+            Positional arguments passed to
+            :meth:`requests.Session.request`.
+
+        **kwargs
+            Keyword arguments passed to
+            :meth:`requests.Session.request`.
+
+        Returns
+        -------
+        resp : `requests.Response`
+            Response to the request. If all retries are exhausted, the
+            response to the last attempt is returned.
+        """
+        if args:
+            # Bind positional arguments to their names so that the
+            # layers below can look up the parameters and headers.
+            kwargs = _REQUEST_SIGNATURE.bind(
+                self, method, url, *args, **kwargs
+            ).arguments
+            del kwargs["self"], kwargs["method"], kwargs["url"]
+        if not self.request_hooks:
+            return self._dispatch(method, url, **kwargs)
+
+        event = RequestEvent(method.upper(), url)
+        self._emit("before", event)
+        start = time.perf_counter()
+        try:
+            r = self._dispatch(method, url, **kwargs)
+        except Exception as e:
+            event.elapsed = time.perf_counter() - start
+            event.error = e
+            self._emit("error", event)
+            raise
+        event.elapsed = time.perf_counter() - start
+        event.status = r.status_code
+        event.retries = getattr(r, "retries", 0)
+        event.from_cache = getattr(r, "from_cache", False)
+        if r.request is not None and r.request.body:
+            event.request_size = len(r.request.body)
+        event.response_size = (
+            int(r.headers.get("Content-Length", 0))
+            if kwargs.get("stream")
+            else len(r.content)
+        )
+        self._emit("after", event)
+        return r
+
+
+class TokenRefresher(_ProcessLocal):
+    """
+    Background access token refresher.
+
+    Renews the access token of an API client a fixed margin before it
+    expires so that requests never have to wait for a token refresh.
+    The refresher runs in a daemon thread and holds only a weak
+    reference to the client, so it stops on its own when the client is
+    garbage collected.
+
+    The client must expose its access token expiry as
+    :code:`_expiry`, a per-client :code:`_token_lock`, and a
+    :code:`_refresh_access_token()` method. A refresher pickled along
+    with its client, or inherited by a forked process, is restarted in
+    the new process.
+
+    Parameters
+    ----------
+    client : `object`
+        API client whose access token should be refreshed.
+
+    margin : `float`, keyword-only, default: :code:`300.0`
+        Number of seconds before the access token expires at which it
+        is refreshed.
+
+    interval : `float`, keyword-only, default: :code:`60.0`
+        Maximum number of seconds between two checks of the access
+        token expiry. Also used as the delay before retrying a failed
+        refresh.
+    """
+
+    def __init__(
+        self, client: object, *, margin: float = 300.0, interval: float = 60.0
+    ) -> None:
+        """
+        Create and start a background access token refresher.
+        """
+        self.margin = margin
+        self.interval = interval
+
+        self._client = weakref.ref(client)
+        self._stop = threading.Event()
+        self._reset_process_state()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "margin": self.margin,
+            "interval": self.interval,
+            "client": self._client(),
+            "stopped": self._stop.is_set(),
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.margin = state["margin"]
+        self.interval = state["interval"]
+        self._client = weakref.ref(state["client"])
+        self._stop = threading.Event()
+        if state["stopped"]:
+            self._stop.set()
+        self._reset_process_state()
+
+    def _get_delay(self, client: object) -> float:
+        """
+        Get the number of seconds until the access token of a client
+        should be refreshed.
+
+        Parameters
+        ----------
+        client : `object`
+            API client.
+
+        Returns
+        -------
+        delay : `float`
+            Number of seconds until the access token should be
+            refreshed, or :code:`None` if it does not expire or the
+            client has not authenticated yet.
+        """
+        if getattr(client, "_pending_auth", None) is not None:
+            return None
+        expiry = getattr(client, "_expiry", None)
+        if expiry is None or expiry == datetime.datetime.max:
+            return None
+        return (expiry - datetime.datetime.now()).total_seconds() - self.margin
+
+    def _run(self) -> None:
+        """
+        Refresh the access token of the client whenever it is about to
+        expire until the refresher is stopped or the client is garbage
+        collected.
+        """
+        while not self._stop.is_set():
+            if (client := self._client()) is None:
+                return
+            delay = self._get_delay(client)
+            if delay is not None and delay <= 0:
+                try:
+                    with client._token_lock:
+                        delay = self._get_delay(client)
+                        if delay is not None and delay <= 0:
+                            client._refresh_access_token()
+                            delay = self._get_delay(client)
+                            if delay is not None and delay <= 0:
+                                delay = self.interval
+                except Exception as e:
+                    _logger.warning(
+                        f"Background access token refresh failed: {e}"
+                    )
+                    delay = self.interval
+            del client
+            self._stop.wait(
+                self.interval if delay is None else min(delay, self.interval)
+            )
+
+    def _reset_process_state(self) -> None:
+        """
+        Start a new background thread, unless the refresher has been
+        stopped.
+        """
+        stop = threading.Event()
+        if self._stop.is_set():
+            stop.set()
+        self._stop = stop
+        self._thread = threading.Thread(
+            target=self._run, name="minim-token-refresher", daemon=True
+        )
+        if not stop.is_set():
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background access token refresher.
+        """
+        self._stop.set()
+
+
+@contextlib.contextmanager
+def priority(level: Union[int, str]) -> Generator[None, None, None]:
+    """
+    Set the priority of all requests sent by the Minim API clients in
+    the current thread or asynchronous task.
+
+    Requests waiting for a client-side rate limiter are dispatched in
+    order of priority, so latency-critical calls are not queued behind
+    bulk jobs sharing the same budget. Calls made through the
+    :code:`map` and :code:`imap` methods of a client or through an
+    asynchronous client inherit the priority of the caller.
+
+    Priorities only take effect for clients whose session has a rate
+    limiter, which by default is only the iTunes Search API client. For
+    other clients, pass a :class:`RateLimiter` using the `rate_limiter`
+    keyword argument, or a warning is issued the first time a request
+    is sent with a priority other than :code:`"normal"`.
+
+    Parameters
+    ----------
+    level : `int` or `str`
+        Priority, either as a name in :code:`PRIORITIES`
+        (:code:`"interactive"`, :code:`"normal"`, or :code:`"bulk"`) or
+        as an integer, where lower values are served first.
+
+    Examples
+    --------
+    >>> with transport.priority("interactive"):
+    ...     client.get_currently_playing()
+    """
+    if isinstance(level, str):
+        if level not in PRIORITIES:
+            emsg = (
+                f"Invalid priority ({level=}). "
+                f"Valid values: {', '.join(PRIORITIES)}."
+            )
+            raise ValueError(emsg)
+        level = PRIORITIES[level]
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
@@ -0,0 +1,71 @@
+from multiprocessing import Process
+from pathlib import Path
+import sys
+
+sys.path.insert(0, f"{Path(__file__).parents[1]}/src")
+from minim import credentials  # noqa: E402
+
+
+def _update(cls, path, worker):
+    store = cls(path)
+    for i in range(10):
+        store.update(f"worker{worker}", {f"key{i}": i})
+
+
+class _Store:
+    STORE = FILENAME = None
+
+    def test_set_update(self, tmp_path):
+        store = self.STORE(tmp_path / self.FILENAME)
+        assert store.get("section") == {}
+        store.set("section", {"a": 1, "b": None})
+        store.update("section", {"b": "2"})
+        assert store.get("section") == {"a": "1", "b": "2"}
+        store.set("section", {"c": "3"})
+        assert store.get("section") == {"c": "3"}
+
+    def test_shared(self, tmp_path):
+        path = tmp_path / self.FILENAME
+        stores = [self.STORE(path) for _ in range(2)]
+        stores[0].set("first", {"a": "1"})
+        stores[1].set("second", {"b": "2"})
+        assert stores[0].get("first") == {"a": "1"}
+        assert stores[0].get("second") == {"b": "2"}
+
+    def test_processes(self, tmp_path):
+        path = tmp_path / self.FILENAME
+        processes = [
+            Process(target=_update, args=(self.STORE, path, worker))
+            for worker in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        store = self.STORE(path)
+        for worker in range(4):
+            assert len(store.get(f"worker{worker}")) == 10
+
+
+class TestFileStore(_Store):
+    STORE = credentials.FileStore
+    FILENAME = "minim.cfg"
+
+    def test_unchanged(self, tmp_path):
+        path = tmp_path / self.FILENAME
+        store = self.STORE(path)
+        store.set("section", {"a": "1"})
+        mtime = path.stat().st_mtime_ns
+        store.update("section", {"a": 1})
+        store.set("section", {"a": "1"})
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_version(self, tmp_path):
+        store = self.STORE(tmp_path / self.FILENAME)
+        store.set("section", {"a": "1"})
+        assert "version" in store.get("minim")
+
+
+class TestSQLiteStore(_Store):
+    STORE = credentials.SQLiteStore
+    FILENAME = "minim.sqlite"
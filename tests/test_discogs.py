@@ -1,5 +1,8 @@
 from pathlib import Path
 import sys
+import time
+
+import requests
 
 sys.path.insert(0, f"{Path(__file__).parents[1]}/src")
 from minim import discogs  # noqa: E402
@@ -64,3 +67,41 @@ class TestAPI:
 
     def test_search(self):
         assert "results" in self.obj.search(title="Nirvana - Nevermind")
+
+
+class TestRateLimit:
+    @classmethod
+    def setup_class(cls):
+        cls.obj = discogs.API()
+
+    def _response(self, used, remaining):
+        r = requests.Response()
+        r.headers["X-Discogs-Ratelimit"] = "60"
+        r.headers["X-Discogs-Ratelimit-Used"] = str(used)
+        r.headers["X-Discogs-Ratelimit-Remaining"] = str(remaining)
+        return r
+
+    def test_update_rate_limit(self):
+        self.obj._update_rate_limit(self._response(10, 50))
+        assert self.obj.rate_limit == {
+            "limit": 60,
+            "used": 10,
+            "remaining": 50,
+        }
+
+    def test_throttle(self):
+        self.obj._update_rate_limit(self._response(59, 1))
+        self.obj._throttle()
+        slot = self.obj._rate_limit_slot - time.monotonic()
+        assert 25 < slot <= 60
+        assert self.obj.rate_limit["remaining"] == 0
+
+    def test_throttle_exhausted(self, monkeypatch):
+        obj = discogs.API()
+        obj._update_rate_limit(self._response(60, 0))
+        delays = []
+        monkeypatch.setattr(discogs.time, "sleep", delays.append)
+        for _ in range(3):
+            obj._throttle()
+        assert 55 < delays[0] <= 60
+        assert all(0.9 < b - a < 1.1 for a, b in zip(delays, delays[1:]))
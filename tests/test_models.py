@@ -0,0 +1,240 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, f"{Path(__file__).parents[1]}/src")
+from minim import models  # noqa: E402
+
+SPOTIFY_TRACK = {
+    "id": "4cOdK2wGLETKBW3PvgPWqT",
+    "name": "Never Gonna Give You Up",
+    "artists": [{"id": "0gxyHStUsqpMadRV0Di1Qt", "name": "Rick Astley"}],
+    "album": {
+        "id": "6eUW0wxWtzkFdaEFsTJto6",
+        "name": "Whenever You Need Somebody",
+        "artists": [{"id": "0gxyHStUsqpMadRV0Di1Qt", "name": "Rick Astley"}],
+        "release_date": "1987-11-12",
+        "total_tracks": 10,
+        "images": [{"url": "https://i.scdn.co/image/large", "width": 640}],
+    },
+    "external_ids": {"isrc": "GBARL9300135"},
+    "duration_ms": 213573,
+    "disc_number": 1,
+    "track_number": 1,
+    "explicit": False,
+}
+
+
+class TestModels:
+    def test_slots(self):
+        track = models.Track.from_spotify(SPOTIFY_TRACK)
+        assert not hasattr(track, "__dict__")
+        with pytest.raises(AttributeError):
+            track.bpm = 113
+        with pytest.raises(TypeError):
+            models.Artist(service="spotify", bpm=113)
+
+    def test_spotify(self):
+        track = models.Track.from_spotify(
+            {"added_at": "2024-01-01T00:00:00Z", "track": SPOTIFY_TRACK}
+        )
+        assert track.id == "4cOdK2wGLETKBW3PvgPWqT"
+        assert track.isrc == "GBARL9300135"
+        assert track.duration == 213.573
+        assert track.artists[0].name == "Rick Astley"
+        assert track.album.release_date == "1987-11-12"
+        assert track.artwork_url == "https://i.scdn.co/image/large"
+        assert track.to_dict()["album"]["title"] == (
+            "Whenever You Need Somebody"
+        )
+
+    def test_cache(self):
+        cache = {}
+        tracks = [
+            models.Track.from_spotify(SPOTIFY_TRACK, cache=cache)
+            for _ in range(2)
+        ]
+        assert tracks[0].album is tracks[1].album
+        assert tracks[0].artists[0] is tracks[0].album.artists[0]
+        assert len(cache) == 2
+
+    def test_tidal(self):
+        track = models.Track.from_tidal(
+            {
+                "item": {
+                    "id": 1781887,
+                    "title": "Never Gonna Give You Up",
+                    "duration": 214,
+                    "volumeNumber": 1,
+                    "trackNumber": 1,
+                    "isrc": "GBARL9300135",
+                    "explicit": False,
+                    "artists": [
+                        {"id": 10551, "name": "Rick Astley", "type": "MAIN"},
+                        {"id": 1, "name": "Producer", "type": "FEATURED"},
+                    ],
+                    "album": {
+                        "id": 1781886,
+                        "title": "Whenever You Need Somebody",
+                        "cover": "aa-bb-cc",
+                    },
+                }
+            }
+        )
+        assert track.id == "1781887"
+        assert [a.id for a in track.artists] == ["10551"]
+        assert track.artwork_url == (
+            "https://resources.tidal.com/images/aa/bb/cc/1280x1280.jpg"
+        )
+
+        track = models.Track.from_tidal(
+            {
+                "id": "1781887",
+                "type": "tracks",
+                "attributes": {
+                    "title": "Never Gonna Give You Up",
+                    "isrc": "GBARL9300135",
+                    "duration": "PT3M34S",
+                    "explicit": False,
+                },
+                "relationships": {
+                    "albums": {"data": [{"id": "1781886", "type": "albums"}]},
+                    "artists": {"data": [{"id": "10551", "type": "artists"}]},
+                },
+            },
+            included=[
+                {
+                    "id": "10551",
+                    "type": "artists",
+                    "attributes": {"name": "Rick Astley"},
+                },
+                {
+                    "id": "1781886",
+                    "type": "albums",
+                    "attributes": {
+                        "title": "Whenever You Need Somebody",
+                        "barcodeId": "4050538793819",
+                        "imageLinks": [
+                            {"href": "small", "meta": {"width": 80}},
+                            {"href": "large", "meta": {"width": 1280}},
+                        ],
+                    },
+                },
+            ],
+        )
+        assert track.duration == 214
+        assert track.artists[0].name == "Rick Astley"
+        assert track.album.upc == "4050538793819"
+        assert track.artwork_url == "large"
+
+    def test_tidal_included(self):
+        track = {
+            "id": "1781887",
+            "type": "tracks",
+            "attributes": {"title": "Never Gonna Give You Up"},
+            "relationships": {
+                "albums": {"data": [{"id": "1781886", "type": "albums"}]},
+                "artists": {"data": [{"id": "10551", "type": "artists"}]},
+            },
+        }
+        included = [
+            {
+                "id": "10551",
+                "type": "artists",
+                "attributes": {"name": "Rick Astley"},
+            },
+            {
+                "id": "1781886",
+                "type": "albums",
+                "attributes": {"title": "Whenever You Need Somebody"},
+                "relationships": {
+                    "artists": {"data": [{"id": "10551", "type": "artists"}]}
+                },
+            },
+        ]
+        for cache in (None, {}):
+            album = models.Track.from_tidal(
+                track, included=included, cache=cache
+            ).album
+            assert album.title == "Whenever You Need Somebody"
+            assert album.artists[0].name == "Rick Astley"
+
+    def test_qobuz(self):
+        track = models.Track.from_qobuz(
+            {
+                "id": 64868955,
+                "title": "Never Gonna Give You Up",
+                "isrc": "GBARL9300135",
+                "duration": 213,
+                "media_number": 1,
+                "track_number": 1,
+                "parental_warning": False,
+                "performer": {"id": 55069, "name": "Rick Astley"},
+                "album": {
+                    "id": "0886446451264",
+                    "title": "Whenever You Need Somebody",
+                    "artist": {"id": 55069, "name": "Rick Astley"},
+                    "upc": "0886446451264",
+                    "tracks_count": 10,
+                    "media_count": 1,
+                    "image": {"large": "https://static.qobuz.com/large.jpg"},
+                },
+            }
+        )
+        assert track.id == "64868955"
+        assert track.duration == 213.0
+        assert track.album.upc == "0886446451264"
+        assert track.artwork_url == "https://static.qobuz.com/large.jpg"
+
+    def test_discogs(self):
+        release = {
+            "id": 249504,
+            "title": "Never Gonna Give You Up",
+            "artists": [{"id": 72872, "name": "Rick Astley"}],
+            "released": "1987",
+            "identifiers": [{"type": "Barcode", "value": "5012394144777"}],
+            "images": [
+                {"type": "secondary", "uri": "back"},
+                {"type": "primary", "uri": "front"},
+            ],
+            "tracklist": [
+                {"position": "A", "title": "Never Gonna Give You Up"},
+                {"position": "2-5", "title": "Remix", "duration": "5:45"},
+            ],
+        }
+        album = models.Album.from_discogs(release)
+        assert album.upc == "5012394144777"
+        assert album.artwork_url == "front"
+        assert album.track_count == 2
+
+        track = models.Track.from_discogs(
+            release["tracklist"][1], release=release
+        )
+        assert track.id is None
+        assert (track.disc_number, track.track_number) == (2, 5)
+        assert track.duration == 345
+        assert track.artists[0].name == "Rick Astley"
+
+    def test_itunes(self):
+        track = models.Track.from_itunes(
+            {
+                "wrapperType": "track",
+                "trackId": 1559523359,
+                "trackName": "Never Gonna Give You Up",
+                "artistId": 669771,
+                "artistName": "Rick Astley",
+                "collectionId": 1559523357,
+                "collectionName": "Whenever You Need Somebody",
+                "trackTimeMillis": 213573,
+                "discNumber": 1,
+                "trackNumber": 1,
+                "trackExplicitness": "notExplicit",
+                "releaseDate": "1987-07-27T12:00:00Z",
+                "artworkUrl100": "https://is1-ssl.mzstatic.com/100x100bb.jpg",
+            }
+        )
+        assert track.id == "1559523359"
+        assert track.explicit is False
+        assert track.album.id == "1559523357"
+        assert track.album.release_date == "1987-07-27"
@@ -2,7 +2,7 @@ from pathlib import Path
 import sys
 
 sys.path.insert(0, f"{Path(__file__).parents[1].resolve()}/src")
-from minim import qobuz  # noqa: E402
+from minim import credentials, qobuz  # noqa: E402
 
 
 class TestPrivateAPI:
@@ -51,3 +51,87 @@ class TestPrivateAPI:
 
     def search(self):
         pass
+
+
+class TestAppCredentials:
+    @classmethod
+    def setup_class(cls):
+        cls.store = credentials.get_store()
+
+    @classmethod
+    def teardown_class(cls):
+        credentials.set_store(cls.store)
+
+    def test_cached(self, tmp_path):
+        credentials.set_store(credentials.FileStore(tmp_path / "minim.cfg"))
+        credentials.get_store().set(
+            qobuz.PrivateAPI._APP_NAME,
+            {"app_id": "id", "app_secret": "secret", "timestamp": ""},
+        )
+        obj = qobuz.PrivateAPI()
+        assert obj.session.headers["X-App-Id"] == "id"
+        assert obj._app_secret == "secret" and obj._app_cached
+
+        errors = [RuntimeError("400 Invalid Request Signature parameter")]
+        secrets = []
+
+        def get_json(url, **kwargs):
+            secrets.append(obj._app_secret)
+            if errors:
+                raise errors.pop()
+            return {}
+
+        def set_app_credentials(app_id, app_secret, *, cache=True):
+            assert not cache
+            obj._app_secret = "new"
+            obj._app_cached = False
+
+        obj._get_json = get_json
+        obj._set_app_credentials = set_app_credentials
+        assert obj._get_json_secret("url", "signature") == {}
+        assert secrets == ["secret", "new"]
+
+        obj._app_cached = True
+        errors.append(RuntimeError("401 User authentication is required."))
+        try:
+            obj._get_json_secret("url", "signature")
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("error was not raised")
+        assert secrets == ["secret", "new", "new"]
+
+    def test_saved_session(self, tmp_path):
+        credentials.set_store(credentials.FileStore(tmp_path / "minim.cfg"))
+        credentials.get_store().set(
+            qobuz.PrivateAPI._NAME,
+            {
+                "flow": "",
+                "auth_token": "",
+                "app_id": "id",
+                "app_secret": "secret",
+            },
+        )
+        obj = qobuz.PrivateAPI()
+        assert obj.session.headers["X-App-Id"] == "id"
+        assert obj._app_secret == "secret" and obj._app_cached
+
+        errors = [RuntimeError("400 Invalid app_id parameter")]
+        rescraped = []
+
+        def get_json(url, **kwargs):
+            if errors:
+                raise errors.pop()
+            return {"app_secret": obj._app_secret}
+
+        def set_app_credentials(app_id, app_secret, *, cache=True):
+            rescraped.append(cache)
+            obj._app_secret = "new"
+            obj._app_cached = False
+
+        obj._get_json = get_json
+        obj._set_app_credentials = set_app_credentials
+        assert obj._get_json_secret("url", "signature") == {
+            "app_secret": "new"
+        }
+        assert rescraped == [False]
@@ -0,0 +1,912 @@
+import asyncio
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import inspect
+import json
+import os
+from pathlib import Path
+import pickle
+import sys
+import threading
+import time
+import warnings
+
+import requests
+
+sys.path.insert(0, f"{Path(__file__).parents[1]}/src")
+from minim import (  # noqa: E402
+    discogs,
+    itunes,
+    qobuz,
+    spotify,
+    tidal,
+    transport,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _respond(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            statuses = server.script.get(self.path, [])
+            status, headers, *delay = (
+                statuses.pop(0) if statuses else (200, {"X-Hit": "1"})
+            )
+        body = b'{"ok": true}'
+        if delay:
+            time.sleep(delay[0])
+        if self.path.startswith("/slow"):
+            time.sleep(0.2)
+        if self.path.startswith("/etag"):
+            headers = {**headers, "ETag": '"v1"'}
+            if self.headers.get("If-None-Match") == '"v1"':
+                status, body = 304, b""
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+class _LocalServer:
+    @classmethod
+    def setup_class(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.server.lock = threading.Lock()
+        cls.server.hits = {}
+        cls.server.script = {}
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+class TestSession(_LocalServer):
+    def _session(self, **kwargs):
+        return transport.Session(
+            retry=transport.RetryPolicy(backoff_factor=0.01, **kwargs)
+        )
+
+    def test_retry_server_error(self):
+        self.server.script["/retry"] = [(503, {}), (502, {})]
+        r = self._session().get(f"{self.url}/retry")
+        assert r.status_code == 200
+        assert self.server.hits["/retry"] == 3
+
+    def test_retry_after(self):
+        self.server.script["/throttled"] = [(429, {"Retry-After": "0"})]
+        r = self._session().get(f"{self.url}/throttled")
+        assert r.status_code == 200
+        assert self.server.hits["/throttled"] == 2
+
+    def test_retry_after_too_long(self):
+        self.server.script["/long"] = [(429, {"Retry-After": "3600"})]
+        r = self._session().get(f"{self.url}/long")
+        assert r.status_code == 429
+
+    def test_no_retry_non_idempotent(self):
+        self.server.script["/post"] = [(500, {})]
+        r = self._session().post(f"{self.url}/post")
+        assert r.status_code == 500
+        assert self.server.hits["/post"] == 1
+
+    def test_retry_budget(self):
+        self.server.script["/budget"] = [(503, {})] * 3
+        r = self._session(budget=1).get(f"{self.url}/budget")
+        assert r.status_code == 503
+        assert self.server.hits["/budget"] == 2
+
+    def test_positional(self):
+        r = self._session().request("GET", f"{self.url}/positional", {"q": 1})
+        assert r.request.url.endswith("/positional?q=1")
+
+    def test_priority_without_limiter(self):
+        session = self._session()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            session.get(f"{self.url}/priority")
+            with transport.priority("interactive"):
+                session.get(f"{self.url}/priority")
+                session.get(f"{self.url}/priority")
+        assert len(caught) == 1
+        assert caught[0].category is RuntimeWarning
+        assert "no rate limiter" in str(caught[0].message)
+        assert caught[0].filename == __file__
+
+    def test_coalesce(self):
+        session = self._session()
+        with ThreadPoolExecutor(8) as executor:
+            responses = list(
+                executor.map(
+                    lambda _: session.get(f"{self.url}/slow"), range(8)
+                )
+            )
+        assert self.server.hits["/slow"] == 1
+        assert all(r.json() == {"ok": True} for r in responses)
+
+    def test_timeout(self):
+        session = transport.Session(timeout=(1.0, 0.05))
+        session.retry = None
+        try:
+            session.get(f"{self.url}/slow_timeout")
+        except requests.Timeout:
+            pass
+        else:
+            raise AssertionError("request did not time out")
+
+    def test_pool_size(self):
+        session = transport.Session(pool_size=4)
+        adapter = session.get_adapter(self.url)
+        assert isinstance(adapter, transport._KeepAliveAdapter)
+        assert adapter._pool_maxsize == 4
+        session.pool_size = 64
+        assert session.get_adapter(self.url)._pool_maxsize == 64
+
+    def test_hedging(self):
+        hedging = transport.HedgingPolicy(delay=0.05, budget=1.0)
+        session = transport.Session(hedging=hedging)
+        self.server.script["/search/hedged"] = [(200, {}, 1.0)]
+        start = time.perf_counter()
+        r = session.get(f"{self.url}/search/hedged")
+        assert r.json() == {"ok": True}
+        assert time.perf_counter() - start < 0.5
+        assert self.server.hits["/search/hedged"] == 2
+
+    def test_hedging_budget(self):
+        hedging = transport.HedgingPolicy(delay=0.05, budget=0.0)
+        hedging._credit = 0.0
+        session = transport.Session(hedging=hedging)
+        self.server.script["/search/budget"] = [(200, {}, 0.2)]
+        session.get(f"{self.url}/search/budget")
+        assert self.server.hits["/search/budget"] == 1
+
+    def test_hedging_executor(self):
+        hedging = transport.HedgingPolicy(delay=1.0, budget=0.0)
+        session = transport.Session(hedging=hedging, pool_size=2)
+        for _ in range(8):
+            session.get(f"{self.url}/search/executor")
+        assert len(session._hedging_executor._threads) == 1
+
+    def test_hedging_delay(self):
+        hedging = transport.HedgingPolicy(min_samples=10)
+        for latency in range(1, 101):
+            hedging.record("https://api.test/search", latency / 100)
+        assert hedging.get_delay("https://api.test/search") == 0.95
+        assert hedging.get_delay("https://api.test/other") == 1.0
+        assert not hedging.is_hedged("GET", "https://api.test/tracks")
+
+    def test_parse_retry_after(self):
+        assert transport.RetryPolicy.parse_retry_after("2") == 2.0
+        assert transport.RetryPolicy.parse_retry_after("invalid") is None
+        assert (
+            transport.RetryPolicy.parse_retry_after(
+                "Wed, 21 Oct 2015 07:28:00 GMT"
+            )
+            == 0.0
+        )
+        assert (
+            transport.RetryPolicy.parse_retry_after(
+                "Wed, 21 Oct 2015 07:28:00 -0000"
+            )
+            == 0.0
+        )
+        date = datetime.datetime.now(datetime.timezone.utc)
+        assert (
+            55
+            < transport.RetryPolicy.parse_retry_after(
+                (date + datetime.timedelta(seconds=60)).strftime(
+                    "%a, %d %b %Y %H:%M:%S -0000"
+                )
+            )
+            <= 60
+        )
+
+
+class TestResponseCache(_LocalServer):
+    def _session(self, tmp_path, **kwargs):
+        return transport.Session(
+            cache=transport.ResponseCache(tmp_path / "cache.sqlite", **kwargs)
+        )
+
+    def test_fresh(self, tmp_path):
+        session = self._session(tmp_path)
+        for _ in range(3):
+            r = session.get(f"{self.url}/fresh", params={"a": 1, "b": None})
+            assert r.json() == {"ok": True}
+        assert self.server.hits["/fresh?a=1"] == 1
+        assert getattr(r, "from_cache", False)
+
+    def test_revalidate(self, tmp_path):
+        session = self._session(tmp_path, ttl=1e-6)
+        for _ in range(2):
+            r = session.get(f"{self.url}/etag")
+        assert self.server.hits["/etag"] == 2
+        assert r.status_code == 200 and r.json() == {"ok": True}
+
+    def test_identity(self, tmp_path):
+        session = self._session(tmp_path)
+        for token in ("a", "b", "a"):
+            session.headers["Authorization"] = f"Bearer {token}"
+            session.get(f"{self.url}/identity")
+        assert self.server.hits["/identity"] == 2
+
+    def test_stable_identity(self, tmp_path):
+        session = self._session(tmp_path)
+        session.identity = "client:user"
+        for token in ("a", "b"):
+            session.headers["Authorization"] = f"Bearer {token}"
+            session.get(f"{self.url}/stable_identity")
+        assert self.server.hits["/stable_identity"] == 1
+
+    def test_ttls(self, tmp_path):
+        session = self._session(tmp_path, ttls={"/uncached": 0})
+        for _ in range(2):
+            session.get(f"{self.url}/uncached")
+        assert self.server.hits["/uncached"] == 2
+
+    def test_eviction(self, tmp_path):
+        session = self._session(tmp_path, max_size=20)
+        for path in ("/lru1", "/lru2", "/lru1"):
+            session.get(f"{self.url}{path}")
+        assert self.server.hits["/lru1"] == 2
+
+
+class TestAsyncClient(_LocalServer):
+    def test_surface(self):
+        assert (
+            itunes.AsyncSearchAPI.search.__doc__
+            == itunes.SearchAPI.search.__doc__
+        )
+        assert inspect.iscoroutinefunction(itunes.AsyncSearchAPI.lookup)
+
+    def test_gather(self):
+        async def gather():
+            async with itunes.AsyncSearchAPI(max_concurrency=4) as client:
+                client.client.API_URL = self.url
+                client.session.rate_limiter = None
+                return await asyncio.gather(
+                    *(client.search(f"term{i}") for i in range(8))
+                )
+
+        assert asyncio.run(gather()) == [{"ok": True}] * 8
+        assert (
+            sum(
+                v
+                for k, v in self.server.hits.items()
+                if k.startswith("/search")
+            )
+            == 8
+        )
+
+
+class TestRateLimiter:
+    def test_burst(self):
+        limiter = transport.RateLimiter(1, 3)
+        assert sum(limiter.acquire() for _ in range(3)) == 0
+
+    def test_pacing(self):
+        limiter = transport.RateLimiter(50, 1)
+        start = time.perf_counter()
+        for _ in range(6):
+            limiter.acquire()
+        assert time.perf_counter() - start >= 0.09
+
+    def test_priority(self):
+        limiter = transport.RateLimiter(20, 1)
+        limiter.acquire()
+        order = []
+
+        def acquire(level):
+            with transport.priority(level):
+                limiter.acquire()
+            order.append(level)
+
+        threads = [
+            threading.Thread(target=acquire, args=("bulk",)) for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.005)
+        threads.append(threading.Thread(target=acquire, args=("interactive",)))
+        threads[-1].start()
+        for thread in threads:
+            thread.join()
+        assert order[0] == "interactive"
+
+    def test_priority_context(self):
+        client = itunes.SearchAPI()
+        with transport.priority("bulk"):
+            results = client.map(lambda _: transport._priority.get(), range(4))
+        assert {r.value for r in results} == {transport.PRIORITIES["bulk"]}
+
+    def test_shared(self, tmp_path):
+        path = tmp_path / "limits.sqlite"
+        limiters = [
+            transport.RateLimiter(50, 2, name="test", path=path)
+            for _ in range(2)
+        ]
+        start = time.perf_counter()
+        for _ in range(3):
+            for limiter in limiters:
+                limiter.acquire()
+        assert time.perf_counter() - start >= 0.07
+
+    def test_client_defaults(self):
+        assert discogs.API().session.rate_limiter is None
+        default = itunes.SearchAPI().session.rate_limiter
+        assert default.name == itunes.SearchAPI().session.rate_limiter.name
+        assert default.burst == 20
+        limiter = transport.RateLimiter(1)
+        assert (
+            itunes.SearchAPI(rate_limiter=limiter).session.rate_limiter
+            is limiter
+        )
+
+
+class TestTokenRefresh(_LocalServer):
+    def _client(self, cls):
+        client = cls.__new__(cls)
+        client.session = transport.Session()
+        client.session.headers["Authorization"] = "Bearer 0"
+        client._token_lock = threading.Lock()
+        client._expiry = None
+        client.refreshes = 0
+
+        def refresh(*args, **kwargs):
+            time.sleep(0.05)
+            client.refreshes += 1
+            client.session.headers["Authorization"] = (
+                f"Bearer {client.refreshes}"
+            )
+            client._expiry = datetime.datetime.max
+
+        client._refresh_access_token = client.set_access_token = refresh
+        return client
+
+    def test_expired(self):
+        client = self._client(spotify.WebAPI)
+        client._expiry = datetime.datetime.min
+        with ThreadPoolExecutor(8) as executor:
+            list(
+                executor.map(
+                    lambda i: client._request("get", f"{self.url}/exp{i}"),
+                    range(8),
+                )
+            )
+        assert client.refreshes == 1
+
+    def test_background(self):
+        client = self._client(spotify.WebAPI)
+        client._expiry = datetime.datetime.now() + datetime.timedelta(
+            seconds=0.5
+        )
+        refresher = transport.TokenRefresher(client, margin=0.4)
+        time.sleep(0.3)
+        refresher.stop()
+        assert client.refreshes == 1
+        assert client._expiry == datetime.datetime.max
+
+    def test_unauthorized(self):
+        client = self._client(spotify.PrivateLyricsService)
+        for i in range(4):
+            self.server.script[f"/slow{i}"] = [(401, {})]
+        with ThreadPoolExecutor(4) as executor:
+            list(
+                executor.map(
+                    lambda i: client._request("get", f"{self.url}/slow{i}"),
+                    range(4),
+                )
+            )
+        assert client.refreshes == 1
+        assert all(self.server.hits[f"/slow{i}"] == 2 for i in range(4))
+
+
+class TestLazyAuthentication(_LocalServer):
+    class _Client(spotify.WebAPI):
+        authentications = 0
+
+        def set_access_token(self, *args, **kwargs):
+            time.sleep(0.05)
+            self.authentications += 1
+            self._expiry = None
+            self._user_id = "user"
+
+    def _client(self):
+        return self._Client(
+            client_id="id",
+            client_secret="secret",
+            flow="client_credentials",
+            overwrite=True,
+            lazy=True,
+        )
+
+    def test_attribute(self):
+        client = self._client()
+        assert client.authentications == 0
+        assert client._user_id == "user"
+        assert client.authentications == 1
+
+    def test_request(self):
+        client = self._client()
+        with ThreadPoolExecutor(8) as executor:
+            list(
+                executor.map(
+                    lambda i: client._request("get", f"{self.url}/lazy{i}"),
+                    range(8),
+                )
+            )
+        assert client.authentications == 1
+
+
+class TestPagination:
+    ITEMS = list(range(120))
+
+    def _offset(self, *, limit, offset):
+        items = self.ITEMS[offset : offset + limit]
+        time.sleep(0.01)
+        return {
+            "items": items,
+            "next": "next" if offset + limit < len(self.ITEMS) else None,
+            "total": len(self.ITEMS),
+        }
+
+    def _cursor(self, *, limit, after=None):
+        start = 0 if after is None else after + 1
+        page = self._offset(limit=limit, offset=start)
+        page["cursors"] = {"after": page["items"][-1]}
+        return page
+
+    def _pages(self, *, page, per_page):
+        items = self.ITEMS[(page - 1) * per_page : page * per_page]
+        pages = -(-len(self.ITEMS) // per_page)
+        return {"pagination": {"page": page, "pages": pages}, "items": items}
+
+    def _client(self, cls):
+        client = cls.__new__(cls)
+        client.session = transport.Session()
+        return client
+
+    def test_offset(self):
+        client = self._client(spotify.WebAPI)
+        assert list(client.paginate(self._offset)) == self.ITEMS
+        assert list(client.paginate(self._offset, offset=100)) == list(
+            range(100, 120)
+        )
+
+    def test_cursor(self):
+        client = self._client(spotify.WebAPI)
+        assert list(client.paginate(self._cursor, limit=7)) == self.ITEMS
+
+    def test_pages(self):
+        client = self._client(discogs.API)
+        assert list(client.paginate(self._pages, per_page=50)) == self.ITEMS
+
+    def test_parallel(self):
+        client = self._client(spotify.WebAPI)
+        assert (
+            list(client.paginate(self._offset, limit=7, max_workers=4))
+            == self.ITEMS
+        )
+        client = self._client(discogs.API)
+        assert (
+            list(client.paginate(self._pages, per_page=7, max_workers=4))
+            == self.ITEMS
+        )
+
+    def test_imap(self):
+        start = time.perf_counter()
+        results = list(
+            transport._imap(lambda i: time.sleep(0.05) or i, range(8), 4)
+        )
+        assert results == list(range(8))
+        assert time.perf_counter() - start < 0.3
+
+    def test_async(self):
+        async def collect():
+            async with spotify.AsyncWebAPI(
+                client=self._client(spotify.WebAPI)
+            ) as client:
+                return [item async for item in client.paginate(self._offset)]
+
+        assert inspect.isasyncgenfunction(spotify.AsyncWebAPI.paginate)
+        assert asyncio.run(collect()) == self.ITEMS
+
+
+class TestBatch:
+    def test_chunks(self):
+        ids = [str(i) for i in range(120)]
+        for max_workers in (None, 4):
+            chunks = transport._batch(lambda ids: ids, ids, 50, max_workers)
+            assert [len(chunk) for chunk in chunks] == [50, 50, 20]
+            assert sum(chunks, []) == ids
+        assert transport._batch(lambda ids: ids, "a, b,c", 2) == [
+            ["a", "b"],
+            ["c"],
+        ]
+
+    def test_spotify(self):
+        client = spotify.WebAPI.__new__(spotify.WebAPI)
+        client._get_json = lambda url, params: {
+            "tracks": [{"id": id} for id in params["ids"].split(",")]
+        }
+        ids = [f"{i:022d}" for i in range(120)]
+        tracks = client.get_tracks(ids, max_workers=4)
+        assert [track["id"] for track in tracks] == ids
+
+    def test_spotify_playlist(self):
+        client = spotify.WebAPI.__new__(spotify.WebAPI)
+        client._check_scope = lambda *args: None
+        client.get_playlist = lambda playlist_id: {"public": True}
+        sent = []
+
+        def request(method, url, json):
+            sent.append(json)
+            r = requests.Response()
+            r._content = b'{"snapshot_id": "snapshot"}'
+            return r
+
+        client._request = request
+        uris = ", ".join(f"spotify:track:{i:022d}" for i in range(150))
+        assert client.add_playlist_items("id", uris, position=0) == "snapshot"
+        assert [len(json["uris"]) for json in sent] == [100, 50]
+        assert [json["position"] for json in sent] == [0, 100]
+        assert not any(uri.startswith(" ") for uri in sent[1]["uris"])
+        try:
+            client.add_playlist_items("id", " ")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("empty URI list was accepted")
+
+    def test_qobuz(self):
+        client = qobuz.PrivateAPI.__new__(qobuz.PrivateAPI)
+
+        def request(method, url, params):
+            ids = params["tracks_id"]
+            r = requests.Response()
+            r._content = json.dumps(
+                {
+                    "items": [{"id": int(id)} for id in ids],
+                    "total": len(ids),
+                }
+            ).encode()
+            return r
+
+        client._request = request
+        ids = list(range(120))
+        tracks = client.get_tracks(ids, max_workers=4)
+        assert [track["id"] for track in tracks["items"]] == ids
+        assert tracks["total"] == 120
+
+    def test_tidal(self):
+        client = tidal.API.__new__(tidal.API)
+        sent = []
+
+        def get_json(url, params):
+            sent.append(params)
+            ids = params["filter[id]"]
+            return {
+                "data": [{"type": "tracks", "id": id} for id in ids],
+                "included": [{"type": "artists", "id": "1"}],
+                "links": {"next": f"/tracks?page[cursor]={ids[-1]}"},
+            }
+
+        client._get_json = get_json
+        ids = [str(i) for i in range(50)]
+        tracks = client.get_tracks("US", track_ids=ids, max_workers=4)
+        assert [track["id"] for track in tracks["data"]] == ids
+        assert tracks["included"] == [{"type": "artists", "id": "1"}]
+        assert "links" not in tracks
+        sizes = sorted(len(params["filter[id]"]) for params in sent)
+        assert sizes == [10, 20, 20]
+        assert all(params["page[cursor]"] is None for params in sent)
+        try:
+            client.get_tracks("US", track_ids=ids, cursor="cursor")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("cursor was accepted with chunked IDs")
+
+    def test_map(self):
+        client = itunes.SearchAPI()
+        results = client.map(lambda x, y=1: y / x, [1, 0, (4, 2), {"x": 8}])
+        assert [r.index for r in results] == [0, 1, 2, 3]
+        assert [r.ok for r in results] == [True, False, True, True]
+        assert [r.value for r in results] == [1.0, None, 0.5, 0.125]
+        assert isinstance(results[1].error, ZeroDivisionError)
+        assert all(r.elapsed >= 0 for r in results)
+
+    def test_unordered(self):
+        client = itunes.SearchAPI()
+        delays = [0.1, 0.05, 0.01]
+        results = list(
+            client.imap(lambda d: time.sleep(d) or d, delays, ordered=False)
+        )
+        assert [r.value for r in results] == sorted(delays)
+        assert sorted(r.index for r in results) == [0, 1, 2]
+
+
+class TestCircuitBreaker(_LocalServer):
+    def test_states(self):
+        breaker = transport.CircuitBreaker(
+            min_requests=4, cooldown=0.05, probes=2
+        )
+        for failed in (False, True, False, True):
+            breaker.acquire()
+            breaker.record(failed)
+        assert breaker.state == "open"
+        try:
+            breaker.acquire()
+        except transport.CircuitOpenError as e:
+            assert e.retry_after > 0
+        else:
+            raise AssertionError("open circuit breaker let request through")
+
+        time.sleep(0.05)
+        assert breaker.state == "half-open"
+        breaker.acquire()
+        breaker.acquire()
+        try:
+            breaker.acquire()
+        except transport.CircuitOpenError:
+            pass
+        else:
+            raise AssertionError("too many probe requests let through")
+        breaker.record(False)
+        breaker.record(False)
+        assert breaker.state == "closed"
+
+    def test_session(self):
+        session = transport.Session(
+            circuit_breaker=transport.CircuitBreaker(min_requests=2)
+        )
+        session.retry = None
+        self.server.script["/broken"] = [(500, {})] * 2
+        for _ in range(2):
+            assert session.get(f"{self.url}/broken").status_code == 500
+        try:
+            session.get(f"{self.url}/broken")
+        except transport.CircuitOpenError:
+            pass
+        else:
+            raise AssertionError("open circuit breaker let request through")
+        assert self.server.hits["/broken"] == 2
+
+    def test_probe_error(self):
+        breaker = transport.CircuitBreaker(
+            min_requests=1, cooldown=0.0, probes=1
+        )
+        session = transport.Session(circuit_breaker=breaker)
+        session.max_redirects = 0
+        self.server.script["/redirect"] = [(302, {"Location": "/"})] * 2
+        breaker.acquire()
+        breaker.record(True)
+        for _ in range(2):
+            try:
+                session.get(f"{self.url}/redirect")
+            except requests.TooManyRedirects:
+                pass
+            else:
+                raise AssertionError("redirect was followed")
+        assert session.get(f"{self.url}/probe").status_code == 200
+        assert breaker.state == "closed"
+
+
+class TestMetrics(_LocalServer):
+    def test_endpoint(self):
+        assert (
+            transport._get_endpoint(
+                "https://api.spotify.com/v1/albums/4aawyAB9vmqN3uQ7FjRGTy"
+                "/tracks?limit=50"
+            )
+            == "api.spotify.com/v1/albums/{id}/tracks"
+        )
+        assert (
+            transport._get_endpoint("https://api.discogs.com/releases/249504")
+            == "api.discogs.com/releases/{id}"
+        )
+        assert (
+            transport._get_endpoint("https://api.spotify.com/v1/me/tracks")
+            == "api.spotify.com/v1/me/tracks"
+        )
+
+    def test_hooks(self):
+        events = []
+
+        class Hook(transport.RequestHook):
+            def before(self, event):
+                events.append(("before", event.status))
+
+            def after(self, event):
+                events.append(("after", event.status))
+                raise ValueError("ignored")
+
+        session = transport.Session(
+            retry=transport.RetryPolicy(backoff_factor=0.01),
+            request_hooks=[Hook()],
+        )
+        self.server.script["/hooked"] = [(503, {})]
+        assert session.get(f"{self.url}/hooked").status_code == 200
+        assert events == [("before", None), ("after", 200)]
+
+    def test_collector(self):
+        metrics = transport.MetricsCollector()
+        session = transport.Session(
+            retry=transport.RetryPolicy(backoff_factor=0.01),
+            request_hooks=[metrics],
+        )
+        self.server.script["/metrics/1"] = [(503, {})]
+        for i in range(3):
+            session.post(f"{self.url}/metrics/{i}", data=b"body")
+        session.get(f"{self.url}/metrics/1")
+        session.retry = None
+        try:
+            session.get("http://127.0.0.1:1/metrics")
+        except requests.ConnectionError:
+            pass
+        session._emit("token_refresh", "minim.spotify.WebAPI")
+
+        stats = metrics._endpoints[("POST", f"{self.url[7:]}/metrics/{{id}}")]
+        assert stats["requests"] == 3 and stats["retries"] == 0
+        assert stats["statuses"] == {200: 2, 503: 1}
+        assert stats["bytes_sent"] == 12 and stats["bytes_received"] == 36
+        assert sum(stats["histogram"]) == 3
+
+        text = metrics.prometheus()
+        assert 'status="error"} 1' in text
+        assert (
+            'minim_token_refreshes_total{client="minim.spotify.WebAPI"} 1'
+            in (text)
+        )
+        assert 'le="+Inf"} 3' in text
+        summary = metrics.summary().splitlines()
+        assert summary[0].startswith("endpoint") and len(summary) == 6
+
+        metrics.reset()
+        assert "minim_requests_total{" not in metrics.prometheus()
+
+
+class TestCassette(_LocalServer):
+    def _record(self, path):
+        session = transport.Session(
+            retry=transport.RetryPolicy(backoff_factor=0.01),
+            cassette=transport.Cassette(path, mode="record"),
+        )
+        session.headers["Authorization"] = "Bearer secret"
+        self.server.script["/cassette/retry"] = [(503, {})]
+        session.get(f"{self.url}/cassette/retry")
+        session.get(f"{self.url}/cassette", params={"b": 2, "a": 1})
+        session.post(f"{self.url}/cassette", json={"ids": [1, 2]})
+        session.close()
+
+    def test_replay(self, tmp_path):
+        for name in ("cassette.jsonl", "cassette.har"):
+            self._record(tmp_path / name)
+            assert "secret" not in (tmp_path / name).read_text()
+            hits = dict(self.server.hits)
+
+            session = transport.Session(
+                retry=transport.RetryPolicy(backoff_factor=0.01),
+                cassette=transport.Cassette(tmp_path / name),
+            )
+            r = session.get(f"{self.url}/cassette?a=1&b=2")
+            assert r.status_code == 200 and r.json() == {"ok": True}
+            assert session.post(
+                f"{self.url}/cassette", json={"ids": [1, 2]}
+            ).json() == {"ok": True}
+            r = session.get(f"{self.url}/cassette/retry", stream=True)
+            assert r.status_code == 200 and b"".join(r.iter_content(4))
+            assert self.server.hits == hits
+            try:
+                session.post(f"{self.url}/cassette", json={"ids": [3]})
+            except RuntimeError:
+                pass
+            else:
+                raise AssertionError("unrecorded request was replayed")
+
+    def test_redaction(self, tmp_path):
+        path = tmp_path / "cassette.jsonl"
+        session = transport.Session(
+            cassette=transport.Cassette(path, mode="record")
+        )
+        session.post(
+            f"{self.url}/login",
+            params={"email": "user@example.com", "password": "hunter2"},
+            data={"client_secret": "s3cr3t", "grant_type": "password"},
+        )
+        session.close()
+        text = path.read_text()
+        assert not any(s in text for s in ("example", "hunter2", "s3cr3t"))
+
+        session = transport.Session(cassette=transport.Cassette(path))
+        assert session.post(
+            f"{self.url}/login",
+            params={"email": "other@example.com", "password": "other"},
+            data={"client_secret": "other", "grant_type": "password"},
+        ).json() == {"ok": True}
+
+        body = transport.Cassette(path)._redact_body(
+            b'{"access_token": "a", "user": {"refresh_token": "r"}, "n": 1}'
+        )
+        assert json.loads(body) == {
+            "access_token": "REDACTED",
+            "user": {"refresh_token": "REDACTED"},
+            "n": 1,
+        }
+
+    def test_latency(self, tmp_path):
+        self._record(tmp_path / "cassette.jsonl")
+        session = transport.Session(
+            cassette=transport.Cassette(
+                tmp_path / "cassette.jsonl", latency=0.1
+            )
+        )
+        start = time.perf_counter()
+        session.get(f"{self.url}/cassette?a=1&b=2")
+        assert time.perf_counter() - start >= 0.1
+
+        hits = self.server.hits.get("/cassette?a=1&b=2", 0)
+        session.cassette = None
+        session.get(f"{self.url}/cassette?a=1&b=2")
+        assert self.server.hits["/cassette?a=1&b=2"] == hits + 1
+
+
+class TestProcesses(_LocalServer):
+    def _client(self):
+        return spotify.WebAPI(
+            client_id="id",
+            client_secret="secret",
+            flow="client_credentials",
+            access_token="token",
+            expiry=datetime.datetime.now() + datetime.timedelta(hours=1),
+            overwrite=True,
+            save=False,
+            refresh_margin=60,
+        )
+
+    def test_pickle(self):
+        client = self._client()
+        client.session.rate_limiter = transport.RateLimiter(10, 2)
+        client.session.request_hooks.append(transport.MetricsCollector())
+        client.session.get(f"{self.url}/pickle")
+        copy = pickle.loads(pickle.dumps(client))
+        assert copy.session.headers["Authorization"] == "Bearer token"
+        assert copy._expiry == client._expiry
+        assert copy._token_lock is not client._token_lock
+        assert copy._token_refresher._client() is copy
+        assert copy.session.get(f"{self.url}/pickle").status_code == 200
+        assert copy.session.request_hooks[0]._endpoints
+        client._token_refresher.stop()
+        copy._token_refresher.stop()
+
+    def test_fork(self):
+        if not hasattr(os, "fork"):
+            return
+        session = transport.Session()
+        session.get(f"{self.url}/fork")
+        adapter = session.get_adapter(self.url)
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            ok = (
+                session.get_adapter(self.url) is not adapter
+                and session.get(f"{self.url}/fork").status_code == 200
+            )
+            os.write(write, b"1" if ok else b"0")
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert os.read(read, 1) == b"1"
+        assert session.get_adapter(self.url) is adapter
+        assert self.server.hits["/fork"] == 2